@@ -261,6 +261,13 @@ CELERY_BEAT_SCHEDULE = {
 }
 
 ENABLE_CALL_LOGS = False
+
+# Locks of views which can not be executed in parallel: 'advisory' (PostgreSQL advisory locks) or 'table' (the lock
+# file and the table of locked models)
+EXEC_LOCKS = 'advisory'
 ENABLE_UPLOAD_REPORTS_LOGS = False
 
+# Maximum seconds requests for changes of tasks statuses can wait for them. Waiting requests hold Bridge workers.
+TASKS_STATUSES_MAX_TIMEOUT = 20
+
 UPLOAD_LOG_FILE = 'upload.log'
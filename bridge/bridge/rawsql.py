@@ -115,3 +115,28 @@ SELECT R0.id AS report_id, ARRAY_AGG(T0.name ORDER BY T0.level) AS tags
     INNER JOIN mark_tag AS T0 ON T0.id = MT.tag_id
     WHERE RL.report_id = %s GROUP BY R0.id;
 """
+
+REBUILD_REPORT_TREE_PATHS = """
+WITH RECURSIVE tree(id, path) AS (
+    SELECT R0.id, ARRAY[]::integer[] FROM report AS R0 WHERE R0.parent_id IS NULL AND R0.decision_id = %s
+    UNION ALL
+    SELECT R1.id, tree.path || tree.id FROM report AS R1 INNER JOIN tree ON R1.parent_id = tree.id
+)
+UPDATE report SET tree_path = tree.path FROM tree WHERE report.id = tree.id AND report.tree_path <> tree.path;
+"""
+
+MOVE_REPORT_SUBTREE = """
+UPDATE report SET tree_path = %s::integer[] || tree_path[%s:] WHERE tree_path @> ARRAY[%s];
+"""
+
+RESERVE_REPORT_IDS = """
+SELECT nextval(pg_get_serial_sequence('report', 'id')) FROM generate_series(1, %s);
+"""
+
+LOCK_TASK_CHANGES = """
+SELECT pg_advisory_xact_lock(%s, %s);
+"""
+
+NEXT_TASK_CHANGE = """
+SELECT nextval('task_change_seq');
+"""
@@ -15,13 +15,15 @@
 # limitations under the License.
 #
 
+import io
 import os
 import json
 
 from django.conf import settings
+from django.test import SimpleTestCase
 from django.urls import reverse
 
-from bridge.utils import KleverTestCase
+from bridge.utils import KleverTestCase, iterate_json_items
 from bridge.vars import USER_ROLES
 
 from users.models import User
@@ -146,3 +148,35 @@ class TestPopulation(KleverTestCase):
         # Population after service and manager were created by function call
         response = self.client.post(reverse('population'))
         self.assertEqual(response.status_code, 200)
+
+
+class TestJSONStreaming(SimpleTestCase):
+    data = [
+        {'identifier': '/Core/LKVOG', 'start_date': 1579256153.2784, 'finish_date': -12500.0, 'memory': 10 ** 12},
+        {'attrs': [{'name': 'Requirement', 'value': 'linux:mutex'}], 'problems': {}, 'verdict': None},
+        [1.5, 2, 1e5, 2E-3, -0.25e+2, True, False, 'ю"\\n'], [], {}, 0, 'Ok'
+    ]
+
+    def __iterate(self, content, depth=1, chunk_size=1):
+        return list(iterate_json_items(io.BytesIO(content), depth=depth, chunk_size=chunk_size))
+
+    def test_round_trip(self):
+        for indent in (None, 2):
+            for ensure_ascii in (True, False):
+                content = json.dumps(self.data, indent=indent, ensure_ascii=ensure_ascii).encode('utf-8')
+                expected = json.loads(content)
+                for chunk_size in range(1, 8):
+                    values = [value for _, value in self.__iterate(content, chunk_size=chunk_size)]
+                    self.assertEqual(values, expected)
+
+    def test_nested(self):
+        content = json.dumps({'1': {'/': [{'a': 1.5}, {'b': 2}], '/vrp': []}, '2': {'/': [3]}}).encode('utf-8')
+        for chunk_size in (1, 2, 3, 1024):
+            self.assertEqual(self.__iterate(content, depth=3, chunk_size=chunk_size), [
+                (('1', '/', 0), {'a': 1.5}), (('1', '/', 1), {'b': 2}), (('2', '/', 0), 3)
+            ])
+
+    def test_corrupted(self):
+        for content in (b'[1, 2', b'[1 2]', b'[1.5.2]', b'{"a" 1}', b'[1]x', b'5'):
+            with self.assertRaises(ValueError):
+                self.__iterate(content)
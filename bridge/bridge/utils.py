@@ -16,15 +16,20 @@
 #
 
 import io
+import codecs
 import hashlib
 import logging
 import os
 import pika
 import shutil
+import struct
 import tempfile
+import threading
 import time
 import zipfile
+import zlib
 import json
+from collections import OrderedDict
 from urllib.parse import quote
 
 from django.conf import settings
@@ -49,6 +54,7 @@ BLOCKER = {}
 GROUP_BLOCKER = {}
 CALL_STATISTIC = {}
 TESTS_DIR = 'Tests'
+ARCHIVES_INDEX_DIR = 'ArchivesIndex'
 LOCK_MODES = (
     'ACCESS SHARE',
     'ROW SHARE',
@@ -201,6 +207,102 @@ def extract_archive(archive):
         return tmp_dir_name
 
 
+class _JSONStream:
+    """Incremental reader of JSON values from a binary file that keeps just a small part of the file in memory."""
+    def __init__(self, fp, chunk_size):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def __read(self):
+        if self._eof:
+            return False
+        data = self._fp.read(self._chunk_size)
+        self._eof = not data
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(data, final=self._eof)
+        self._pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self.__read():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def take(self):
+        char = self.peek()
+        self._pos += len(char)
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self.__read():
+                    raise
+                continue
+            # Numbers can be split between chunks, e.g. "1" and ".5", so the value is valid if just a delimiter follows
+            if not self._eof and (end == len(self._buffer) or not self.__is_delimiter(self._buffer[end])):
+                self.__read()
+                continue
+            self._pos = end
+            return value
+
+    @staticmethod
+    def __is_delimiter(char):
+        return char.isspace() or char in ',]}'
+
+
+def iterate_json_items(fp, depth=1, chunk_size=1024 * 1024):
+    """
+    Parse the JSON file incrementally and yield values nested to containers at the given depth. So large lists and
+    dictionaries are processed without loading the whole file into memory.
+
+    :param fp: file opened in the binary mode.
+    :param depth: nesting level of yielded values, 1 for elements of the top level list or dictionary.
+    :param chunk_size: number of bytes read from the file at once.
+    :return: generator of pairs (tuple of list indexes and dictionary keys of the value, value).
+    """
+    stream = _JSONStream(fp, chunk_size)
+
+    def iterate_container(keys):
+        if len(keys) == depth:
+            yield keys, stream.value()
+            return
+        opening = stream.take()
+        if opening not in ('[', '{'):
+            raise ValueError('JSON array or object was expected')
+        closing = ']' if opening == '[' else '}'
+        if stream.peek() == closing:
+            stream.take()
+            return
+        index = 0
+        while True:
+            key = index
+            if opening == '{':
+                key = stream.value()
+                if not isinstance(key, str) or stream.take() != ':':
+                    raise ValueError('JSON object key was expected')
+            index += 1
+            yield from iterate_container(keys + (key,))
+            separator = stream.take()
+            if separator == closing:
+                return
+            if separator != ',':
+                raise ValueError('Delimiter was expected in JSON')
+
+    yield from iterate_container(())
+    if stream.peek():
+        raise ValueError('Extra data was found in JSON')
+
+
 def unique_id():
     return hashlib.md5(now().strftime("%Y%m%d%H%M%S%f%z").encode('utf8')).hexdigest()
 
@@ -263,6 +365,116 @@ class ArchiveFileContent:
                 return zfp.read(self._name)
 
 
+class IndexedArchive:
+    """
+    ZIP archive with the persistent index of its members. Members are read just by their offsets, so the central
+    directory of the archive is not parsed for each access that takes much time for archives with tens of thousands
+    of members like original sources of Linux. Indexes are shared by all instances referring the same archive.
+    """
+    # Number of indexes kept in memory
+    cache_size = 32
+
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+
+    # Local file header of ZIP members
+    _header = struct.Struct('<4s5H3L2H')
+    _header_signature = b'PK\003\004'
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self._state = [stat.st_size, stat.st_mtime_ns]
+        self._members = self.__get_members()
+
+    @classmethod
+    def get(cls, path):
+        """
+        Get the indexed archive.
+        :param path: path to the ZIP archive
+        :return: IndexedArchive instance
+        """
+        stat = os.stat(path)
+        with cls._lock:
+            archive = cls._cache.get(path)
+            if archive is not None and archive._state == [stat.st_size, stat.st_mtime_ns]:
+                cls._cache.move_to_end(path)
+                return archive
+
+        archive = cls(path)
+        with cls._lock:
+            cls._cache[path] = archive
+            while len(cls._cache) > cls.cache_size:
+                cls._cache.popitem(last=False)
+        return archive
+
+    @staticmethod
+    def get_index_path(path):
+        return os.path.join(
+            settings.MEDIA_ROOT, ARCHIVES_INDEX_DIR, os.path.relpath(os.path.abspath(path), settings.MEDIA_ROOT)
+        ) + '.json'
+
+    def __get_members(self):
+        index_path = self.get_index_path(self.path)
+        try:
+            with open(index_path, mode='r', encoding='utf-8') as fp:
+                index = json.load(fp)
+            if index['archive'] == self._state:
+                return index['members']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        with zipfile.ZipFile(self.path) as zfp:
+            members = dict(
+                (info.filename, [info.header_offset, info.compress_type, info.compress_size, info.CRC])
+                for info in zfp.infolist()
+            )
+
+        # Never expose partially written indexes to other processes
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(index_path))
+        try:
+            with os.fdopen(fd, mode='w', encoding='utf-8') as fp:
+                json.dump({'archive': self._state, 'members': members}, fp)
+            os.replace(tmp_path, index_path)
+        except OSError as e:
+            logger.error("Can't save index of archive '{}': {}".format(self.path, e))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return members
+
+    def __contains__(self, name):
+        return name in self._members
+
+    def read(self, name):
+        """
+        Read the archive member.
+        :param name: member name
+        :return: member content or None if there is no such member
+        """
+        if name not in self._members:
+            return None
+        offset, compress_type, compress_size, crc = self._members[name]
+        if compress_type not in {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED}:
+            with zipfile.ZipFile(self.path) as zfp:
+                return zfp.read(name)
+
+        with open(self.path, mode='rb') as fp:
+            fp.seek(offset)
+            header = self._header.unpack(fp.read(self._header.size))
+            if header[0] != self._header_signature:
+                raise zipfile.BadZipFile("Bad magic number for member '{}'".format(name))
+            # Skip member name and extra field
+            fp.seek(header[9] + header[10], os.SEEK_CUR)
+            content = fp.read(compress_size)
+
+        if compress_type == zipfile.ZIP_DEFLATED:
+            content = zlib.decompress(content, -15)
+        if zlib.crc32(content) != crc:
+            raise zipfile.BadZipFile("Bad CRC-32 for member '{}'".format(name))
+        return content
+
+
 class BridgeException(Exception):
     def __init__(self, message=None, code=None, back=None):
         self.back = back
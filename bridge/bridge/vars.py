@@ -226,6 +226,8 @@ ASSOCIATION_TYPE = (
 
 MPTT_FIELDS = ('level', 'lft', 'rght', 'tree_id')
 
+REPORT_TREE_FIELDS = ('tree_path',)
+
 SUBJOB_NAME = 'Subjob'
 
 # Attribute name for coverages table on job page
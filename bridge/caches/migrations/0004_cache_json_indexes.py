@@ -0,0 +1,52 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [('caches', '0003_alter_reportsafecache_verdict_and_more')]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reportsafecache',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['attrs'], name='cache_safe_attrs_gin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportsafecache',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='cache_safe_tags_gin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportunsafecache',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['attrs'], name='cache_unsafe_attrs_gin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportunsafecache',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='cache_unsafe_tags_gin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportunknowncache',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['attrs'], name='cache_unknown_attrs_gin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reportunknowncache',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['problems'], name='cache_unknown_problems_gin_idx'
+            ),
+        ),
+    ]
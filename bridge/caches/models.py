@@ -17,6 +17,7 @@
 
 import uuid
 
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -45,6 +46,10 @@ class ReportSafeCache(models.Model):
 
     class Meta:
         db_table = 'cache_safe'
+        indexes = [
+            GinIndex(fields=['attrs'], name='cache_safe_attrs_gin_idx'),
+            GinIndex(fields=['tags'], name='cache_safe_tags_gin_idx')
+        ]
 
 
 class ReportUnsafeCache(models.Model):
@@ -60,6 +65,10 @@ class ReportUnsafeCache(models.Model):
 
     class Meta:
         db_table = 'cache_unsafe'
+        indexes = [
+            GinIndex(fields=['attrs'], name='cache_unsafe_attrs_gin_idx'),
+            GinIndex(fields=['tags'], name='cache_unsafe_tags_gin_idx')
+        ]
 
 
 class ReportUnknownCache(models.Model):
@@ -73,6 +82,10 @@ class ReportUnknownCache(models.Model):
 
     class Meta:
         db_table = 'cache_unknown'
+        indexes = [
+            GinIndex(fields=['attrs'], name='cache_unknown_attrs_gin_idx'),
+            GinIndex(fields=['problems'], name='cache_unknown_problems_gin_idx')
+        ]
 
 
 class SafeMarkAssociationChanges(models.Model):
@@ -175,7 +175,7 @@ class JobArchiveGenerator:
     def __get_reports_data(self):
         reports = []
         for report in ReportComponent.objects.filter(self._decision_filter)\
-                .select_related('parent', 'computer', 'original_sources', 'additional_sources').order_by('level'):
+                .select_related('parent', 'computer', 'original_sources', 'additional_sources').order_by_tree():
             report_data = DownloadReportComponentSerializer(instance=report).data
 
             # Add report files
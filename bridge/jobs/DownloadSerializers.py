@@ -22,7 +22,7 @@ from django.utils.translation import gettext_lazy as _
 
 from rest_framework import exceptions, serializers, fields
 
-from bridge.vars import MPTT_FIELDS, PRESET_JOB_TYPE
+from bridge.vars import REPORT_TREE_FIELDS, PRESET_JOB_TYPE
 from bridge.utils import require_lock
 from bridge.serializers import TimeStampField
 
@@ -141,7 +141,7 @@ class DownloadReportComponentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ReportComponent
-        exclude = ('id', *MPTT_FIELDS)
+        exclude = ('id', *REPORT_TREE_FIELDS)
         extra_kwargs = {
             'decision': {'read_only': True},
             'log': {'read_only': True},
@@ -163,14 +163,14 @@ class DownloadReportSafeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ReportSafe
-        exclude = ('id', *MPTT_FIELDS)
+        exclude = ('id', *REPORT_TREE_FIELDS)
         extra_kwargs = {'decision': {'read_only': True}}
 
 
 class UploadReportSafeSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReportSafe
-        exclude = ('id', 'parent', 'identifier', 'decision', *MPTT_FIELDS)
+        exclude = ('id', 'parent', 'identifier', 'decision', *REPORT_TREE_FIELDS)
 
 
 class DownloadReportUnsafeSerializer(serializers.ModelSerializer):
@@ -178,14 +178,14 @@ class DownloadReportUnsafeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ReportUnsafe
-        exclude = ('id', *MPTT_FIELDS)
+        exclude = ('id', *REPORT_TREE_FIELDS)
         extra_kwargs = {'decision': {'read_only': True}, 'error_trace': {'read_only': True}}
 
 
 class UploadReportUnsafeSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReportUnsafe
-        exclude = ('id', 'identifier', 'parent', 'error_trace', 'decision', *MPTT_FIELDS)
+        exclude = ('id', 'identifier', 'parent', 'error_trace', 'decision', *REPORT_TREE_FIELDS)
 
 
 class DownloadReportUnknownSerializer(serializers.ModelSerializer):
@@ -193,14 +193,14 @@ class DownloadReportUnknownSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ReportUnknown
-        exclude = ('id', *MPTT_FIELDS)
+        exclude = ('id', *REPORT_TREE_FIELDS)
         extra_kwargs = {'decision': {'read_only': True}, 'problem_description': {'read_only': True}}
 
 
 class UploadReportUnknownSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReportUnknown
-        exclude = ('id', 'identifier', 'parent', 'decision', 'problem_description', *MPTT_FIELDS)
+        exclude = ('id', 'identifier', 'parent', 'decision', 'problem_description', *REPORT_TREE_FIELDS)
 
 
 class DownloadReportAttrSerializer(serializers.ModelSerializer):
@@ -746,18 +746,20 @@ class TableTree:
 
     def __collect_resources(self):
         total_resources = {}
-        for cache_obj in DecisionCache.objects.filter(decision_id__in=self._decisions_ids).select_related('decision'):
+        for cache_obj in DecisionCache.objects.filter(decision_id__in=self._decisions_ids).aggregated():
             value = "{} {} {}".format(
-                HumanizedValue(cache_obj.wall_time, user=self.view.user).timedelta,
-                HumanizedValue(cache_obj.cpu_time, user=self.view.user).timedelta,
-                HumanizedValue(cache_obj.memory, user=self.view.user).memory,
+                HumanizedValue(cache_obj['wall_time'], user=self.view.user).timedelta,
+                HumanizedValue(cache_obj['cpu_time'], user=self.view.user).timedelta,
+                HumanizedValue(cache_obj['memory'], user=self.view.user).memory,
+            )
+            column = 'resource:{}'.format(self.slugify(cache_obj['component']))
+            self._values_data[cache_obj['decision_id']][column] = cell_value(value)
+            total_resources.setdefault(cache_obj['decision_id'], [0, 0, 0])
+            total_resources[cache_obj['decision_id']][0] += cache_obj['wall_time']
+            total_resources[cache_obj['decision_id']][1] += cache_obj['cpu_time']
+            total_resources[cache_obj['decision_id']][2] = max(
+                total_resources[cache_obj['decision_id']][2], cache_obj['memory']
             )
-            column = 'resource:{}'.format(self.slugify(cache_obj.component))
-            self._values_data[cache_obj.decision_id][column] = cell_value(value)
-            total_resources.setdefault(cache_obj.decision_id, [0, 0, 0])
-            total_resources[cache_obj.decision_id][0] += cache_obj.wall_time
-            total_resources[cache_obj.decision_id][1] += cache_obj.cpu_time
-            total_resources[cache_obj.decision_id][2] = max(total_resources[cache_obj.decision_id][2], cache_obj.memory)
 
         for d_id in total_resources:
             value = "{} {} {}".format(
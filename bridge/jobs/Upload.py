@@ -18,6 +18,8 @@
 import os
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 from django.conf import settings
 from django.core.files import File
@@ -28,12 +30,12 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions
 
 from bridge.vars import JOB_UPLOAD_STATUS, DECISION_STATUS, PRESET_JOB_TYPE
-from bridge.utils import BridgeException, RequreLock, extract_archive
+from bridge.utils import BridgeException, RequreLock, extract_archive, iterate_json_items
 
 from jobs.models import JOBFILE_DIR, PresetJob, UploadedJobArchive
 from reports.models import (
-    DecisionCache, ReportSafe, ReportUnsafe, ReportUnknown, ReportComponent,
-    ReportAttr, CoverageArchive, AttrFile, OriginalSources, AdditionalSources, Report
+    DecisionCache, Report, ReportSafe, ReportUnsafe, ReportUnknown, ReportComponent,
+    ReportAttr, CoverageArchive, AttrFile, OriginalSources, AdditionalSources
 )
 from service.models import Decision
 from caches.models import ReportSafeCache, ReportUnsafeCache, ReportUnknownCache
@@ -51,6 +53,7 @@ from tools.utils import Recalculation
 
 class JobArchiveUploader:
     reports_chunk_size = 500
+    files_workers = 8
 
     def __init__(self, upload_obj):
         self._upload_obj = upload_obj
@@ -67,6 +70,10 @@ class JobArchiveUploader:
         self._leaves_ids = set()
         self._computers = {}
         self._reports_chunk = []
+        self._tree_paths = {}
+        self._free_report_ids = []
+        self._executor = None
+        self._files_futures = []
 
     def __enter__(self):
         self.job = None
@@ -230,38 +237,45 @@ class JobArchiveUploader:
             self._original_sources[src_id] = src_obj.id
 
     def __upload_reports(self):
-        # Upload components tree
-        reports_tree_data = self.__read_json_file('{}.json'.format(ReportComponent.__name__), required=True)
-        self._logger.start(JOB_UPLOAD_STATUS[6][0], len(reports_tree_data))
-        chunk_size = 0
-        for report_data in reports_tree_data:
-            decision_id = self.__get_decision_id(report_data['decision'])
-            if report_data['parent'] and (decision_id, report_data['parent']) not in self.saved_reports:
-                self.__upload_reports_chunk()
-                self._logger.update(chunk_size)
-                chunk_size = 0
-                if (decision_id, report_data['parent']) not in self.saved_reports:
+        # Files of reports are copied to the storage by several threads while reports are parsed and saved
+        with ThreadPoolExecutor(max_workers=self.files_workers) as executor:
+            self._executor = executor
+
+            # Upload components tree
+            rel_path = '{}.json'.format(ReportComponent.__name__)
+            for report_data in self.__iterate_json_file(rel_path, JOB_UPLOAD_STATUS[6][0], required=True):
+                decision_id = self.__get_decision_id(report_data['decision'])
+                if report_data['parent'] and (decision_id, report_data['parent']) not in self.saved_reports:
                     raise BridgeException(_('Reports data was corrupted'))
-            elif chunk_size > self.reports_chunk_size:
-                self.__upload_reports_chunk()
-                self._logger.update(chunk_size)
-                chunk_size = 0
-            self._reports_chunk.append(
-                self.__get_report_save_kwargs(decision_id, report_data)
+                self.__add_to_chunk(self.__get_component(decision_id, report_data))
+            self.__upload_reports_chunk()
+            self._logger.end()
+
+            # Upload leaves
+            self.__upload_leaves(ReportSafe, UploadReportSafeSerializer, ReportSafeCache, JOB_UPLOAD_STATUS[7][0])
+            self.__upload_leaves(
+                ReportUnsafe, UploadReportUnsafeSerializer, ReportUnsafeCache, JOB_UPLOAD_STATUS[8][0],
+                file_field='error_trace', add_file='add_trace'
             )
-            chunk_size += 1
-        self.__upload_reports_chunk()
-        self._logger.update(chunk_size)
-        self._logger.end()
-
-        # Upload leaves
-        self.__upload_safes()
-        self.__upload_unsafes()
-        self.__upload_unknowns()
-        self.__upload_attrs()
+            self.__upload_leaves(
+                ReportUnknown, UploadReportUnknownSerializer, ReportUnknownCache, JOB_UPLOAD_STATUS[9][0],
+                file_field='problem_description', add_file='add_problem_desc'
+            )
+            self.__upload_attrs()
+        self._executor = None
         self.__upload_coverage()
 
-    def __get_report_save_kwargs(self, decision_id, report_data):
+    def __get_report_id(self, decision_id, identifier, parent_id):
+        if not self._free_report_ids:
+            self._free_report_ids = Report.objects.reserve_ids(self.reports_chunk_size)
+            self._free_report_ids.reverse()
+        report_id = self._free_report_ids.pop()
+        self.saved_reports[(decision_id, identifier)] = report_id
+        if parent_id is None:
+            return report_id, []
+        return report_id, self._tree_paths[parent_id] + [parent_id]
+
+    def __get_component(self, decision_id, report_data):
         save_kwargs = {
             'decision_id': decision_id,
             'identifier': self.__validate_report_identifier(decision_id, report_data.get('identifier'))
@@ -283,210 +297,120 @@ class JobArchiveUploader:
         if report_data.get('original_sources'):
             save_kwargs['original_sources_id'] = self._original_sources[report_data['original_sources']]
 
-        if report_data.get('log'):
-            save_kwargs['log'] = self.__full_path(report_data['log'])
+        report = ReportComponent(**save_kwargs)
+        report.id, report.tree_path = self.__get_report_id(decision_id, report.identifier, report.parent_id)
+        self._tree_paths[report.id] = report.tree_path
 
+        if report_data.get('log'):
+            self.__attach_file(report.add_log, report_data['log'])
         if report_data.get('verifier_files'):
-            save_kwargs['verifier_files'] = self.__full_path(report_data['verifier_files'])
-
-        return save_kwargs
+            self.__attach_file(report.add_verifier_files, report_data['verifier_files'])
+        return report
+
+    def __attach_file(self, add_file, rel_path):
+        def attach(path):
+            with open(path, mode='rb') as fp:
+                add_file(fp, save=False)
+        self._files_futures.append(self._executor.submit(attach, self.__full_path(rel_path)))
+
+    def __add_to_chunk(self, report, cache_model=None):
+        self._reports_chunk.append(report)
+        if len(self._reports_chunk) >= self.reports_chunk_size:
+            self.__upload_reports_chunk(cache_model)
+
+    def __upload_reports_chunk(self, cache_model=None):
+        # Wait for files of reports of the chunk, exceptions of threads are raised here
+        for future in self._files_futures:
+            future.result()
+        self._files_futures = []
 
-    def __upload_reports_chunk(self):
         with transaction.atomic():
-            with Report.objects.delay_mptt_updates():
-                for report_save_data in self._reports_chunk:
-                    log_file = report_save_data.pop('log', None)
-                    verifier_files_arch = report_save_data.pop('verifier_files', None)
-
-                    report = ReportComponent(**report_save_data)
-                    if log_file:
-                        with open(log_file, mode='rb') as fp:
-                            report.add_log(fp, save=False)
-                    if verifier_files_arch:
-                        with open(verifier_files_arch, mode='rb') as fp:
-                            report.add_verifier_files(fp, save=False)
-                    report.save()
-                    self.saved_reports[(report.decision_id, report.identifier)] = report.id
+            Report.objects.bulk_create_inherited(self._reports_chunk)
+            if cache_model:
+                cache_model.objects.bulk_create(list(
+                    cache_model(decision_id=report.decision_id, report_id=report.id) for report in self._reports_chunk
+                ))
         self._reports_chunk = []
 
-    def __upload_safes(self):
-        safes_data = self.__read_json_file('{}.json'.format(ReportSafe.__name__))
-        if not safes_data:
-            return
-
-        self._logger.start(JOB_UPLOAD_STATUS[7][0])
-
-        safes_cache = []
-        new_reports = []
-        for report_data in safes_data:
-            decision_id = self.__get_decision_id(report_data.get('decision'))
-            parent_id = self.saved_reports[(decision_id, report_data.pop('parent'))]
-            identifier = self.__validate_report_identifier(decision_id, report_data.pop('identifier'))
-            serializer = UploadReportSafeSerializer(data=report_data)
-            serializer.is_valid(raise_exception=True)
-            new_reports.append(ReportSafe(
-                decision_id=decision_id, identifier=identifier, parent_id=parent_id, **serializer.validated_data
-            ))
-
-        with transaction.atomic():
-            with Report.objects.delay_mptt_updates():
-                for report in new_reports:
-                    report.save()
-
-        reports_qs = ReportSafe.objects.filter(decision_id__in=list(self._decisions.values()))\
-            .only('id', 'identifier', 'decision_id')
-        for report in reports_qs:
-            self.saved_reports[(report.decision_id, report.identifier)] = report.id
-            self._leaves_ids.add(report.id)
-            safes_cache.append(ReportSafeCache(decision_id=report.decision_id, report_id=report.id))
-
-        ReportSafeCache.objects.bulk_create(safes_cache)
-        self._logger.end()
-
-    def __upload_unsafes(self):
-        unsafes_data = self.__read_json_file('{}.json'.format(ReportUnsafe.__name__))
-        if not unsafes_data:
-            return
-        self._logger.start(JOB_UPLOAD_STATUS[8][0])
-
-        unsafes_cache = []
-        new_reports = []
-        for report_data in unsafes_data:
-            decision_id = self.__get_decision_id(report_data.get('decision'))
-            parent_id = self.saved_reports[(decision_id, report_data.pop('parent'))]
-            identifier = self.__validate_report_identifier(decision_id, report_data.pop('identifier'))
-            error_trace = self.__full_path(report_data['error_trace'])
-            serializer = UploadReportUnsafeSerializer(data=report_data)
-            serializer.is_valid(raise_exception=True)
-
-            report = ReportUnsafe(
-                identifier=identifier, decision_id=decision_id, parent_id=parent_id, **serializer.validated_data
-            )
-            with open(error_trace, mode='rb') as fp:
-                report.add_trace(fp, save=False)
-            new_reports.append(report)
-
-        with transaction.atomic():
-            with Report.objects.delay_mptt_updates():
-                for report in new_reports:
-                    report.save()
-
-        reports_qs = ReportUnsafe.objects.filter(decision_id__in=list(self._decisions.values()))\
-            .only('id', 'identifier', 'decision_id')
-        for report in reports_qs:
-            self.saved_reports[(report.decision_id, report.identifier)] = report.id
-            self._leaves_ids.add(report.id)
-            unsafes_cache.append(ReportUnsafeCache(decision_id=report.decision_id, report_id=report.id))
-
-        ReportUnsafeCache.objects.bulk_create(unsafes_cache)
-        self._logger.end()
-
-    def __upload_unknowns(self):
-        unknowns_data = self.__read_json_file('{}.json'.format(ReportUnknown.__name__))
-        if not unknowns_data:
-            return
-        self._logger.start(JOB_UPLOAD_STATUS[9][0])
-
-        unknowns_cache = []
-        new_reports = []
-        for report_data in unknowns_data:
+    def __upload_leaves(self, model, serializer_class, cache_model, status, file_field=None, add_file=None):
+        for report_data in self.__iterate_json_file('{}.json'.format(model.__name__), status):
             decision_id = self.__get_decision_id(report_data.get('decision'))
             parent_id = self.saved_reports[(decision_id, report_data.pop('parent'))]
             identifier = self.__validate_report_identifier(decision_id, report_data.pop('identifier'))
-            problem_description = self.__full_path(report_data['problem_description'])
-            serializer = UploadReportUnknownSerializer(data=report_data)
+            serializer = serializer_class(data=report_data)
             serializer.is_valid(raise_exception=True)
 
-            report = ReportUnknown(
-                decision_id=decision_id, parent_id=parent_id, identifier=identifier, **serializer.validated_data
+            report = model(
+                decision_id=decision_id, identifier=identifier, parent_id=parent_id, **serializer.validated_data
             )
-            with open(problem_description, mode='rb') as fp:
-                report.add_problem_desc(fp, save=False)
-            new_reports.append(report)
-
-        with transaction.atomic():
-            with Report.objects.delay_mptt_updates():
-                for report in new_reports:
-                    report.save()
-
-        reports_qs = ReportUnknown.objects.filter(decision_id__in=list(self._decisions.values()))\
-            .only('id', 'identifier', 'decision_id')
-        for report in reports_qs:
-            self.saved_reports[(report.decision_id, report.identifier)] = report.id
+            report.id, report.tree_path = self.__get_report_id(decision_id, identifier, parent_id)
             self._leaves_ids.add(report.id)
-            unknowns_cache.append(ReportUnknownCache(decision_id=report.decision_id, report_id=report.id))
-
-        ReportUnknownCache.objects.bulk_create(unknowns_cache)
+            if file_field:
+                self.__attach_file(getattr(report, add_file), report_data[file_field])
+            self.__add_to_chunk(report, cache_model)
+        self.__upload_reports_chunk(cache_model)
         self._logger.end()
 
     def __upload_attrs(self):
-        attrs_data = self.__read_json_file('{}.json'.format(ReportAttr.__name__), required=True)
         attrs_cache = {}
+        attr_files = {}
         new_attrs = []
-        new_attr_files = {}
-        cnt = 0
-        self._logger.start(JOB_UPLOAD_STATUS[10][0], total=100)
-        for old_d_id in attrs_data:
+        rel_path = '{}.json'.format(ReportAttr.__name__)
+        for (old_d_id, r_id, _), adata in self.__iterate_json_file(
+                rel_path, JOB_UPLOAD_STATUS[10][0], required=True, depth=3, with_keys=True):
             decision_id = self.__get_decision_id(int(old_d_id))
-            for r_id in attrs_data[old_d_id]:
-                for adata in attrs_data[old_d_id][r_id]:
-                    report_id = self.saved_reports[(decision_id, r_id)]
-                    data_file = adata.pop('data_file', None)
-
-                    serializer = DownloadReportAttrSerializer(data=adata)
-                    serializer.is_valid(raise_exception=True)
-                    validated_data = serializer.validated_data
-
-                    new_attrs.append(ReportAttr(report_id=report_id, **validated_data))
-                    if data_file is not None:
-                        file_key = (decision_id, data_file)
-                        new_attr_files.setdefault(file_key, [])
-                        new_attr_files[file_key].append(cnt)
-                    cnt += 1
-
-                    if report_id in self._leaves_ids:
-                        attrs_cache.setdefault(report_id, {'attrs': {}})
-                        attrs_cache[report_id]['attrs'][validated_data['name']] = validated_data['value']
-        self._logger.update(10)
-
-        attr_file_number = len(new_attr_files)
-        if attr_file_number > 0:
-            # Upload attributes' files
-            with transaction.atomic():
-                step_percent_number = int(attr_file_number / 70)
-                attr_file_cnt = 0
-                for decision_id, file_path in new_attr_files:
-                    attr_file_obj = AttrFile(decision_id=decision_id)
-                    with open(self.__full_path(file_path), mode='rb') as fp:
-                        attr_file_obj.file.save(os.path.basename(file_path), File(fp), save=True)
-
-                    for i in new_attr_files[(decision_id, file_path)]:
-                        # Add link to file for attributes that have it
-                        new_attrs[i].data_id = attr_file_obj.id
-                    attr_file_cnt += 1
-                    if attr_file_cnt > step_percent_number:
-                        self._logger.update(int(70 * attr_file_cnt / attr_file_number))
-                        attr_file_cnt = 0
-        else:
-            self._logger.update(70)
+            report_id = self.saved_reports[(decision_id, r_id)]
+            data_file = adata.pop('data_file', None)
 
-        ReportAttr.objects.bulk_create(new_attrs)
-        self._logger.update(10)
+            serializer = DownloadReportAttrSerializer(data=adata)
+            serializer.is_valid(raise_exception=True)
+            validated_data = serializer.validated_data
+
+            new_attr = ReportAttr(report_id=report_id, **validated_data)
+            if data_file is not None:
+                file_key = (decision_id, data_file)
+                if file_key not in attr_files:
+                    attr_files[file_key] = AttrFile(decision_id=decision_id)
+                    self.__attach_file(partial(attr_files[file_key].file.save, os.path.basename(data_file)), data_file)
+                new_attr.data = attr_files[file_key]
+            new_attrs.append(new_attr)
+
+            if report_id in self._leaves_ids:
+                attrs_cache.setdefault(report_id, {'attrs': {}})
+                attrs_cache[report_id]['attrs'][validated_data['name']] = validated_data['value']
+
+            if len(new_attrs) >= self.reports_chunk_size:
+                self.__upload_attrs_chunk(new_attrs)
+                new_attrs = []
+        self.__upload_attrs_chunk(new_attrs)
 
         decisions_ids = list(self._decisions.values())
         update_cache_atomic(ReportSafeCache.objects.filter(report__decision_id__in=decisions_ids), attrs_cache)
         update_cache_atomic(ReportUnsafeCache.objects.filter(report__decision_id__in=decisions_ids), attrs_cache)
         update_cache_atomic(ReportUnknownCache.objects.filter(report__decision_id__in=decisions_ids), attrs_cache)
-        self._logger.update(10)
         self._logger.end()
 
-    def __upload_coverage(self):
-        coverage_data = self.__read_json_file('{}.json'.format(CoverageArchive.__name__))
-        if not coverage_data:
-            return
-        self._logger.start(JOB_UPLOAD_STATUS[11][0], len(coverage_data))
+    def __upload_attrs_chunk(self, new_attrs):
+        for future in self._files_futures:
+            future.result()
+        self._files_futures = []
+
+        # Files can be shared by attributes of different chunks, so each of them is saved just once
+        new_files = {}
+        for attr in new_attrs:
+            if attr.data is not None and attr.data.id is None:
+                new_files[id(attr.data)] = attr.data
+
+        with transaction.atomic():
+            AttrFile.objects.bulk_create(list(new_files.values()))
+            for attr in new_attrs:
+                if attr.data is not None:
+                    attr.data_id = attr.data.id
+            ReportAttr.objects.bulk_create(new_attrs)
 
-        for coverage in coverage_data:
+    def __upload_coverage(self):
+        rel_path = '{}.json'.format(CoverageArchive.__name__)
+        for coverage in self.__iterate_json_file(rel_path, JOB_UPLOAD_STATUS[11][0]):
             decision_id = self.__get_decision_id(coverage['decision'])
             instance = CoverageArchive(
                 report_id=self.saved_reports[(decision_id, coverage['report'])],
@@ -500,7 +424,6 @@ class JobArchiveUploader:
             instance.total = res.total_coverage
             instance.has_extra = res.has_extra
             instance.save()
-            self._logger.update()
         self._logger.end()
 
     def __get_decision_id(self, old_id):
@@ -542,6 +465,24 @@ class JobArchiveUploader:
             )
         return full_path
 
+    def __iterate_json_file(self, rel_path, status, required=False, depth=1, with_keys=False):
+        full_path = os.path.join(self._jobdir, rel_path)
+        if not os.path.exists(full_path):
+            if required:
+                raise BridgeException(
+                    _('Required file was not found in job archive: %(filename)s') % {'filename': rel_path}
+                )
+            return
+
+        # Progress is measured in bytes as the number of items is unknown until the whole file is parsed
+        self._logger.start(status, max(os.path.getsize(full_path), 1))
+        with open(full_path, mode='rb') as fp:
+            position = 0
+            for keys, value in iterate_json_items(fp, depth=depth):
+                yield (keys, value) if with_keys else value
+                self._logger.update(fp.tell() - position)
+                position = fp.tell()
+
     def __read_json_file(self, rel_path, required=False):
         full_path = os.path.join(self._jobdir, rel_path)
         if os.path.exists(full_path):
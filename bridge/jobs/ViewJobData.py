@@ -498,13 +498,13 @@ class ViewJobData:
 
     def __resource_info(self):
         cache_data = {}
-        for cache_obj in DecisionCache.objects.filter(decision=self.decision):
-            cache_data[cache_obj.component] = {
-                'cpu_time': cache_obj.cpu_time,
-                'wall_time': cache_obj.wall_time,
-                'memory': cache_obj.memory,
-                'finished': cache_obj.finished,
-                'total': cache_obj.total
+        for cache_obj in DecisionCache.objects.filter(decision=self.decision).aggregated():
+            cache_data[cache_obj['component']] = {
+                'cpu_time': cache_obj['cpu_time'],
+                'wall_time': cache_obj['wall_time'],
+                'memory': cache_obj['memory'],
+                'finished': cache_obj['finished'],
+                'total': cache_obj['total']
             }
         return ResourcesInfo(self.user, self.view, cache_data).info
 
@@ -19,13 +19,16 @@ import copy
 import json
 import re
 
+from collections import OrderedDict, deque
+
+from django.db.models import Count, Max, Sum
 from django.utils.translation import gettext_lazy as _
 
 from bridge.vars import ASSOCIATION_TYPE, PROBLEM_DESC_FILE
 from bridge.utils import BridgeException, logger, ArchiveFileContent, require_lock
 
 from reports.models import ReportUnknown
-from marks.models import MAX_PROBLEM_LEN, MarkUnknownHistory, MarkUnknownReport
+from marks.models import MAX_PROBLEM_LEN, MarkUnknown, MarkUnknownHistory, MarkUnknownReport
 
 from marks.utils import ConfirmAssociationBase, UnconfirmAssociationBase
 from caches.utils import RecalculateUnknownCache, UpdateUnknownCachesOnMarkChange
@@ -104,39 +107,179 @@ class UnconfirmUnknownMark(UnconfirmAssociationBase):
         RecalculateUnknownCache(report_id)
 
 
-class MatchUnknown:
-    def __init__(self, description, func, pattern, is_regexp):
-        self.description = description
-        self.function = func
-        self.pattern = pattern
-        if is_regexp:
-            self.problem = self.__match_desc_regexp()
-        else:
-            self.problem = self.__match_desc()
+def get_problem(problem):
+    if isinstance(problem, str) and len(problem) == 0:
+        return None
+    if isinstance(problem, str) and len(problem) > MAX_PROBLEM_LEN:
+        logger.error("Generated problem '%s' is too long" % problem)
+        return 'Too long!'
+    return problem
+
+
+def format_problem(pattern, match):
+    try:
+        return pattern.format(*match.groups())
+    except IndexError:
+        return pattern
+
+
+class ProblemDescriptions:
+    # Maximum total length of cached problem descriptions
+    cache_size = 32 * 1024 * 1024
+
+    # Problem descriptions are never changed after uploading, so they are cached by their archive names
+    _cache = OrderedDict()
+    _cache_length = 0
+
+    @classmethod
+    def get(cls, report):
+        """
+        Get problem description of the unknown.
+        :param report: ReportUnknown instance
+        :return: problem description text
+        """
+        key = report.problem_description.name
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+            return cls._cache[key]
+
+        desc = ArchiveFileContent(report, 'problem_description', PROBLEM_DESC_FILE).content.decode('utf8')
+        cls._cache[key] = desc
+        cls._cache_length += len(desc)
+        while cls._cache_length > cls.cache_size and len(cls._cache) > 1:
+            cls._cache_length -= len(cls._cache.popitem(last=False)[1])
+        return desc
+
+
+class AhoCorasick:
+    """
+    Automaton searching for all given substrings of text in a single pass over it.
+    """
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [set()]
+        for word in words:
+            self.__add_word(word)
+        self.__build_failure_links()
+
+    def __add_word(self, word):
+        state = 0
+        for char in word:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].add(word)
+
+    def __build_failure_links(self):
+        states = deque(self._goto[0].values())
+        while states:
+            state = states.popleft()
+            for char, next_state in self._goto[state].items():
+                states.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def search(self, text):
+        """
+        Search for words in the text.
+        :param text: str
+        :return: set of found words
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+class UnknownMarksMatcher:
+    """
+    Matcher of problem descriptions of unknowns with marks. Regular expressions of marks are compiled just once while
+    plain substrings of marks are searched for by a single pass over problem descriptions.
+    """
+
+    # Plain substrings are searched for with help of Aho-Corasick automaton if there are at least so many of them
+    aho_corasick_threshold = 128
+
+    # Matchers of marks of components. Each one is reused until marks of its component are changed.
+    _cache = {}
+
+    def __init__(self, marks):
+        self._regexps = []
+        self._substrings = {}
+        for mark in marks:
+            if mark.is_regexp:
+                try:
+                    regexp = re.compile(mark.function, re.MULTILINE)
+                except Exception as e:
+                    logger.exception("Regexp error: %s" % e, stack_info=True)
+                    continue
+                self._regexps.append((mark.id, regexp, mark.problem_pattern))
+            else:
+                self._substrings.setdefault(mark.function, []).append((mark.id, mark.problem_pattern))
+
+        self._automaton = None
+        if len(self._substrings) >= self.aho_corasick_threshold:
+            # Empty substring is contained in any text, it can not be searched for by the automaton
+            self._automaton = AhoCorasick(word for word in self._substrings if word)
+
+    @classmethod
+    def for_component(cls, component):
+        """
+        Get matcher of all marks of the component.
+        :param component: component name
+        :return: UnknownMarksMatcher instance
+        """
+        marks_qs = MarkUnknown.objects.filter(component=component)
+
+        # Any creation, deletion or edition of marks changes the state
+        state = tuple(marks_qs.aggregate(Count('id'), Max('id'), Sum('version')).values())
+        if component not in cls._cache or cls._cache[component][0] != state:
+            cls._cache[component] = (state, cls(marks_qs.only('id', 'function', 'problem_pattern', 'is_regexp')))
+        return cls._cache[component][1]
+
+    def __found_substrings(self, description):
+        if self._automaton is None:
+            return set(word for word in self._substrings if word in description)
+        found = self._automaton.search(description)
+        if '' in self._substrings:
+            found.add('')
+        return found
+
+    def match(self, description, marks_ids=None):
+        """
+        Match problem description with marks.
+        :param description: problem description text
+        :param marks_ids: identifiers of marks to match with, if None then all marks are used
+        :return: dictionary with problems of matched marks by their identifiers
+        """
+        problems = {}
+        for mark_id, regexp, pattern in self._regexps:
+            if marks_ids is not None and mark_id not in marks_ids:
+                continue
+            m = regexp.search(description)
+            if m is not None:
+                problems[mark_id] = get_problem(format_problem(pattern, m))
 
-        if isinstance(self.problem, str) and len(self.problem) == 0:
-            self.problem = None
-        if isinstance(self.problem, str) and len(self.problem) > MAX_PROBLEM_LEN:
-            logger.error("Generated problem '%s' is too long" % self.problem)
-            self.problem = 'Too long!'
+        for word in self.__found_substrings(description):
+            for mark_id, pattern in self._substrings[word]:
+                if marks_ids is None or mark_id in marks_ids:
+                    problems[mark_id] = get_problem(pattern)
 
-    def __match_desc_regexp(self):
-        try:
-            m = re.search(self.function, self.description, re.MULTILINE)
-        except Exception as e:
-            logger.exception("Regexp error: %s" % e, stack_info=True)
-            return None
-        if m is None:
-            return None
-        try:
-            return self.pattern.format(*m.groups())
-        except IndexError:
-            return self.pattern
-
-    def __match_desc(self):
-        if self.description.find(self.function) < 0:
-            return None
-        return self.pattern
+        return dict((mark_id, problem) for mark_id, problem in problems.items() if problem)
 
 
 class ConnectUnknownMark:
@@ -153,7 +296,7 @@ class ConnectUnknownMark:
 
     def __get_unknown_desc(self, report):
         try:
-            return ArchiveFileContent(report, 'problem_description', PROBLEM_DESC_FILE).content.decode('utf8')
+            return ProblemDescriptions.get(report)
         except Exception as e:
             logger.error("Can't get problem description for unknown '%s': %s" % (report.id, e))
             return None
@@ -165,16 +308,14 @@ class ConnectUnknownMark:
 
         new_links = set()
         associations = []
+        matcher = UnknownMarksMatcher([self._mark])
         for report in ReportUnknown.objects\
                 .filter(component=self._mark.component, cache__attrs__contains=self._mark.cache_attrs)\
                 .select_related('cache').only('id', 'problem_description', 'cache__marks_confirmed'):
             unknown_desc = self.__get_unknown_desc(report)
             if not unknown_desc:
                 continue
-            problem = MatchUnknown(
-                unknown_desc, self._mark.function,
-                self._mark.problem_pattern, self._mark.is_regexp
-            ).problem
+            problem = matcher.match(unknown_desc).get(self._mark.id)
             if not problem:
                 continue
 
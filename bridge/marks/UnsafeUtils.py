@@ -120,6 +120,22 @@ def regexp_match(error_trace_text: str, regexp: str):
                               else re.compile(regexp, flags=re.M | re.S), error_trace_text)))
 
 
+def get_association_result(res, threshold):
+    if res is None:
+        return {
+            'type': ASSOCIATION_TYPE[0][0],
+            'result': 0,
+            'error': str(UNKNOWN_ERROR),
+            'associated': False
+        }
+
+    is_associated = bool(res > 0 and res >= threshold)
+    return {
+        'type': is_associated and ASSOCIATION_TYPE[2][0] or ASSOCIATION_TYPE[0][0],
+        'result': res, 'error': None, 'associated': is_associated
+    }
+
+
 def get_report_trace(report):
     try:
         error_trace_str = ArchiveFileContent(report, 'error_trace', ERROR_TRACE_FILE).content.decode('utf8')
@@ -151,6 +167,7 @@ class ErrorTraceConverter:
                 forest_hash = hashlib.md5(forest_str.encode('utf8')).hexdigest()
                 forests_hashsums.append(forest_hash)
             conv.trace_cache = {'forest': forests_hashsums}
+            conv.forests = forests_hashsums
 
         conv.file.save(ET_FILE_NAME, File(fp), save=True)
         return conv
@@ -432,18 +449,13 @@ class CompareMark:
         if self._mark.function == 'regexp_match':
             pass
         elif self._mark.error_trace:
-            mark_forests = set(self._mark.error_trace.trace_cache['forest'])
+            mark_forests = set(self._mark.error_trace.forests)
         else:
             raise ValueError("The mark does not have an error trace")
 
         for report_id in reports_cache:
             if reports_cache[report_id] is None:
-                results[report_id] = {
-                    'type': ASSOCIATION_TYPE[0][0],
-                    'result': 0,
-                    'error': str(UNKNOWN_ERROR),
-                    'associated': False
-                }
+                results[report_id] = get_association_result(None, self._mark.threshold)
                 continue
 
             if mark_forests is None:
@@ -452,13 +464,9 @@ class CompareMark:
                     raw_trace = fp.read()
                 res = regexp_match(raw_trace, self._mark.regexp)
             else:
-                res = jaccard(mark_forests, set(reports_cache[report_id].trace_cache['forest']))
+                res = jaccard(mark_forests, set(reports_cache[report_id].forests))
 
-            is_associated = bool(res > 0 and res >= self._mark.threshold)
-            results[report_id] = {
-                'type': is_associated and ASSOCIATION_TYPE[2][0] or ASSOCIATION_TYPE[0][0],
-                'result': res, 'error': None, 'associated': is_associated
-            }
+            results[report_id] = get_association_result(res, self._mark.threshold)
         return results
 
 
@@ -495,42 +503,48 @@ class CompareReport:
                 self._trace_forests_cache[convert_function] = None
             else:
                 self._new_converted_cache.append(UnsafeConvertionCache(unsafe=self._report, converted_id=conv.id))
-                self._trace_forests_cache[convert_function] = set(conv.trace_cache['forest'])
+                self._trace_forests_cache[convert_function] = set(conv.forests)
         return self._trace_forests_cache[convert_function]
 
-    def compare(self, marks_qs):
-        # WARNING: ensure there is select_related('error_trace') for marks queryset
+    def __compare_forests(self, marks_qs, convert_function, results):
+        marks_ids = set(marks_qs.values_list('id', flat=True))
+        if not marks_ids:
+            return
 
-        results = {}
-        for mark in marks_qs:
-            res = None
-            convert_func = COMPARE_FUNCTIONS[mark.function]['convert']
-            if mark.function == 'regexp_match':
-                raw_trace = self.__get_raw_trace(convert_func)
-                if raw_trace is not None:
-                    res = regexp_match(raw_trace, mark.regexp)
-            elif mark.error_trace:
-                report_forests = self.__get_trace_forests(convert_func)
-                if report_forests is not None:
-                    res = jaccard(set(mark.error_trace.trace_cache['forest']), report_forests)
-            else:
-                # Ignore non-regexp marks without error trace
-                continue
+        report_forests = self.__get_trace_forests(convert_function)
+        if report_forests is None:
+            for mark_id in marks_ids:
+                results[mark_id] = get_association_result(None, 0)
+            return
 
-            if res is None:
-                results[mark.id] = {
-                    'type': ASSOCIATION_TYPE[0][0],
-                    'result': 0,
-                    'error': str(UNKNOWN_ERROR),
-                    'associated': False
-                }
-                continue
+        # Jaccard index can be positive just for marks having common forests with the report (or for marks without
+        # forests at all if the report does not have them as well), so just such marks are found with help of the
+        # inverted index on forest hash sums and compared exactly. Other marks are dissimilar.
+        if report_forests:
+            similar_qs = marks_qs.filter(error_trace__forests__overlap=list(report_forests))
+        else:
+            similar_qs = marks_qs.filter(error_trace__forests__len=0)
+        for mark_id, threshold, mark_forests in similar_qs.values_list('id', 'threshold', 'error_trace__forests'):
+            results[mark_id] = get_association_result(jaccard(set(mark_forests), report_forests), threshold)
+
+        for mark_id in marks_ids - set(results):
+            results[mark_id] = get_association_result(0, 0)
 
-            is_associated = bool(res > 0 and res >= mark.threshold)
-            results[mark.id] = {
-                'type': is_associated and ASSOCIATION_TYPE[2][0] or ASSOCIATION_TYPE[0][0],
-                'result': res, 'error': None, 'associated': is_associated
-            }
+    def compare(self, marks_qs):
+        results = {}
+        for mark in marks_qs.filter(function='regexp_match'):
+            res = None
+            raw_trace = self.__get_raw_trace(COMPARE_FUNCTIONS[mark.function]['convert'])
+            if raw_trace is not None:
+                res = regexp_match(raw_trace, mark.regexp)
+            results[mark.id] = get_association_result(res, mark.threshold)
+
+        # Ignore non-regexp marks without error trace
+        for compare_function in sorted(set(COMPARE_FUNCTIONS) - {'regexp_match'}):
+            self.__compare_forests(
+                marks_qs.filter(function=compare_function, error_trace__isnull=False),
+                COMPARE_FUNCTIONS[compare_function]['convert'], results
+            )
 
         # Save convertion cache
         UnsafeConvertionCache.objects.filter(unsafe=self._report).delete()
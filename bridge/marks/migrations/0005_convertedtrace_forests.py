@@ -0,0 +1,46 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+def fill_forests(apps, schema_editor):
+    ConvertedTrace = apps.get_model('marks', 'ConvertedTrace')
+    for conv in ConvertedTrace.objects.only('id', 'trace_cache').iterator():
+        forests = conv.trace_cache.get('forest')
+        if forests:
+            ConvertedTrace.objects.filter(id=conv.id).update(forests=forests)
+
+
+class Migration(migrations.Migration):
+    dependencies = [('marks', '0004_alter_marksafe_verdict_alter_marksafehistory_verdict_and_more')]
+
+    operations = [
+        migrations.AddField(
+            model_name='convertedtrace', name='forests',
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=32), default=list, size=None
+            ),
+        ),
+        migrations.RunPython(fill_forests, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='convertedtrace',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['forests'], name='trace_forests_gin_idx'),
+        ),
+    ]
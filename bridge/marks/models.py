@@ -20,6 +20,7 @@ import uuid
 from django.db import models
 from django.db.models.signals import post_delete
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.urls import reverse
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
@@ -42,9 +43,12 @@ class ConvertedTrace(WithFilesMixin, models.Model):
     file = models.FileField(upload_to=CONVERTED_DIR, null=False)
     function = models.CharField(max_length=30, db_index=True, verbose_name=_('Convert trace function'))
     trace_cache = models.JSONField()
+    # Hash sums of forests (the same as in trace_cache) to find similar error traces with help of the inverted index
+    forests = ArrayField(models.CharField(max_length=32), default=list)
 
     class Meta:
         db_table = 'cache_marks_trace'
+        indexes = [GinIndex(fields=['forests'], name='trace_forests_gin_idx')]
 
     def __str__(self):
         return self.hash_sum
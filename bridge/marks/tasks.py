@@ -17,16 +17,20 @@
 
 from celery import shared_task
 
-from bridge.vars import PROBLEM_DESC_FILE, ASSOCIATION_TYPE
-from bridge.utils import BridgeException, ArchiveFileContent
+from bridge.vars import ASSOCIATION_TYPE
+from bridge.utils import logger, BridgeException
 
 from reports.models import ReportSafe, ReportUnsafe, ReportUnknown
 from marks.models import MarkSafe, MarkSafeReport, MarkUnsafe, MarkUnsafeReport, MarkUnknown, MarkUnknownReport
 
 from marks.UnsafeUtils import CompareReport
-from marks.UnknownUtils import MatchUnknown
+from marks.UnknownUtils import ProblemDescriptions, UnknownMarksMatcher
 from caches.utils import RecalculateSafeCache, RecalculateUnsafeCache, RecalculateUnknownCache
 
+# Maximum number of unsafes/unknowns to associate with marks by a single task
+UNSAFE_REPORTS_BATCH_SIZE = 100
+UNKNOWN_REPORTS_BATCH_SIZE = 100
+
 
 @shared_task
 def connect_safe_report(report_id):
@@ -39,32 +43,62 @@ def connect_safe_report(report_id):
     RecalculateSafeCache(report.id)
 
 
+def create_unsafe_report_associations(report):
+    marks_qs = MarkUnsafe.objects.filter(cache_attrs__contained_by=report.cache.attrs)
+    compare_results = CompareReport(report).compare(marks_qs)
+    return list(MarkUnsafeReport(
+        mark_id=mark_id, report=report, **compare_results[mark_id]
+    ) for mark_id in compare_results)
+
+
 @shared_task
 def connect_unsafe_report(report_id):
     report = ReportUnsafe.objects.select_related('cache').get(pk=report_id)
-    marks_qs = MarkUnsafe.objects.filter(cache_attrs__contained_by=report.cache.attrs).select_related('error_trace')
-    compare_results = CompareReport(report).compare(marks_qs)
-
-    MarkUnsafeReport.objects.bulk_create(list(MarkUnsafeReport(
-        mark_id=mark.id, report=report, **compare_results[mark.id]
-    ) for mark in marks_qs))
+    MarkUnsafeReport.objects.bulk_create(create_unsafe_report_associations(report))
     RecalculateUnsafeCache(report.id)
 
 
 @shared_task
-def connect_unknown_report(report_id):
-    report = ReportUnknown.objects.select_related('cache').get(pk=report_id)
+def connect_unsafe_reports(reports_ids):
+    new_markreports = []
+    for report in ReportUnsafe.objects.filter(pk__in=reports_ids).select_related('cache'):
+        new_markreports.extend(create_unsafe_report_associations(report))
+    MarkUnsafeReport.objects.bulk_create(new_markreports)
+    RecalculateUnsafeCache(list(reports_ids))
+
+
+def create_unknown_report_associations(report, matcher):
     try:
-        problem_desc = ArchiveFileContent(report, 'problem_description', PROBLEM_DESC_FILE).content.decode('utf8')
+        problem_desc = ProblemDescriptions.get(report)
     except Exception as e:
         raise BridgeException("Can't read problem description for unknown '{}': {}".format(report.id, e))
+    marks_ids = set(MarkUnknown.objects.filter(
+        component=report.component, cache_attrs__contained_by=report.cache.attrs
+    ).values_list('id', flat=True))
+    return list(MarkUnknownReport(
+        mark_id=mark_id, report=report, problem=problem, associated=True, type=ASSOCIATION_TYPE[2][0]
+    ) for mark_id, problem in matcher.match(problem_desc, marks_ids).items())
+
+
+@shared_task
+def connect_unknown_report(report_id):
+    report = ReportUnknown.objects.select_related('cache').get(pk=report_id)
+    matcher = UnknownMarksMatcher.for_component(report.component)
+    MarkUnknownReport.objects.bulk_create(create_unknown_report_associations(report, matcher))
+    RecalculateUnknownCache(report.id)
+
+
+@shared_task
+def connect_unknown_reports(reports_ids):
     new_markreports = []
-    for mark in MarkUnknown.objects.filter(component=report.component, cache_attrs__contained_by=report.cache.attrs):
-        problem = MatchUnknown(problem_desc, mark.function, mark.problem_pattern, mark.is_regexp).problem
-        if not problem:
-            continue
-        new_markreports.append(MarkUnknownReport(
-            mark_id=mark.id, report=report, problem=problem, associated=True, type=ASSOCIATION_TYPE[2][0]
-        ))
+    matchers = {}
+    for report in ReportUnknown.objects.filter(pk__in=reports_ids).select_related('cache'):
+        if report.component not in matchers:
+            matchers[report.component] = UnknownMarksMatcher.for_component(report.component)
+        try:
+            new_markreports.extend(create_unknown_report_associations(report, matchers[report.component]))
+        except BridgeException as e:
+            # Associate other unknowns of the batch anyway
+            logger.error(e)
     MarkUnknownReport.objects.bulk_create(new_markreports)
-    RecalculateUnknownCache(report.id)
+    RecalculateUnknownCache(list(reports_ids))
@@ -16,7 +16,9 @@
 #
 
 import os
+import re
 import json
+import random
 
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
@@ -36,6 +38,8 @@ from marks.models import (
     SafeAssociationLike, UnsafeAssociationLike, UnknownAssociationLike
 )
 
+from marks.UnknownUtils import AhoCorasick, UnknownMarksMatcher, get_problem
+
 from reports.test import DecideJobs, SJC_1
 
 REPORT_ARCHIVES = os.path.join(settings.BASE_DIR, 'reports', 'test_files')
@@ -1282,3 +1286,144 @@ class TestMarks(KleverTestCase):
         if os.path.exists(os.path.join(settings.MEDIA_ROOT, self.all_marks_arch)):
             os.remove(os.path.join(settings.MEDIA_ROOT, self.all_marks_arch))
         super(TestMarks, self).tearDown()
+
+
+def match_unknown(description, function, pattern, is_regexp):
+    # Matching of the problem description with a single mark as it was done before UnknownMarksMatcher
+    if is_regexp:
+        m = re.search(function, description, re.MULTILINE)
+        if m is None:
+            return None
+        try:
+            problem = pattern.format(*m.groups())
+        except IndexError:
+            problem = pattern
+    elif description.find(function) < 0:
+        return None
+    else:
+        problem = pattern
+    return get_problem(problem)
+
+
+class TestUnknownMarksMatcher(KleverTestCase):
+    descriptions = [
+        "KeyError: 'attr' was not found.",
+        'Traceback (most recent call last):\n  File "core.py", line 10\nValueError: Invalid value 42',
+        'CPU time exhausted',
+        'Memory exhausted\nCPU time exhausted',
+        ''
+    ]
+
+    def setUp(self):
+        super(TestUnknownMarksMatcher, self).setUp()
+        self.random = random.Random(0)
+
+    def __random_word(self, alphabet='abc', max_len=4):
+        return ''.join(self.random.choice(alphabet) for _ in range(self.random.randint(0, max_len)))
+
+    def __marks(self, number):
+        marks = [
+            MarkUnknown(id=1, function=r"KeyError: '(\w+)'", problem_pattern='KeyError_{0}', is_regexp=True),
+            MarkUnknown(id=2, function=r'(\w+)Error: (\w+)', problem_pattern='{1}{0}', is_regexp=True),
+            MarkUnknown(id=3, function='^CPU', problem_pattern='CPU', is_regexp=True),
+            MarkUnknown(id=4, function='Error: {0}', problem_pattern='Error_{2}', is_regexp=True),
+            MarkUnknown(id=5, function='[', problem_pattern='Wrong', is_regexp=True),
+            MarkUnknown(id=6, function='exhausted', problem_pattern='Exhausted', is_regexp=False),
+            MarkUnknown(id=7, function='exhausted', problem_pattern='Exhausted_{0}', is_regexp=False),
+            MarkUnknown(id=8, function='', problem_pattern='Any', is_regexp=False),
+            MarkUnknown(id=9, function='time', problem_pattern='', is_regexp=False),
+            MarkUnknown(id=10, function='(\w+)', problem_pattern='x' * 100, is_regexp=True)
+        ]
+        for mark_id in range(len(marks) + 1, number + 1):
+            marks.append(MarkUnknown(
+                id=mark_id, function=self.__random_word(max_len=6),
+                problem_pattern='P{}'.format(mark_id), is_regexp=False
+            ))
+        return marks
+
+    def __check_matching(self, marks, descriptions):
+        matcher = UnknownMarksMatcher(marks)
+        for desc in descriptions:
+            expected = {}
+            for mark in marks:
+                try:
+                    problem = match_unknown(desc, mark.function, mark.problem_pattern, mark.is_regexp)
+                except re.error:
+                    continue
+                if problem:
+                    expected[mark.id] = problem
+            self.assertEqual(matcher.match(desc), expected)
+
+            marks_ids = set(mark.id for mark in marks[::2])
+            self.assertEqual(matcher.match(desc, marks_ids=marks_ids), dict(
+                (mark_id, problem) for mark_id, problem in expected.items() if mark_id in marks_ids
+            ))
+
+    def test_aho_corasick(self):
+        for _ in range(100):
+            words = set(self.__random_word(max_len=5) for _ in range(20)) - {''}
+            text = self.__random_word(max_len=50)
+            self.assertEqual(AhoCorasick(words).search(text), set(w for w in words if w in text))
+        self.assertEqual(AhoCorasick(['he', 'she', 'his', 'hers']).search('ushers'), {'he', 'she', 'hers'})
+        self.assertEqual(AhoCorasick([]).search('text'), set())
+
+    def test_matching(self):
+        descriptions = self.descriptions + list(self.__random_word(max_len=30) for _ in range(50))
+
+        # Substrings are searched for separately
+        marks = self.__marks(20)
+        self.assertLess(len(set(mark.function for mark in marks)), UnknownMarksMatcher.aho_corasick_threshold)
+        self.__check_matching(marks, descriptions)
+
+        # Substrings are searched for by the automaton
+        marks = self.__marks(1000)
+        self.assertGreaterEqual(
+            len(set(mark.function for mark in marks)), UnknownMarksMatcher.aho_corasick_threshold
+        )
+        self.__check_matching(marks, descriptions)
+
+    def test_cache(self):
+        component = 'TestUnknownMarksMatcher'
+        mark1 = MarkUnknown.objects.create(
+            component=component, function='exhausted', problem_pattern='Exhausted', is_regexp=False
+        )
+        mark2 = MarkUnknown.objects.create(
+            component=component, function='^CPU', problem_pattern='CPU', is_regexp=True
+        )
+        MarkUnknown.objects.create(
+            component=component + '2', function='time', problem_pattern='Time', is_regexp=False
+        )
+        desc = 'CPU time exhausted'
+
+        matcher = UnknownMarksMatcher.for_component(component)
+        self.assertEqual(matcher.match(desc), {mark1.id: 'Exhausted', mark2.id: 'CPU'})
+        self.assertIs(UnknownMarksMatcher.for_component(component), matcher)
+
+        # Editing of marks of other components does not invalidate the cache
+        other = MarkUnknown.objects.get(component=component + '2')
+        other.function = 'CPU'
+        other.version += 1
+        other.save()
+        self.assertIs(UnknownMarksMatcher.for_component(component), matcher)
+
+        # Edit the mark like serializers do
+        mark1.function = 'Memory'
+        mark1.version += 1
+        mark1.save()
+        matcher = UnknownMarksMatcher.for_component(component)
+        self.assertEqual(matcher.match(desc), {mark2.id: 'CPU'})
+        self.assertIs(UnknownMarksMatcher.for_component(component), matcher)
+
+        # Create a new mark
+        mark3 = MarkUnknown.objects.create(
+            component=component, function='(\\w+) exhausted', problem_pattern='{0}', is_regexp=True
+        )
+        matcher = UnknownMarksMatcher.for_component(component)
+        self.assertEqual(matcher.match(desc), {mark2.id: 'CPU', mark3.id: 'time'})
+
+        # Delete marks
+        mark2.delete()
+        matcher = UnknownMarksMatcher.for_component(component)
+        self.assertEqual(matcher.match(desc), {mark3.id: 'time'})
+        mark3.delete()
+        self.assertEqual(UnknownMarksMatcher.for_component(component).match(desc), {})
@@ -17,11 +17,14 @@
 
 import os
 import json
+import shutil
+import tarfile
 import time
 import zipfile
 from collections import OrderedDict
 
 from django.core.files import File
+from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.db import transaction
 from django.db.models import Q
 from django.utils.timezone import now
@@ -29,7 +32,7 @@ from django.utils.timezone import now
 from rest_framework import exceptions, fields, serializers
 from rest_framework.settings import api_settings
 
-from bridge.vars import ERROR_TRACE_FILE, REPORT_ARCHIVE, DECISION_STATUS, SUBJOB_NAME, NAME_ATTR, MPTT_FIELDS
+from bridge.vars import ERROR_TRACE_FILE, REPORT_ARCHIVE, DECISION_STATUS, SUBJOB_NAME, NAME_ATTR
 from bridge.utils import logger, extract_archive
 
 from reports.models import (
@@ -41,7 +44,10 @@ from caches.models import ReportSafeCache, ReportUnsafeCache, ReportUnknownCache
 
 from reports.serializers import ReportAttrSerializer, ComputerSerializer
 from reports.tasks import fill_coverage_statistics
-from marks.tasks import connect_safe_report, connect_unsafe_report, connect_unknown_report
+from marks.tasks import (
+    connect_safe_report, connect_unsafe_reports, connect_unknown_reports,
+    UNSAFE_REPORTS_BATCH_SIZE, UNKNOWN_REPORTS_BATCH_SIZE
+)
 from service.utils import FinishDecision
 
 from reports.test import ReportsLogging
@@ -425,10 +431,18 @@ class ReportUnsafeSerializer(UploadLeafBaseSerializer):
 
 
 class UploadReports:
+    # Name of the reports file inside reports bundles
+    bundle_reports_file = 'reports.json'
+
     def __init__(self, decision):
         self.decision = decision
         self.archives = {}
+        # Temporary files with archives extracted from reports bundles
+        self._bundle_archives = []
         self._logger = ReportsLogging(self.decision.id)
+        self._new_unsafes = []
+        self._new_unknowns = []
+        self._decision_cache = {}
 
     def validate_archives(self, archives_list, archives):
         for arch_name in archives_list:
@@ -444,16 +458,67 @@ class UploadReports:
             arch.seek(0)
             self.archives[arch_name] = arch
 
+    def read_bundle(self, bundle):
+        """
+        Read reports and their archives from the compressed TAR stream. Reports file should be the first member of
+        the stream while other members are archives named as they are referred by reports.
+        :param bundle: uploaded file with gzip compressed TAR stream
+        :return: list of reports
+        """
+        reports = None
+        archives = {}
+        try:
+            with tarfile.open(fileobj=bundle, mode='r|*') as tar:
+                for member in tar:
+                    if not member.isfile():
+                        continue
+                    member_fp = tar.extractfile(member)
+                    if member.name == self.bundle_reports_file:
+                        reports = json.loads(member_fp.read().decode('utf8'))
+                        continue
+                    arch = TemporaryUploadedFile(member.name, 'application/zip', member.size, None)
+                    self._bundle_archives.append(arch)
+                    shutil.copyfileobj(member_fp, arch, 1024 * 1024)
+                    arch.seek(0)
+                    archives[member.name] = arch
+        except (tarfile.TarError, EOFError, OSError, ValueError) as e:
+            logger.exception(e)
+            raise exceptions.ValidationError(detail={'bundle': 'The reports bundle is corrupted'})
+        if reports is None:
+            raise exceptions.ValidationError(detail={'bundle': 'The reports bundle does not contain reports'})
+        self.validate_archives(list(archives), archives)
+        return reports
+
+    def close_bundle(self):
+        # Closing of temporary uploaded files removes them
+        for arch in self._bundle_archives:
+            arch.close()
+        self._bundle_archives = []
+
     def upload_all(self, reports):
         # Check that all archives are valid ZIP files
-        for report in reports:
-            try:
-                self.__upload(report)
-            except Exception as e:
-                if str(e).__contains__('report_decision_id_identifier'):
-                    logger.error('UniqueError')
-                    logger.exception(e)
-                self.__process_exception(e)
+        try:
+            for report in reports:
+                try:
+                    self.__upload(report)
+                except Exception as e:
+                    if str(e).__contains__('report_decision_id_identifier'):
+                        logger.error('UniqueError')
+                        logger.exception(e)
+                    self.__process_exception(e)
+        finally:
+            self.__save_decision_cache()
+            self.__connect_new_leaves()
+
+    def __connect_new_leaves(self):
+        # Connect new unsafes and unknowns with marks in batches, so marks are selected and compared with them by
+        # fewer tasks
+        for i in range(0, len(self._new_unsafes), UNSAFE_REPORTS_BATCH_SIZE):
+            connect_unsafe_reports.delay(self._new_unsafes[i:i + UNSAFE_REPORTS_BATCH_SIZE])
+        self._new_unsafes = []
+        for i in range(0, len(self._new_unknowns), UNKNOWN_REPORTS_BATCH_SIZE):
+            connect_unknown_reports.delay(self._new_unknowns[i:i + UNKNOWN_REPORTS_BATCH_SIZE])
+        self._new_unknowns = []
 
     def __process_exception(self, exc):
         if isinstance(exc, exceptions.ValidationError):
@@ -542,10 +607,11 @@ class UploadReports:
             raise exceptions.ValidationError(detail={'identifier': "The report wasn't found"})
 
     def __ancestors_for_cache(self, report):
-        ancestors_qs = report.get_ancestors()
-        if self.decision.is_lightweight:
-            # Update cache just for Core and verification reports as other reports will be deleted
-            ancestors_qs = ancestors_qs.filter(Q(parent=None) | Q(reportcomponent__verification=True))
+        if not self.decision.is_lightweight:
+            # Tree path already keeps ancestors from Core to the parent
+            return list(report.tree_path)
+        # Update cache just for Core and verification reports as other reports will be deleted
+        ancestors_qs = report.get_ancestors().filter(Q(parent=None) | Q(reportcomponent__verification=True))
         return list(parent.pk for parent in ancestors_qs)
 
     def __create_report_component(self, data):
@@ -701,7 +767,7 @@ class UploadReports:
         if not data.get('identifier'):
             raise exceptions.ValidationError(detail={'identifier': "Required"})
         try:
-            report = ReportComponent.objects.only('id', 'component', *MPTT_FIELDS)\
+            report = ReportComponent.objects.only('id', 'component')\
                 .get(decision=self.decision, identifier=data['identifier'], verification=True)
         except ReportComponent.DoesNotExist:
             raise exceptions.ValidationError(detail={'identifier': "The report wasn't found"})
@@ -756,8 +822,8 @@ class UploadReports:
             ReportComponentLeaf(report_id=parent_id, content_object=report) for parent_id in ancestors_ids
         ))
 
-        # Connect report with marks
-        connect_unknown_report.delay(report.id)
+        # Connect report with marks after all reports are uploaded
+        self._new_unknowns.append(report.id)
 
         self._logger.log("UN3", report.pk)
 
@@ -799,8 +865,8 @@ class UploadReports:
             for parent_id in self.__ancestors_for_cache(report)
         ))
 
-        # Connect new unsafe with marks
-        connect_unsafe_report.delay(report.id)
+        # Connect new unsafe with marks after all reports are uploaded
+        self._new_unsafes.append(report.id)
 
         self._logger.log("UF2", report.pk)
 
@@ -823,23 +889,27 @@ class UploadReports:
         # Fill coverage statistics in background
         fill_coverage_statistics.delay(carch.id)
 
-    @transaction.atomic
     def __update_decision_cache(self, component, **kwargs):
-        try:
-            cache_obj = DecisionCache.objects.select_for_update().get(decision=self.decision, component=component)
-        except DecisionCache.DoesNotExist:
-            cache_obj = DecisionCache(decision=self.decision, component=component)
+        # Changes are accumulated and saved once per request to not lock the same cache row for each report
+        cache_data = self._decision_cache.setdefault(component, {
+            'cpu_time': 0, 'wall_time': 0, 'memory': 0, 'total': 0, 'finished': 0
+        })
         if kwargs.get('cpu_time'):
-            cache_obj.cpu_time += kwargs['cpu_time']
+            cache_data['cpu_time'] += kwargs['cpu_time']
         if kwargs.get('wall_time'):
-            cache_obj.wall_time += kwargs['wall_time']
+            cache_data['wall_time'] += kwargs['wall_time']
         if kwargs.get('memory'):
-            cache_obj.memory = max(cache_obj.memory, kwargs['memory'])
+            cache_data['memory'] = max(cache_data['memory'], kwargs['memory'])
         if kwargs.get('started'):
-            cache_obj.total += 1
+            cache_data['total'] += 1
         if kwargs.get('finished'):
-            cache_obj.finished += 1
-        cache_obj.save()
+            cache_data['finished'] += 1
+
+    def __save_decision_cache(self):
+        # Sort components to always update rows in the same order
+        for component in sorted(self._decision_cache):
+            DecisionCache.objects.add(self.decision.id, component, **self._decision_cache[component])
+        self._decision_cache = {}
 
     def __upload_attrs_files(self, archive):
         if not archive:
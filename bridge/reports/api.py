@@ -113,6 +113,13 @@ class UploadReportView(LoggedCallMixin, APIView):
             raise exceptions.APIException('Reports can be uploaded only for processing decisions')
 
         reports_uploader = UploadReports(decision)
+        if 'bundle' in request.FILES:
+            # Reports and their archives are uploaded together within the single compressed stream
+            try:
+                reports_uploader.upload_all(reports_uploader.read_bundle(request.FILES['bundle']))
+            finally:
+                reports_uploader.close_bundle()
+            return Response({})
         if 'archives' in request.POST:
             reports_uploader.validate_archives(json.loads(request.POST['archives']), request.FILES)
         reports_uploader.upload_all(json.loads(request.POST['reports']))
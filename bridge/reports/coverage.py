@@ -30,6 +30,7 @@ from bridge.utils import ArchiveFileContent, BridgeException, construct_url
 from reports.models import CoverageArchive, CoverageStatistics, CoverageDataStatistics
 
 ROOT_DIRS_ORDER = ['source files', 'specifications', 'generated models']
+STATISTICS_BATCH_SIZE = 1000
 
 
 def coverage_data_statistic(coverage):
@@ -220,6 +221,73 @@ class VerificationCoverageStatistics(CoverageStatisticsBase):
         return construct_url('reports:api-coverage-table', self._report.id)
 
 
+def get_statistics_objects(coverage_id, statistics, file_sep='/'):
+    """
+    Create statistics objects for files and all directories containing them.
+    :param coverage_id: CoverageArchive object id
+    :param statistics: dictionary with statistics of files from the coverage archive
+    :param file_sep: separator of paths
+    :return: dictionary {path tuple: CoverageStatistics object} and whether some files have just total numbers
+    """
+    has_extra = False
+    cnt = 0
+    new_objects = {}
+    for fname in statistics:
+        cov_data = statistics[fname]
+        if len(cov_data) == 4:
+            cov_lines, tot_lines, cov_funcs, tot_func = cov_data
+        else:
+            cov_lines = cov_funcs = None
+            tot_lines, tot_func = cov_data
+
+        path_l = tuple(fname.split(file_sep))
+        for i in range(len(path_l)):
+            curr_path = path_l[:(i + 1)]
+            if curr_path not in new_objects:
+                cnt += 1
+                parent_id = new_objects[path_l[:i]].identifier if i > 0 else None
+                new_objects[curr_path] = CoverageStatistics(
+                    coverage_id=coverage_id, identifier=cnt, parent=parent_id,
+                    is_leaf=bool(i + 1 == len(path_l)),
+                    name=path_l[i],
+                    path='/'.join(curr_path),
+                    depth=len(curr_path)
+                )
+            if cov_lines is not None and cov_funcs is not None:
+                new_objects[curr_path].lines_covered += cov_lines
+                new_objects[curr_path].lines_total += tot_lines
+                new_objects[curr_path].funcs_covered += cov_funcs
+                new_objects[curr_path].funcs_total += tot_func
+                new_objects[curr_path].lines_covered_extra += cov_lines
+                new_objects[curr_path].funcs_covered_extra += cov_funcs
+            else:
+                has_extra = True
+            new_objects[curr_path].lines_total_extra += tot_lines
+            new_objects[curr_path].funcs_total_extra += tot_func
+    return new_objects, has_extra
+
+
+def iterate_statistics_tree(new_objects):
+    """
+    Iterate over statistics objects in the order they are shown: root directories go in the predefined order,
+    each directory is followed by its subtree, directories go before files, siblings are sorted by names.
+    :param new_objects: dictionary returned by get_statistics_objects()
+    :return: generator of CoverageStatistics objects
+    """
+    children = {}
+    for obj in sorted(new_objects.values(), key=lambda x: (x.is_leaf, x.name)):
+        if obj.parent is not None:
+            children.setdefault(obj.parent, []).append(obj)
+
+    roots = list(new_objects[(root_name,)] for root_name in ROOT_DIRS_ORDER if (root_name,) in new_objects)
+    stack = list(reversed(roots))
+    while stack:
+        obj = stack.pop()
+        yield obj
+        if not obj.is_leaf:
+            stack.extend(reversed(children.get(obj.identifier, [])))
+
+
 class FillCoverageStatistics:
     file_sep = '/'
 
@@ -244,63 +312,16 @@ class FillCoverageStatistics:
 
     def __save_statistics(self):
         CoverageStatistics.objects.filter(coverage=self.coverage_obj).delete()
-
-        cnt = 0
-        new_objects = {}
-        for fname in self._statistics:
-            cov_data = self._statistics[fname]
-            if len(cov_data) == 4:
-                cov_lines, tot_lines, cov_funcs, tot_func = cov_data
-            else:
-                cov_lines = cov_funcs = None
-                tot_lines, tot_func = cov_data
-
-            path_l = tuple(fname.split(self.file_sep))
-            for i in range(len(path_l)):
-                curr_path = path_l[:(i + 1)]
-                if curr_path not in new_objects:
-                    cnt += 1
-                    parent_id = new_objects[path_l[:i]].identifier if i > 0 else None
-                    new_objects[curr_path] = CoverageStatistics(
-                        coverage_id=self.coverage_obj.id, identifier=cnt, parent=parent_id,
-                        is_leaf=bool(i + 1 == len(path_l)),
-                        name=path_l[i],
-                        path='/'.join(curr_path),
-                        depth=len(curr_path)
-                    )
-                if cov_lines is not None and cov_funcs is not None:
-                    new_objects[curr_path].lines_covered += cov_lines
-                    new_objects[curr_path].lines_total += tot_lines
-                    new_objects[curr_path].funcs_covered += cov_funcs
-                    new_objects[curr_path].funcs_total += tot_func
-                    new_objects[curr_path].lines_covered_extra += cov_lines
-                    new_objects[curr_path].funcs_covered_extra += cov_funcs
-                else:
-                    self.has_extra = True
-                new_objects[curr_path].lines_total_extra += tot_lines
-                new_objects[curr_path].funcs_total_extra += tot_func
-
-        ordered_objects_list = list(sorted(new_objects.values(), key=lambda x: (x.is_leaf, x.name)))
-
-        def __get_all_children(covstat_obj):
-            children = []
-            if covstat_obj.is_leaf:
-                return children
-            for obj in ordered_objects_list:
-                if obj.parent == covstat_obj.identifier:
-                    children.append(obj)
-                    children.extend(__get_all_children(obj))
-            return children
-
-        ordered_objects = []
-        for root_name in ROOT_DIRS_ORDER:
-            root_path = (root_name,)
-            if root_path not in new_objects:
-                continue
-            ordered_objects.append(new_objects[root_path])
-            ordered_objects.extend(__get_all_children(new_objects[root_path]))
-
-        CoverageStatistics.objects.bulk_create(ordered_objects)
+        new_objects, self.has_extra = get_statistics_objects(self.coverage_obj.id, self._statistics, self.file_sep)
+
+        batch = []
+        for covstat_obj in iterate_statistics_tree(new_objects):
+            batch.append(covstat_obj)
+            if len(batch) == STATISTICS_BATCH_SIZE:
+                CoverageStatistics.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            CoverageStatistics.objects.bulk_create(batch)
 
     def __save_data_statistics(self):
         CoverageDataStatistics.objects.filter(coverage=self.coverage_obj).delete()
@@ -0,0 +1,77 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from bridge.vars import ETV_FORMAT
+
+from reports.coverage import ROOT_DIRS_ORDER, get_statistics_objects, iterate_statistics_tree
+
+# Top level directories of Linux with approximate shares of source files
+LINUX_DIRS = [
+    ('drivers', 60), ('arch', 15), ('fs', 6), ('net', 6), ('sound', 5), ('kernel', 2), ('mm', 1), ('lib', 1),
+    ('crypto', 1), ('security', 1), ('block', 1), ('include', 1)
+]
+
+
+class Command(BaseCommand):
+    help = 'Generates Linux-sized code coverage statistics and measures how long their tree is built.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--files', type=int, default=30000, help='Number of source files.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator.')
+        parser.add_argument('--output', help='Path to the coverage file to save generated statistics.')
+
+    def handle(self, *args, **options):
+        statistics = self.__generate(options['files'], random.Random(options['seed']))
+        if options['output']:
+            with open(options['output'], mode='w', encoding='utf-8') as fp:
+                json.dump({
+                    'format': ETV_FORMAT, 'coverage statistics': statistics, 'data statistics': {}
+                }, fp, ensure_ascii=False)
+
+        start = time.time()
+        new_objects, _ = get_statistics_objects(0, statistics)
+        built = time.time()
+        ordered_number = sum(1 for _ in iterate_statistics_tree(new_objects))
+        finished = time.time()
+        self.stdout.write('{} files and directories: built in {:.3f}s, ordered in {:.3f}s'.format(
+            ordered_number, built - start, finished - built
+        ))
+
+    def __generate(self, files_number, rnd):
+        dirs, weights = zip(*LINUX_DIRS)
+        statistics = {}
+        for i in range(files_number):
+            path = [ROOT_DIRS_ORDER[0], rnd.choices(dirs, weights)[0]]
+            path.extend('dir{}'.format(rnd.randint(0, 30 // (depth + 1))) for depth in range(rnd.randint(1, 5)))
+            path.append('file{}.c'.format(i))
+
+            lines_total = rnd.randint(10, 5000)
+            funcs_total = rnd.randint(1, 200)
+            statistics['/'.join(path)] = [
+                rnd.randint(0, lines_total), lines_total, rnd.randint(0, funcs_total), funcs_total
+            ]
+
+        # Models and specifications have just total numbers of lines and functions sometimes
+        for i in range(files_number // 100):
+            statistics['{}/model{}.c'.format(ROOT_DIRS_ORDER[2], i)] = [rnd.randint(10, 500), rnd.randint(1, 20)]
+        return statistics
@@ -0,0 +1,193 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import random
+import time
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from bridge.vars import DECISION_STATUS, SAFE_VERDICTS, UNSAFE_VERDICTS, VIEW_TYPES
+
+from users.models import User
+from users.utils import ViewData, DEFAULT_VIEW
+from jobs.models import Decision, Job
+from reports.models import (
+    Computer, DecisionCache, Report, ReportComponent, ReportComponentLeaf, ReportSafe, ReportUnsafe, ReportUnknown
+)
+from caches.models import ReportSafeCache, ReportUnsafeCache, ReportUnknownCache
+from reports.utils import SafesTable, UnsafesTable, UnknownsTable
+
+BATCH_SIZE = 10000
+REQUIREMENTS = ['linux:mutex', 'linux:spinlock', 'linux:alloc:irq', 'linux:usb:gadget', 'linux:net:sock']
+PROBLEMS = ['Timeout', 'Memory exhausted', 'Parsing failed', 'Assertion failed']
+
+
+class Command(BaseCommand):
+    help = 'Generates a large synthetic decision and measures how long tables of its leaves are rendered.'
+    requires_migrations_checks = True
+
+    def add_arguments(self, parser):
+        parser.add_argument('job', help='Job identifier, its last decision provides scheduler and configuration.')
+        parser.add_argument('--username', dest='username', default='admin', help='User that views tables.')
+        parser.add_argument('--safes', type=int, default=100000, help='Number of safes.')
+        parser.add_argument('--unsafes', type=int, default=50000, help='Number of unsafes.')
+        parser.add_argument('--unknowns', type=int, default=20000, help='Number of unknowns.')
+        parser.add_argument('--leaves-per-task', type=int, default=5, help='Number of leaves of verification reports.')
+        parser.add_argument('--decision', help='Identifier of the decision generated before to measure it again.')
+        parser.add_argument('--keep', action='store_true', help='Do not remove the generated decision.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+            job = Job.objects.get(identifier=options['job'])
+        except (User.DoesNotExist, Job.DoesNotExist) as e:
+            raise CommandError(str(e))
+
+        if options['decision']:
+            decision = Decision.objects.get(identifier=options['decision'])
+        else:
+            start = time.time()
+            decision = self.__generate(job, user, options)
+            self.stdout.write('Decision {} was generated in {:.1f}s'.format(decision.identifier, time.time() - start))
+
+        try:
+            core = ReportComponent.objects.get(decision=decision, parent=None)
+            self.__measure('Safes', SafesTable, user, core, VIEW_TYPES[5])
+            self.__measure('Unsafes', UnsafesTable, user, core, VIEW_TYPES[4])
+            self.__measure('Unknowns', UnknownsTable, user, core, VIEW_TYPES[6])
+        finally:
+            if not options['keep'] and not options['decision']:
+                decision.delete()
+
+    def __measure(self, title, table_class, user, core, view_type):
+        views = {
+            'id': {},
+            'attr': {'order': ['down', 'attr', 'Requirement']},
+            'cpu': {'order': ['up', 'parent_cpu']}
+        }
+        for view_name, view in views.items():
+            view_data = ViewData(user, view_type, {
+                'view': json.dumps(dict(DEFAULT_VIEW[view_type[0]], **view)), 'view_type': view_type[0]
+            })
+            first = self.__render(table_class, user, core, view_data, {})
+            pages = [('first', first)]
+            if first.page.has_next():
+                pages.append(('second', self.__render(
+                    table_class, user, core, view_data, {'page': first.page.next_page_number()}
+                )))
+                pages.append(('last', self.__render(table_class, user, core, view_data, {'page': 'last'})))
+                pages.append(('middle by number', self.__render(
+                    table_class, user, core, view_data, {'page': str(max(first.paginator.num_pages // 2, 1))}
+                )))
+            for page_name, table in pages:
+                self.stdout.write('{} ordered by {}, {} page: {:.3f}s'.format(
+                    title, view_name, page_name, table.elapsed_time
+                ))
+
+    def __render(self, table_class, user, core, view_data, params):
+        start = time.time()
+        table = table_class(user, core, view_data, params)
+        table.elapsed_time = time.time() - start
+        return table
+
+    @transaction.atomic
+    def __generate(self, job, user, options):
+        base_decision = Decision.objects.filter(job=job).order_by('-id').first()
+        if not base_decision:
+            raise CommandError('The job does not have decisions')
+        decision = Decision.objects.create(
+            job=job, title='Benchmark', operator=user, status=DECISION_STATUS[3][0],
+            scheduler=base_decision.scheduler, priority=base_decision.priority,
+            configuration=base_decision.configuration
+        )
+        computer = Computer.objects.get_or_create(identifier='benchmark', defaults={
+            'display': 'benchmark', 'data': []
+        })[0]
+        core = ReportComponent.objects.create(
+            decision=decision, identifier='/', component='Core', computer=computer, cpu_time=0, wall_time=0, memory=0
+        )
+
+        leaves_number = options['safes'] + options['unsafes'] + options['unknowns']
+        tasks_number = max(leaves_number // max(options['leaves_per_task'], 1), 1)
+        # Multi-table inherited models can not be created by bulk_create()
+        for i in range(tasks_number):
+            ReportComponent.objects.create(
+                decision=decision, parent=core, identifier='/vrp/{}'.format(i), component='RP', verification=True,
+                computer=computer, cpu_time=random.randint(1000, 900000), wall_time=random.randint(1000, 900000),
+                memory=random.randint(10 ** 6, 10 ** 9)
+            )
+        tasks_qs = ReportComponent.objects.filter(decision=decision, verification=True)
+        tasks = list(tasks_qs.values_list('id', 'cpu_time', 'wall_time', 'memory'))
+        DecisionCache.objects.bulk_create([
+            DecisionCache(decision=decision, component='Core', total=1, finished=1),
+            DecisionCache(decision=decision, component='RP', total=len(tasks), finished=len(tasks))
+        ])
+
+        for leaf_class, number in ((ReportSafe, options['safes']), (ReportUnsafe, options['unsafes']),
+                                   (ReportUnknown, options['unknowns'])):
+            for offset in range(0, number, BATCH_SIZE):
+                self.__generate_leaves(decision, core, tasks, leaf_class, offset, min(BATCH_SIZE, number - offset))
+        return decision
+
+    def __generate_leaves(self, decision, core, tasks, leaf_class, offset, number):
+        prefix = '/{}/'.format(leaf_class.__name__)
+        parents = [tasks[(offset + i) % len(tasks)] for i in range(number)]
+        Report.objects.bulk_create(list(Report(
+            decision=decision, parent_id=parent[0], tree_path=[core.id, parent[0]],
+            identifier='{}{}'.format(prefix, offset + i), cpu_time=parent[1], wall_time=parent[2], memory=parent[3]
+        ) for i, parent in enumerate(parents)))
+
+        leaf_table = getattr(leaf_class, '_meta').db_table
+        columns = {ReportSafe: '', ReportUnsafe: ", error_trace", ReportUnknown: ", component, problem_description"}
+        values = {ReportSafe: '', ReportUnsafe: ", ''", ReportUnknown: ", 'RP', ''"}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {0} (report_ptr_id{1}) SELECT id{2} FROM report '
+                'WHERE decision_id = %s AND identifier LIKE %s '
+                'AND NOT EXISTS (SELECT 1 FROM {0} WHERE report_ptr_id = report.id)'.format(
+                    leaf_table, columns[leaf_class], values[leaf_class]
+                ), [decision.id, prefix + '%']
+            )
+
+        leaves = list(leaf_class.objects.filter(decision=decision, identifier__in=list(
+            '{}{}'.format(prefix, offset + i) for i in range(number)
+        )).values_list('id', 'parent_id'))
+        content_type = ContentType.objects.get_for_model(leaf_class)
+        ReportComponentLeaf.objects.bulk_create(list(
+            ReportComponentLeaf(report_id=report_id, content_type=content_type, object_id=leaf_id)
+            for leaf_id, parent_id in leaves for report_id in (core.id, parent_id)
+        ))
+
+        caches = []
+        for leaf_id, _ in leaves:
+            attrs = {'Requirement': random.choice(REQUIREMENTS), 'Program fragment': 'drivers/{}.ko'.format(leaf_id)}
+            if leaf_class is ReportSafe:
+                caches.append(ReportSafeCache(
+                    decision=decision, report_id=leaf_id, attrs=attrs, verdict=random.choice(SAFE_VERDICTS)[0]
+                ))
+            elif leaf_class is ReportUnsafe:
+                caches.append(ReportUnsafeCache(
+                    decision=decision, report_id=leaf_id, attrs=attrs, verdict=random.choice(UNSAFE_VERDICTS)[0]
+                ))
+            else:
+                caches.append(ReportUnknownCache(
+                    decision=decision, report_id=leaf_id, attrs=attrs, problems={random.choice(PROBLEMS): 1}
+                ))
+        getattr(caches[0], '_meta').model.objects.bulk_create(caches)
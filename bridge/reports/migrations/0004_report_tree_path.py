@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+FILL_TREE_PATHS = """
+WITH RECURSIVE tree(id, path) AS (
+    SELECT R0.id, ARRAY[]::integer[] FROM report AS R0 WHERE R0.parent_id IS NULL
+    UNION ALL
+    SELECT R1.id, tree.path || tree.id FROM report AS R1 INNER JOIN tree ON R1.parent_id = tree.id
+)
+UPDATE report SET tree_path = tree.path FROM tree WHERE report.id = tree.id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [('reports', '0003_alter_computer_data_alter_coveragearchive_total_and_more')]
+
+    operations = [
+        migrations.AddField(
+            model_name='report', name='tree_path',
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(), default=list, size=None
+            ),
+        ),
+        migrations.RunSQL(FILL_TREE_PATHS, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='report',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tree_path'], name='report_tree_path_gin_idx'),
+        ),
+        migrations.AlterField(
+            model_name='report', name='parent',
+            field=models.ForeignKey(
+                null=True, on_delete=models.deletion.CASCADE, related_name='children', to='reports.report'
+            ),
+        ),
+        migrations.RemoveField(model_name='report', name='level'),
+        migrations.RemoveField(model_name='report', name='lft'),
+        migrations.RemoveField(model_name='report', name='rght'),
+        migrations.RemoveField(model_name='report', name='tree_id'),
+    ]
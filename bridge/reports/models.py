@@ -21,14 +21,17 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.files import File
-from django.db import models
+from django.db import models, connection
+from django.db.models import F, Func, Q, Max, Subquery, Sum
+from django.db.models.functions import Greatest
 from django.db.models.signals import post_delete
 from django.utils.timezone import now
-from mptt.models import MPTTModel, TreeForeignKey
 
 from bridge.vars import COMPARE_VERDICT, REPORT_ARCHIVE
 from bridge.utils import WithFilesMixin, remove_instance_files
+from bridge.rawsql import REBUILD_REPORT_TREE_PATHS, MOVE_REPORT_SUBTREE, RESERVE_REPORT_IDS
 
 from users.models import User
 from jobs.models import Job
@@ -81,21 +84,146 @@ class AttrBase(models.Model):
         abstract = True
 
 
-class Report(MPTTModel):
+class ReportQuerySet(models.QuerySet):
+    def order_by_tree(self, descending=False):
+        """
+        Order reports depth-first, so each report goes before its descendants.
+
+        :param descending: order reports in the reverse order, so leaves go first.
+        :return: queryset.
+        """
+        tree_order = Func(F('tree_path'), F('id'), function='array_append',
+                          output_field=ArrayField(models.IntegerField()))
+        return self.order_by(tree_order.desc() if descending else tree_order.asc())
+
+
+class ReportManager(models.Manager.from_queryset(ReportQuerySet)):
+    def rebuild_tree(self, decision_id):
+        """
+        Recalculate tree paths of decision reports after their parents were changed by queryset updates.
+
+        :param decision_id: decision identifier.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(REBUILD_REPORT_TREE_PATHS, [decision_id])
+
+    def reserve_ids(self, number):
+        """
+        Take identifiers for new reports from the sequence in advance, so tree paths of reports can be calculated
+        before reports are saved.
+
+        :param number: number of identifiers.
+        :return: list of identifiers.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(RESERVE_REPORT_IDS, [number])
+            return [row[0] for row in cursor.fetchall()]
+
+    def bulk_create_inherited(self, objs, batch_size=1000):
+        """
+        Create reports of the model inherited from Report. Django bulk_create() does not support multi-table
+        inheritance, so rows of the report table and the child table are inserted separately, two queries per batch.
+        Reports should already have identifiers (see reserve_ids()) and tree paths.
+
+        :param objs: list of reports of the same model.
+        :param batch_size: number of reports inserted by a query.
+        :return: list of created reports.
+        """
+        if not objs:
+            return objs
+        child_model = type(objs[0])
+        child_meta = getattr(child_model, '_meta')
+        report_fields = getattr(self.model, '_meta').concrete_fields
+        self.bulk_create([
+            self.model(**{field.attname: getattr(obj, field.attname) for field in report_fields}) for obj in objs
+        ], batch_size=batch_size)
+
+        qn = connection.ops.quote_name
+        child_fields = child_meta.local_concrete_fields
+        insert_sql = 'INSERT INTO {} ({}) VALUES '.format(
+            qn(child_meta.db_table), ', '.join(qn(field.column) for field in child_fields)
+        )
+        row_placeholder = '({})'.format(', '.join(['%s'] * len(child_fields)))
+        with connection.cursor() as cursor:
+            for offset in range(0, len(objs), batch_size):
+                batch = objs[offset:offset + batch_size]
+                params = []
+                for obj in batch:
+                    setattr(obj, child_meta.pk.attname, obj.id)
+                    params.extend(field.get_db_prep_save(field.pre_save(obj, True), connection)
+                                  for field in child_fields)
+                cursor.execute(insert_sql + ', '.join([row_placeholder] * len(batch)), params)
+
+        for obj in objs:
+            obj._state.adding = False
+            obj._state.db = self.db
+        return objs
+
+
+class Report(models.Model):
     decision = models.ForeignKey(Decision, models.CASCADE)
-    parent = TreeForeignKey('self', models.CASCADE, null=True, related_name='children')
+    parent = models.ForeignKey('self', models.CASCADE, null=True, related_name='children')
     identifier = models.CharField(max_length=255, db_index=True)
     cpu_time = models.BigIntegerField(null=True)
     wall_time = models.BigIntegerField(null=True)
     memory = models.BigIntegerField(null=True)
 
+    # Identifiers of ancestors from the root to the parent. Unlike nested sets, adding a report does not touch other
+    # reports, so reports of the same decision can be uploaded concurrently.
+    tree_path = ArrayField(models.IntegerField(), default=list)
+
+    objects = ReportManager()
+
     def __str__(self):
         return self.identifier
 
+    @property
+    def level(self):
+        return len(self.tree_path)
+
+    def get_ancestors(self, ascending=False, include_self=False):
+        ancestors_ids = list(self.tree_path)
+        if include_self:
+            ancestors_ids.append(self.id)
+        return Report.objects.filter(id__in=ancestors_ids).order_by_tree(descending=ascending)
+
+    def get_descendants(self, include_self=False):
+        qs_filter = Q(tree_path__contains=[self.id])
+        if include_self:
+            qs_filter |= Q(id=self.id)
+        return Report.objects.filter(qs_filter).order_by_tree()
+
+    def is_leaf_node(self):
+        return not Report.objects.filter(parent_id=self.id).exists()
+
+    def __get_parent_path(self):
+        if self.parent_id is None:
+            return []
+        if Report.parent.is_cached(self):
+            parent_path = self.parent.tree_path
+        else:
+            parent_path = Report.objects.filter(id=self.parent_id).values_list('tree_path', flat=True).get()
+        return parent_path + [self.parent_id]
+
+    def save(self, *args, **kwargs):
+        old_path = None
+        if self.parent_id != (self.tree_path[-1] if self.tree_path else None):
+            # The report is new or it was moved to another parent
+            old_path = self.tree_path
+            self.tree_path = self.__get_parent_path()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'tree_path'}
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if old_path is not None and not adding:
+            with connection.cursor() as cursor:
+                cursor.execute(MOVE_REPORT_SUBTREE, [self.tree_path, len(old_path) + 1, self.id])
+
     class Meta:
         db_table = 'report'
         unique_together = [('decision', 'identifier')]
         index_together = [('decision', 'identifier')]
+        indexes = [GinIndex(fields=['tree_path'], name='report_tree_path_gin_idx')]
 
 
 class AttrFile(WithFilesMixin, models.Model):
@@ -375,6 +503,54 @@ class ComparisonLink(models.Model):
         db_table = 'cache_report_comparison_link'
 
 
+class DecisionCacheQuerySet(models.QuerySet):
+    def aggregated(self):
+        """
+        Get resources and numbers of reports of decision components. Concurrent uploads can create several rows for
+        the same component, so they are merged.
+
+        :return: iterator over dictionaries with decision_id, component, cpu_time, wall_time, memory, total and
+                 finished.
+        """
+        qs = self.values('decision_id', 'component').order_by().annotate(
+            cpu_time_sum=Sum('cpu_time'), wall_time_sum=Sum('wall_time'), memory_max=Max('memory'),
+            total_sum=Sum('total'), finished_sum=Sum('finished')
+        )
+        for cache_data in qs:
+            yield {
+                'decision_id': cache_data['decision_id'], 'component': cache_data['component'],
+                'cpu_time': cache_data['cpu_time_sum'], 'wall_time': cache_data['wall_time_sum'],
+                'memory': cache_data['memory_max'], 'total': cache_data['total_sum'],
+                'finished': cache_data['finished_sum']
+            }
+
+
+class DecisionCacheManager(models.Manager.from_queryset(DecisionCacheQuerySet)):
+    def add(self, decision_id, component, cpu_time=0, wall_time=0, memory=0, total=0, finished=0):
+        """
+        Add resources and numbers of reports to the decision component cache. A single UPDATE statement with
+        increments is executed, so the row is not locked for the duration of the caller transaction.
+
+        :param decision_id: decision identifier.
+        :param component: component name.
+        :param cpu_time: CPU time to add.
+        :param wall_time: wall time to add.
+        :param memory: memory to take into account as maximum one.
+        :param total: number of started reports to add.
+        :param finished: number of finished reports to add.
+        """
+        cache_qs = self.filter(decision_id=decision_id, component=component)
+        updated = self.filter(id=Subquery(cache_qs.values('id')[:1])).update(
+            cpu_time=F('cpu_time') + cpu_time, wall_time=F('wall_time') + wall_time,
+            memory=Greatest(F('memory'), memory), total=F('total') + total, finished=F('finished') + finished
+        )
+        if not updated:
+            self.create(
+                decision_id=decision_id, component=component, cpu_time=cpu_time, wall_time=wall_time,
+                memory=memory, total=total, finished=finished
+            )
+
+
 class DecisionCache(models.Model):
     decision = models.ForeignKey(Decision, models.CASCADE)
     component = models.CharField(max_length=MAX_COMPONENT_LEN)
@@ -385,6 +561,8 @@ class DecisionCache(models.Model):
     total = models.IntegerField(default=0)
     finished = models.IntegerField(default=0)
 
+    objects = DecisionCacheManager()
+
     class Meta:
         db_table = 'cache_decision_data'
         index_together = ['component', 'decision']
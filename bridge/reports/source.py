@@ -29,7 +29,7 @@ from django.utils.translation import gettext_lazy as _, get_language
 from django.utils.functional import cached_property
 
 from bridge.vars import ETV_FORMAT
-from bridge.utils import ArchiveFileContent, BridgeException, logger
+from bridge.utils import IndexedArchive, BridgeException, logger
 
 from reports.models import ReportComponent, CoverageArchive, CoverageStatistics, SourceCodeCache
 
@@ -307,12 +307,13 @@ class ParseSource:
         if obj is None:
             return None
         try:
-            res = ArchiveFileContent(obj, field_name, name, not_exists_ok=True)
+            # Archives of sources can contain tens of thousands of files, so use indexes of their members
+            content = IndexedArchive.get(getattr(obj, field_name).path).read(name)
         except Exception as e:
             raise BridgeException(_("Error while extracting source file: %(error)s") % {'error': str(e)})
-        if res.content is None:
+        if content is None:
             return None
-        return res.content.decode('utf8')
+        return content.decode('utf8')
 
     def __get_source_code(self):
         for report in self._ancestors:
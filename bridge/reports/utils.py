@@ -38,7 +38,7 @@ from reports.models import (
 )
 from caches.models import ReportSafeCache, ReportUnsafeCache, ReportUnknownCache
 
-from users.utils import HumanizedValue, paginate_queryset
+from users.utils import HumanizedValue, paginate_queryset, keyset_paginate_queryset
 from reports.verdicts import safe_color, unsafe_color, bug_status_color
 
 
@@ -150,8 +150,8 @@ def collapse_reports(decision):
     # Remove all non-verification reports except Core
     reports_qs.delete()
 
-    # Rebuild mptt tree of the current decision
-    Report.objects.partial_rebuild(core.tree_id)
+    # Update tree paths of reports that were moved to Core
+    Report.objects.rebuild_tree(decision.id)
 
     # Update decision weight
     decision.weight = DECISION_WEIGHT[1][0]
@@ -309,13 +309,10 @@ class SafesTable:
 
         # Filter by attribute(s)
         if 'attr_name' in self._params and 'attr_value' in self._params:
-            attr_name = unquote(self._params['attr_name'])
-            attr_value = unquote(self._params['attr_value'])
-            annotations['attr_value'] = RawSQL(
-                "\"{}\".\"attrs\"->>%s".format(self._cache_db_table),
-                (attr_name,)
-            )
-            qs_filters['attr_value'] = attr_value
+            # Containment is supported by the GIN index unlike comparison of extracted values
+            qs_filters['cache__attrs__contains'] = {
+                unquote(self._params['attr_name']): unquote(self._params['attr_value'])
+            }
         elif 'attr' in self.view:
             annotations['attr_value'] = RawSQL(
                 "\"{}\".\"attrs\"->>%s".format(self._cache_db_table),
@@ -338,10 +335,9 @@ class SafesTable:
         queryset = ReportSafe.objects
         if annotations:
             queryset = queryset.annotate(**annotations)
-        queryset = queryset.filter(**qs_filters).exclude(cache=None)\
-            .order_by(ordering).select_related('cache', 'decision')
+        queryset = queryset.filter(**qs_filters).exclude(cache=None).select_related('cache', 'decision')
         num_per_page = self.view['elements'][0] if self.view['elements'] else None
-        return paginate_queryset(queryset, self._params.get('page', 1), num_per_page)
+        return keyset_paginate_queryset(queryset, ordering, self._params.get('page', 1), num_per_page)
 
     def __get_title(self):
         title = _('Safes')
@@ -579,11 +575,10 @@ class UnsafesTable:
 
         # Filter by attribute(s)
         if 'attr_name' in self._params and 'attr_value' in self._params:
-            annotations['attr_value'] = RawSQL(
-                "\"{}\".\"attrs\"->>%s".format(self._cache_db_table),
-                (unquote(self._params['attr_name']),)
-            )
-            qs_filters['attr_value'] = unquote(self._params['attr_value'])
+            # Containment is supported by the GIN index unlike comparison of extracted values
+            qs_filters['cache__attrs__contains'] = {
+                unquote(self._params['attr_name']): unquote(self._params['attr_value'])
+            }
         elif 'attr' in self.view:
             annotations['attr_value'] = RawSQL(
                 "\"{}\".\"attrs\"->>%s".format(self._cache_db_table),
@@ -606,10 +601,9 @@ class UnsafesTable:
         queryset = ReportUnsafe.objects
         if annotations:
             queryset = queryset.annotate(**annotations)
-        queryset = queryset.filter(**qs_filters).exclude(cache=None).order_by(ordering)\
-            .select_related('cache', 'decision')
+        queryset = queryset.filter(**qs_filters).exclude(cache=None).select_related('cache', 'decision')
         num_per_page = self.view['elements'][0] if self.view['elements'] else None
-        return paginate_queryset(queryset, self._params.get('page', 1), num_per_page)
+        return keyset_paginate_queryset(queryset, ordering, self._params.get('page', 1), num_per_page)
 
     def __get_title(self):
         title = _('Unsafes')
@@ -837,11 +831,10 @@ class UnknownsTable:
 
         # Filter by attribute(s)
         if 'attr_name' in self._params and 'attr_value' in self._params:
-            annotations['attr_value'] = RawSQL(
-                "\"{}\".\"attrs\"->>%s".format(self._cache_db_table),
-                (unquote(self._params['attr_name']),)
-            )
-            qs_filters['attr_value'] = unquote(self._params['attr_value'])
+            # Containment is supported by the GIN index unlike comparison of extracted values
+            qs_filters['cache__attrs__contains'] = {
+                unquote(self._params['attr_name']): unquote(self._params['attr_value'])
+            }
         elif 'attr' in self.view:
             annotations['attr_value'] = RawSQL(
                 "\"{}\".\"attrs\"->>%s".format(self._cache_db_table),
@@ -880,10 +873,9 @@ class UnknownsTable:
         queryset = ReportUnknown.objects
         if annotations:
             queryset = queryset.annotate(**annotations)
-        queryset = queryset.filter(**qs_filters).exclude(cache=None).order_by(ordering)\
-            .select_related('cache', 'decision')
+        queryset = queryset.filter(**qs_filters).exclude(cache=None).select_related('cache', 'decision')
         num_per_page = self.view['elements'][0] if self.view['elements'] else None
-        return paginate_queryset(queryset, self._params.get('page', 1), num_per_page)
+        return keyset_paginate_queryset(queryset, ordering, self._params.get('page', 1), num_per_page)
 
     def __get_title(self):
         title = _('Unknowns')
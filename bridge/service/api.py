@@ -15,6 +15,8 @@
 # limitations under the License.
 #
 
+from django.core.exceptions import ValidationError
+
 from rest_framework import exceptions
 from rest_framework.generics import (
     get_object_or_404, RetrieveAPIView, CreateAPIView, RetrieveDestroyAPIView, RetrieveUpdateAPIView
@@ -38,7 +40,10 @@ from service.serializers import (
     TaskSerializer, SolutionSerializer, SchedulerUserSerializer, DecisionSerializer,
     UpdateToolsSerializer, SchedulerSerializer, NodeConfSerializer
 )
-from service.utils import FinishDecision, TaskArchiveGenerator, SolutionArchiveGenerator, ReadDecisionConfiguration
+from service.utils import (
+    FinishDecision, TaskArchiveGenerator, SolutionArchiveGenerator, ReadDecisionConfiguration,
+    TasksStatusesChanges, ServiceError
+)
 
 
 class TaskAPIViewset(LoggedCallMixin, ModelViewSet):
@@ -47,9 +52,22 @@ class TaskAPIViewset(LoggedCallMixin, ModelViewSet):
     permission_classes = (ServicePermission,)
 
     def get_unparallel(self, request):
-        if request.method != 'GET':
+        if request.method == 'GET':
+            return []
+
+        # Tasks of different decisions can be created and changed in parallel
+        try:
+            if request.method == 'POST':
+                decision_id = Decision.objects.filter(identifier=request.POST.get('job'))\
+                    .values_list('id', flat=True).first()
+            else:
+                decision_id = Task.objects.filter(pk=self.kwargs.get('pk'))\
+                    .values_list('decision_id', flat=True).first()
+        except (ValueError, ValidationError):
+            decision_id = None
+        if decision_id is None:
             return [Decision]
-        return []
+        return [(Decision, decision_id)]
 
     def get_serializer(self, *args, **kwargs):
         fields = None
@@ -75,6 +93,20 @@ class TaskAPIViewset(LoggedCallMixin, ModelViewSet):
         instance.delete()
 
 
+class TasksStatusesChangesAPIView(LoggedCallMixin, APIView):
+    permission_classes = (ServicePermission,)
+
+    def get(self, request, identifier):
+        decision = get_object_or_404(Decision.objects.only('id'), identifier=identifier)
+        try:
+            res = TasksStatusesChanges(
+                decision, request.query_params.get('cursor'), request.query_params.get('timeout', 0)
+            )
+        except (ServiceError, ValueError) as e:
+            raise exceptions.ValidationError(str(e))
+        return Response({'cursor': res.cursor, 'tasks': res.tasks})
+
+
 class DownloadTaskArchiveView(StreamingResponseAPIView):
     permission_classes = (ServicePermission,)
 
@@ -15,16 +15,19 @@
 # limitations under the License.
 #
 
-from django.db import models
+from django.db import connection, models, transaction
 from django.db.models.signals import post_delete
 
 from bridge.vars import NODE_STATUS, TASK_STATUS
 from bridge.utils import WithFilesMixin, remove_instance_files
+from bridge.rawsql import LOCK_TASK_CHANGES, NEXT_TASK_CHANGE
 
 from users.models import User
 from jobs.models import Scheduler, Decision
 
 SERVICE_DIR = 'Service'
+# The first key of advisory locks of changes of tasks, the second one is the decision identifier
+TASK_CHANGES_LOCK = 1
 
 
 class VerificationTool(models.Model):
@@ -76,9 +79,22 @@ class Task(WithFilesMixin, models.Model):
     filename = models.CharField(max_length=256)
     archive = models.FileField(upload_to=SERVICE_DIR)
     description = models.JSONField()
+    # Number of the last change of the task
+    change = models.BigIntegerField(default=0)
+
+    def save(self, *args, **kwargs):
+        # Changes of tasks of the same decision are serialized until commits and they get increasing numbers, so
+        # clients can not miss changes that become visible after changes with greater numbers.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(LOCK_TASK_CHANGES, [TASK_CHANGES_LOCK, self.decision_id])
+                cursor.execute(NEXT_TASK_CHANGE)
+                self.change = cursor.fetchone()[0]
+            super().save(*args, **kwargs)
 
     class Meta:
         db_table = 'task'
+        indexes = [models.Index(fields=['decision', 'change'], name='task_decision_change_idx')]
 
 
 class Solution(WithFilesMixin, models.Model):
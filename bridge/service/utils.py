@@ -16,8 +16,10 @@
 #
 
 import json
+import time
 from wsgiref.util import FileWrapper
 
+from django.conf import settings
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
@@ -25,7 +27,7 @@ from bridge.vars import DECISION_STATUS, SCHEDULER_TYPE, TASK_STATUS
 from bridge.utils import logger, BridgeException
 
 from users.models import SchedulerUser
-from jobs.models import FileSystem
+from jobs.models import Decision, FileSystem
 from reports.models import ReportUnknown, ReportComponent
 from service.models import Task, Solution, Node, NodesConfiguration, Workload
 
@@ -233,6 +235,55 @@ class NodesData:
             self.configs.append(conf_data)
 
 
+class TasksStatusesChanges:
+    # Seconds between checks of tasks changes while the request is waiting for them
+    poll_interval = 1
+
+    def __init__(self, decision, cursor=None, timeout=0):
+        self._decision = decision
+        # The cursor is the number of the last change that was returned
+        self.cursor = self.__parse_cursor(cursor)
+        # Waiting requests hold Bridge workers, so they can not wait too long
+        self._timeout = min(max(float(timeout), 0), settings.TASKS_STATUSES_MAX_TIMEOUT)
+        self.tasks = []
+        self.__collect_changes()
+
+    def __parse_cursor(self, cursor):
+        if cursor is None:
+            return None
+        try:
+            return int(cursor)
+        except ValueError as e:
+            raise ServiceError('Wrong cursor format: {}'.format(cursor)) from e
+
+    def __collect_changes(self):
+        start_time = time.time()
+        # Statuses of all tasks are returned at once without waiting
+        wait = self.cursor is not None
+        while True:
+            self.__get_changes()
+            if self.tasks or not wait or time.time() - start_time >= self._timeout:
+                break
+
+            # Do not hold the request for decisions that will not produce new changes
+            if Decision.objects.only('status').get(id=self._decision.id).status not in {
+                DECISION_STATUS[1][0], DECISION_STATUS[2][0]
+            }:
+                break
+            time.sleep(self.poll_interval)
+
+    def __get_changes(self):
+        qs = Task.objects.filter(decision_id=self._decision.id)
+        if self.cursor is not None:
+            qs = qs.filter(change__gt=self.cursor)
+        else:
+            # There can be no tasks yet, so all further changes are interesting
+            self.cursor = 0
+        for task_id, status, change in qs.order_by('change').values_list('id', 'status', 'change'):
+            self.tasks.append({'id': task_id, 'status': status})
+            self.cursor = max(self.cursor, change)
+
+
 class TaskArchiveGenerator(FileWrapper):
     def __init__(self, task: Task):
         self._task = task
@@ -37,6 +37,7 @@ class CallLogs(models.Model):
     execution_delta = models.FloatField(default=0)
     wait1 = models.FloatField(default=0)
     wait2 = models.FloatField(default=0)
+    locks_wait = models.JSONField(default=dict)
     is_failed = models.BooleanField(default=True)
 
     class Meta:
@@ -15,12 +15,14 @@
 # limitations under the License.
 #
 
+import hashlib
 import os
 import re
 import time
 from datetime import datetime
 
 from django.conf import settings
+from django.db import connection, OperationalError
 from django.db.models.base import ModelBase
 
 from bridge.utils import BridgeException, logger
@@ -43,6 +45,43 @@ def get_time():
             pass
 
 
+def get_group_name(group):
+    if isinstance(group, ModelBase):
+        return getattr(group, '_meta').object_name
+    return str(group)
+
+
+def get_affected_models(groups):
+    """
+    Get names of models which are affected by changes of given groups.
+    :param groups: models, names or pairs (model or name, object id), for the latter the model is used
+    :return: set of names
+    """
+    block = set()
+    for group in groups:
+        if isinstance(group, tuple):
+            group = group[0]
+        if isinstance(group, ModelBase):
+            block |= affected_models(group, [])
+        else:
+            block.add(str(group))
+    return block
+
+
+def affected_models(model, parents):
+    curr_name = getattr(model, '_meta').object_name
+    related_models = {curr_name}
+    parents.append(curr_name)
+    for rel in [f for f in getattr(model, '_meta').get_fields()
+                if (f.one_to_one or f.one_to_many) and f.auto_created and not f.concrete]:
+        rel_model_name = getattr(rel.field.model, '_meta').object_name
+        if rel_model_name not in related_models and rel_model_name != curr_name and rel_model_name not in parents:
+            related_models.add(rel_model_name)
+            related_models |= affected_models(rel.field.model, parents)
+    parents.pop()
+    return related_models
+
+
 class ExecLocker:
     lockfile = os.path.join(settings.BASE_DIR, 'media', '.lock')
 
@@ -51,7 +90,7 @@ class ExecLocker:
             'name': name,
             'enter_time': get_time()
         }
-        self.names = self.__get_affected_models(groups)
+        self.names = get_affected_models(groups)
         self.lock_ids = set()
         # wait1 and wait2
         self.waiting_time = [0, 0]
@@ -127,27 +166,98 @@ class ExecLocker:
         # Lock
         LockTable.objects.filter(id__in=self.lock_ids).update(locked=True)
 
-    def __get_affected_models(self, groups):
-        block = set()
+
+class AdvisoryLocker:
+    """
+    Locker based on PostgreSQL session level advisory locks. It waits for locks without polling and supports locks
+    of separate objects besides locks of models. Lock of an object is exclusive just for this object while models
+    affected by it are locked in the shared mode, so locks of different objects do not block each other, but they
+    block locks of the whole models.
+    """
+
+    def __init__(self, name, groups):
+        self.call_log = {
+            'name': name,
+            'enter_time': get_time()
+        }
+        self.locks = self.__get_locks(groups)
+        self.locked = []
+        # There is no waiting for the lock file, so wait1 is always 0
+        self.waiting_time = [0, 0]
+        # Waiting time for each lock
+        self.locks_wait = self.call_log['locks_wait'] = {}
+
+    def __get_locks(self, groups):
+        # Values are True for shared locks. Exclusive locks take precedence over shared ones with the same names.
+        locks = {}
         for group in groups:
-            if isinstance(group, ModelBase):
-                block |= self.__affected_models(group, [])
+            if isinstance(group, tuple):
+                for name in get_affected_models([group]):
+                    locks.setdefault(name, True)
+                locks['{}:{}'.format(get_group_name(group[0]), group[1])] = False
             else:
-                block.add(str(group))
-        return block
-
-    def __affected_models(self, model, parents):
-        curr_name = getattr(model, '_meta').object_name
-        related_models = {curr_name}
-        parents.append(curr_name)
-        for rel in [f for f in getattr(model, '_meta').get_fields()
-                    if (f.one_to_one or f.one_to_many) and f.auto_created and not f.concrete]:
-            rel_model_name = getattr(rel.field.model, '_meta').object_name
-            if rel_model_name not in related_models and rel_model_name != curr_name and rel_model_name not in parents:
-                related_models.add(rel_model_name)
-                related_models |= self.__affected_models(rel.field.model, parents)
-        parents.pop()
-        return related_models
+                for name in get_affected_models([group]):
+                    locks[name] = False
+        return locks
+
+    @staticmethod
+    def get_key(name):
+        # Advisory locks are identified by signed 64-bit integers
+        return int.from_bytes(hashlib.md5(name.encode('utf-8')).digest()[:8], 'big', signed=True)
+
+    def lock(self):
+        if not self.locks:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SET lock_timeout = '{}s'".format(MAX_WAITING))
+            try:
+                # Always lock in the same order to avoid deadlocks
+                for name in sorted(self.locks, key=self.get_key):
+                    start = get_time()
+                    try:
+                        cursor.execute('SELECT pg_advisory_lock{}(%s)'.format(
+                            '_shared' if self.locks[name] else ''
+                        ), [self.get_key(name)])
+                    except OperationalError:
+                        self.__save_wait(name, start)
+                        if settings.UNLOCK_FAILED_REQUESTS:
+                            continue
+                        raise RuntimeError('Not enough time to lock execution of view')
+                    self.__save_wait(name, start)
+                    self.locked.append(name)
+            except Exception:
+                self.__unlock()
+                raise
+            finally:
+                cursor.execute('RESET lock_timeout')
+
+    def __save_wait(self, name, start):
+        wait = get_time() - start
+        self.waiting_time[1] += wait
+        self.locks_wait[name] = round(wait, 4)
+
+    def __unlock(self):
+        with connection.cursor() as cursor:
+            for name in reversed(self.locked):
+                cursor.execute('SELECT pg_advisory_unlock{}(%s)'.format(
+                    '_shared' if self.locks[name] else ''
+                ), [self.get_key(name)])
+        self.locked = []
+
+    def unlock(self, is_failed):
+        self.call_log.update({
+            'execution_delta': get_time() - self.call_log['execution_time'], 'is_failed': is_failed
+        })
+        # Unlike table locks advisory locks are always released since they do not outlive connections anyway
+        self.__unlock()
+        self.call_log['return_time'] = get_time()
+
+    def save_exec_time(self):
+        self.call_log.update({
+            'execution_time': get_time(),
+            'wait1': self.waiting_time[0],
+            'wait2': self.waiting_time[1]
+        })
 
 
 class LoggedCallMixin:
@@ -167,7 +277,8 @@ class LoggedCallMixin:
         if not settings.ENABLE_CALL_LOGS and not unparallel:
             return getattr(super(), 'dispatch')(request, *args, **kwargs)
 
-        locker = ExecLocker(type(self).__name__, unparallel)
+        locker_class = AdvisoryLocker if settings.EXEC_LOCKS == 'advisory' else ExecLocker
+        locker = locker_class(type(self).__name__, unparallel)
         try:
             locker.lock()
         except Exception:
@@ -231,6 +342,9 @@ class ProfileData:
                 'wait1': (call_data.wait1, call_data.wait1 >= MAX_WAITING),
                 'wait2': (call_data.wait2, call_data.wait2 >= MAX_WAITING),
                 'wait_total': call_data.wait1 + call_data.wait2,
+                'locks_wait': '; '.join('{}: {:.3f}'.format(name, wait) for name, wait in sorted(
+                    call_data.locks_wait.items(), key=lambda x: -x[1]
+                )),
                 'enter': datetime.fromtimestamp(call_data.enter_time),
                 'exec': datetime.fromtimestamp(call_data.execution_time),
                 'return': datetime.fromtimestamp(call_data.return_time),
@@ -30,7 +30,7 @@ from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from bridge.vars import DECISION_WEIGHT, DECISION_STATUS
-from bridge.utils import BridgeException, logger
+from bridge.utils import ARCHIVES_INDEX_DIR, BridgeException, logger
 
 from jobs.models import JOBFILE_DIR, JobFile, Decision
 from service.models import SERVICE_DIR, Solution, Task
@@ -43,7 +43,10 @@ from reports.models import (
     ReportComponent, ReportSafe, ReportUnsafe, ReportUnknown, ReportComponentLeaf,
     CoverageArchive, OriginalSources, DecisionCache, SourceCodeCache, ORIGINAL_SOURCES_DIR
 )
-from marks.tasks import connect_safe_report, connect_unsafe_report, connect_unknown_report
+from marks.tasks import (
+    connect_safe_report, connect_unsafe_reports, connect_unknown_reports,
+    UNSAFE_REPORTS_BATCH_SIZE, UNKNOWN_REPORTS_BATCH_SIZE
+)
 
 from caches.utils import RecalculateSafeCache, RecalculateUnsafeCache, RecalculateUnknownCache
 from reports.coverage import FillCoverageStatistics
@@ -69,14 +72,16 @@ def recalculate_safe_links(decisions):
 
 def recalculate_unsafe_links(decisions):
     MarkUnsafeReport.objects.filter(report__decision__in=decisions).delete()
-    for report_id in ReportUnsafe.objects.filter(decision__in=decisions).values_list('id', flat=True):
-        connect_unsafe_report.delay(report_id)
+    reports_ids = list(ReportUnsafe.objects.filter(decision__in=decisions).values_list('id', flat=True))
+    for i in range(0, len(reports_ids), UNSAFE_REPORTS_BATCH_SIZE):
+        connect_unsafe_reports.delay(reports_ids[i:i + UNSAFE_REPORTS_BATCH_SIZE])
 
 
 def recalculate_unknown_links(decisions):
     MarkUnknownReport.objects.filter(report__decision__in=decisions).delete()
-    for report_id in ReportUnknown.objects.filter(decision__in=decisions).values_list('id', flat=True):
-        connect_unknown_report.delay(report_id)
+    reports_ids = list(ReportUnknown.objects.filter(decision__in=decisions).values_list('id', flat=True))
+    for i in range(0, len(reports_ids), UNKNOWN_REPORTS_BATCH_SIZE):
+        connect_unknown_reports.delay(reports_ids[i:i + UNKNOWN_REPORTS_BATCH_SIZE])
 
 
 class ClearFiles:
@@ -85,6 +90,7 @@ class ClearFiles:
         self.__clear_files_with_ref(OriginalSources, ORIGINAL_SOURCES_DIR)
         self.__clear_files_with_ref(ConvertedTrace, CONVERTED_DIR)
         self.__clear_service_files()
+        self.__clear_archives_indexes()
 
     def __clear_files_with_ref(self, model, files_dir):
         objects_without_relations(model).delete()
@@ -119,6 +125,16 @@ class ClearFiles:
             files_in_the_system.add(os.path.abspath(os.path.join(settings.MEDIA_ROOT, s)))
         self.__clear_unused_files(SERVICE_DIR, files_in_the_system)
 
+    def __clear_archives_indexes(self):
+        indexes_directory = os.path.join(settings.MEDIA_ROOT, ARCHIVES_INDEX_DIR)
+        for root, _, files in os.walk(indexes_directory):
+            for file in files:
+                index_path = os.path.join(root, file)
+                archive_path = os.path.join(settings.MEDIA_ROOT, os.path.relpath(index_path, indexes_directory))
+                # Remove indexes of removed archives
+                if not os.path.isfile(os.path.splitext(archive_path)[0]):
+                    os.remove(index_path)
+
     def __clear_unused_files(self, files_dir, excluded: set):
         files_directory = os.path.join(settings.MEDIA_ROOT, files_dir)
         if os.path.isdir(files_directory):
@@ -15,14 +15,18 @@
 # limitations under the License.
 #
 
+import base64
 import json
 
+from django.db.models import Value
+from django.db.models.expressions import RawSQL
 from django.urls import reverse
 
 from bridge.vars import LANGUAGES, DATAFORMAT
 from bridge.utils import KleverTestCase
 
 from users.models import User, SchedulerUser
+from users.utils import KeysetPaginator
 
 
 class TestLoginAndRegister(KleverTestCase):
@@ -164,3 +168,46 @@ class TestLoggedInUser(KleverTestCase):
             'last_name': 'Newlastname', 'first_name': 'Newname'
         })
         self.assertEqual(response.status_code, 200)
+
+
+class TestKeysetPaginator(KleverTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(5):
+            User.objects.create_user('user{}'.format(i), '', 'password', accuracy=i % 3)
+
+    @staticmethod
+    def __token(key):
+        return '2.f.' + base64.urlsafe_b64encode(json.dumps(key).encode('utf8')).decode('utf8').rstrip('=')
+
+    def __check_first_page(self, paginator, token):
+        page = paginator.page(token)
+        self.assertEqual(page.number, 1)
+        self.assertEqual(list(page), list(paginator.page(1)))
+
+    def test_pages(self):
+        for ordering in ('id', 'username', '-accuracy'):
+            paginator = KeysetPaginator(User.objects.all(), ordering, 2)
+            page = paginator.page(1)
+            rows = list(page)
+            while page.has_next():
+                page = paginator.page(page.next_page_number())
+                rows.extend(page)
+            self.assertEqual(rows, list(User.objects.order_by(ordering, 'pk')))
+
+    def test_wrong_tokens(self):
+        paginator = KeysetPaginator(User.objects.all(), 'accuracy', 2)
+        for token in ('2.f.!!!', '2.f', 'x.f.' + self.__token([0, 1])[4:], self.__token(1), self.__token([1]),
+                      self.__token([1, 2, 3]), self.__token({'a': 1}), self.__token([0, '1']),
+                      self.__token([0, True]), self.__token([[0], 1]), self.__token(['high', 1])):
+            self.__check_first_page(paginator, token)
+
+        # Values of raw SQL annotations are compared as text
+        paginator = KeysetPaginator(User.objects.annotate(
+            ordering_attr=RawSQL('"users"."username"', ())
+        ), 'ordering_attr', 2)
+        self.assertEqual(len(paginator.page(self.__token([1, 1]))), 2)
+        self.__check_first_page(paginator, self.__token([{'a': 1}, 1]))
+
+        paginator = KeysetPaginator(User.objects.annotate(constant=Value(1)), 'constant', 2)
+        self.__check_first_page(paginator, self.__token(['one', 1]))
@@ -15,11 +15,15 @@
 # limitations under the License.
 #
 
+import base64
 import json
+import math
 from datetime import date
 
+from django.core.exceptions import FieldError, ValidationError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q
+from django.db import connection
+from django.db.models import F, Q
 from django.template import Template, Context
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -33,6 +37,9 @@ from users.models import DataView, PreferableView, User
 
 DEF_NUMBER_OF_ELEMENTS = 18
 
+# Rows are counted exactly up to this number, otherwise their number is estimated by the query planner
+EXACT_COUNT_LIMIT = 10000
+
 JOB_TREE_VIEW = {
     'columns': ['role', 'author', 'creation_date', 'status', 'unsafe:total', 'problem:total', 'safe:total'],
     # jobs_order: [up|down, name|creation_date]
@@ -598,3 +605,164 @@ def paginate_queryset(queryset, page, num_per_page=None):
     except EmptyPage:
         values = paginator.page(paginator.num_pages)
     return paginator, values
+
+
+class KeysetPage:
+    def __init__(self, paginator, object_list, number, has_previous, has_next):
+        self.paginator = paginator
+        self.object_list = object_list
+        self.number = max(number, 1)
+        self._has_previous = has_previous
+        self._has_next = has_next
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def previous_page_number(self):
+        return self.paginator.get_token(self.number - 1, self.object_list[0], backward=True)
+
+    def next_page_number(self):
+        return self.paginator.get_token(self.number + 1, self.object_list[-1])
+
+
+class KeysetPaginator:
+    """
+    Paginator that selects rows following the last row of the previous page (or preceding the first row of the next
+    page) by values of the ordering field and the primary key instead of skipping rows with OFFSET, so the cost of
+    getting a page does not depend on its number. Pages are referred by tokens including these values instead of
+    numbers, while numbers are still accepted. Large numbers of rows are not counted but estimated.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.object_list = queryset
+        self.per_page = per_page
+        self._field = ordering.lstrip('-')
+        self._descending = ordering.startswith('-')
+
+    @cached_property
+    def _count_data(self):
+        count = self.object_list.order_by()[:EXACT_COUNT_LIMIT + 1].count()
+        if count <= EXACT_COUNT_LIMIT:
+            return count, False
+
+        sql, params = self.object_list.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return max(count, int(plan[0]['Plan']['Plan Rows'])), True
+
+    @property
+    def count(self):
+        return self._count_data[0]
+
+    @property
+    def approximate(self):
+        return self._count_data[1]
+
+    @property
+    def num_pages(self):
+        return max(math.ceil(self.count / self.per_page), 1)
+
+    def get_token(self, number, obj, backward=False):
+        key = json.dumps([getattr(obj, self._field), obj.pk]).encode('utf8')
+        return '{0}.{1}.{2}'.format(
+            number, 'b' if backward else 'f', base64.urlsafe_b64encode(key).decode('utf8').rstrip('=')
+        )
+
+    def __parse_token(self, token):
+        # Tokens come from clients, so they can be corrupted anyhow
+        try:
+            number, direction, key = str(token).split('.')
+            value, pk = json.loads(base64.urlsafe_b64decode(key + '=' * (-len(key) % 4)).decode('utf8'))
+            if not isinstance(pk, int) or isinstance(pk, bool):
+                raise ValueError('Wrong primary key')
+            return int(number), direction == 'b', (self.__clean_value(value), pk)
+        except (ValueError, TypeError, ValidationError):
+            return None
+
+    def __clean_value(self, value):
+        if value is None:
+            return None
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            raise ValueError('Wrong ordering value')
+        if self._field in {'id', 'pk'}:
+            return value
+        try:
+            output_field = self.object_list.query.chain().resolve_ref(self._field).output_field
+        except FieldError:
+            # Raw SQL annotations extract text values from JSON fields
+            return str(value)
+        return output_field.to_python(value)
+
+    def __order(self, queryset, descending):
+        pk_ordering = '-pk' if descending else 'pk'
+        if self._field in {'id', 'pk'}:
+            return queryset.order_by(pk_ordering)
+        return queryset.order_by(F(self._field).desc() if descending else F(self._field).asc(), pk_ordering)
+
+    def __filter_after(self, queryset, key, descending):
+        value, pk = key
+        lookup = 'lt' if descending else 'gt'
+        if self._field in {'id', 'pk'}:
+            return queryset.filter(**{'pk__' + lookup: pk})
+
+        # PostgreSQL puts NULL values last in ascending order and first in descending order
+        if value is None:
+            qs_filter = Q(**{self._field + '__isnull': True, 'pk__' + lookup: pk})
+            if descending:
+                qs_filter |= Q(**{self._field + '__isnull': False})
+        else:
+            qs_filter = Q(**{self._field + '__' + lookup: value}) | Q(**{self._field: value, 'pk__' + lookup: pk})
+            if not descending:
+                qs_filter |= Q(**{self._field + '__isnull': True})
+        return queryset.filter(qs_filter)
+
+    def page(self, token):
+        """
+        Get the page.
+        :param token: the page number, 'last' or the token returned by previous_page_number() or next_page_number().
+        :return: KeysetPage
+        """
+        if token == 'last':
+            rows = list(self.__order(self.object_list, not self._descending)[:self.per_page + 1])
+            return KeysetPage(self, rows[:self.per_page][::-1], self.num_pages, len(rows) > self.per_page, False)
+
+        try:
+            number = int(token)
+        except ValueError:
+            pass
+        else:
+            # Page numbers are used for the first page and links that were got before
+            offset = (max(number, 1) - 1) * self.per_page
+            rows = list(self.__order(self.object_list, self._descending)[offset:offset + self.per_page + 1])
+            if offset > 0 and not rows:
+                return self.page('last')
+            return KeysetPage(self, rows[:self.per_page], number, offset > 0, len(rows) > self.per_page)
+
+        parsed_token = self.__parse_token(token)
+        if parsed_token is None:
+            return self.page(1)
+        number, backward, key = parsed_token
+        descending = self._descending != backward
+        rows = list(self.__order(self.__filter_after(self.object_list, key, descending), descending)
+                    [:self.per_page + 1])
+        if backward:
+            return KeysetPage(self, rows[:self.per_page][::-1], number, len(rows) > self.per_page, True)
+        return KeysetPage(self, rows[:self.per_page], number, True, len(rows) > self.per_page)
+
+
+def keyset_paginate_queryset(queryset, ordering, page, num_per_page=None):
+    num_per_page = max(int(num_per_page), 1) if num_per_page else DEF_NUMBER_OF_ELEMENTS
+    paginator = KeysetPaginator(queryset, ordering, num_per_page)
+    return paginator, paginator.page(page)
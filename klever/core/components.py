@@ -18,6 +18,7 @@
 import glob
 import json
 import multiprocessing
+import multiprocessing.connection
 import os
 import shutil
 import signal
@@ -40,10 +41,28 @@ def all_child_resources():
     return total_child_resources
 
 
-def count_consumed_resources(logger, start_time, include_child_resources=False, child_resources=None):
+def get_cpu_time(include_child_resources=False):
+    """
+    Get CPU time (user and system) consumed by the process so far.
+
+    :param include_child_resources: Take into account CPU time of terminated children.
+    :return: CPU time in seconds.
+    """
+    utime, stime = resource.getrusage(resource.RUSAGE_SELF)[0:2]
+    if include_child_resources:
+        utime_children, stime_children = resource.getrusage(resource.RUSAGE_CHILDREN)[0:2]
+        utime += utime_children
+        stime += stime_children
+    return utime + stime
+
+
+def count_consumed_resources(logger, start_time, include_child_resources=False, child_resources=None,
+                             start_cpu_time=0):
     """
     Count resources (wall time, CPU time and maximum memory size) consumed by the process without its children.
     Note that launching under PyCharm gives its maximum memory size rather than the process one.
+    :param start_cpu_time: CPU time consumed before start of the measured work. It matters for processes that perform
+                           several works one by one.
     :return: resources.
     """
     logger.debug('Count consumed resources')
@@ -52,6 +71,7 @@ def count_consumed_resources(logger, start_time, include_child_resources=False,
         'Do not calculate resources of process with children and simultaneously provide resources of children'
 
     utime, stime, maxrss = resource.getrusage(resource.RUSAGE_SELF)[0:3]
+    utime -= start_cpu_time
 
     # Take into account children resources if necessary.
     if include_child_resources:
@@ -78,7 +98,30 @@ def count_consumed_resources(logger, start_time, include_child_resources=False,
     return resources
 
 
-def launch_workers(logger, workers, monitoring_list=None):
+def wait_for_events(components, queues=(), timeout=None):
+    """
+    Block until some of given components terminates or some of given queues gets new elements.
+
+    :param components: List of started Component objects.
+    :param queues: List of multiprocessing.Queue objects. Other queues can not be waited for, so for them the function
+                   just waits for termination of components within the given timeout.
+    :param timeout: Maximum time to wait in seconds or None to wait infinitely.
+    :return: None
+    """
+    objects = [p.sentinel for p in components]
+    for given_queue in queues:
+        # There is no public API to wait for multiprocessing.Queue, but its reader is a connection that can be waited
+        reader = getattr(given_queue, '_reader', None)
+        if reader is not None and not reader.closed:
+            objects.append(reader)
+
+    if objects:
+        multiprocessing.connection.wait(objects, timeout)
+    elif timeout:
+        time.sleep(timeout)
+
+
+def launch_workers(logger, workers, monitoring_list=None, sleep_interval=1):
     """
     Wait until all given components will finish their work. If one among them fails, terminate the rest.
 
@@ -86,24 +129,26 @@ def launch_workers(logger, workers, monitoring_list=None):
     :param workers: List of Component objects.
     :param monitoring_list: List with already started Components that should be checked as other workers and if some of
                             them fails then we should also terminate the rest workers.
+    :param sleep_interval: Maximum interval between workers check in seconds. Workers are checked as soon as some of
+                           them terminates.
     :return: None
     """
     logger.info('Run {} components'.format(len(workers)))
+    monitoring_list = monitoring_list if isinstance(monitoring_list, list) else []
     try:
         for w in workers:
             w.start()
 
         logger.info('Wait for components')
-        while True:
-            operating_subcomponents_num = 0
-
-            for p in workers:
-                p.join(1.0 / len(workers))
-                operating_subcomponents_num += p.is_alive()
+        operating = list(workers)
+        while operating:
+            # Wake up just when some of components terminates
+            wait_for_events(operating + alive_components(monitoring_list), timeout=sleep_interval)
+
+            for p in [p for p in operating if not p.is_alive()]:
+                p.join()
+                operating.remove(p)
             check_components(logger, monitoring_list)
-
-            if not operating_subcomponents_num:
-                break
     finally:
         for p in workers:
             if p.is_alive():
@@ -123,7 +168,8 @@ def launch_queue_workers(logger, queue, constructor, max_threads, fail_tolerant=
     :param fail_tolerant: True if no need to stop processing on fail.
     :param monitoring_list: List with already started Components that should be checked as other workers and if some of
                             them fails then we should also terminate the rest workers.
-    :param sleep_interval: Interval between workers check in seconds.
+    :param sleep_interval: Maximum interval between workers check in seconds. Workers are checked as soon as some of
+                           them terminates or new elements come.
     :return: 0 if all workers finish successfully and 1 otherwise.
     """
     active = True
@@ -156,15 +202,6 @@ def launch_queue_workers(logger, queue, constructor, max_threads, fail_tolerant=
             # Because we use i for deletion we always delete the element near the end to not break order of
             # following of the rest unprocessed elements
             for i, p in reversed(list(enumerate(list(components)))):
-                try:
-                    p.join(1.0 / len(components))
-                except ComponentError:
-                    # Ignore or terminate the rest
-                    if fail_tolerant:
-                        ret = 1
-                    else:
-                        raise
-                # If all is OK
                 if not p.is_alive():
                     # Make to be sure to execute join the last time
                     try:
@@ -185,14 +222,17 @@ def launch_queue_workers(logger, queue, constructor, max_threads, fail_tolerant=
 
             if finished > 0:
                 logger.debug("Finished {} workers".format(finished))
+                # There may be free slots for elements that are already fetched
+                continue
 
             # Check that we can quit or must wait
             if len(components) == 0 and len(elements) == 0:
                 if not active:
                     break
-            if len(components) >= max_threads or len(elements) == 0:
-                # sleep if thread pool is full or there are no new elements
-                time.sleep(sleep_interval)
+
+            # Wait until some worker terminates or new elements come if new workers can be started
+            wait_for_events(components + alive_components(monitoring_list),
+                            [queue] if active and len(components) < max_threads else [], sleep_interval)
     finally:
         for p in components:
             if p.is_alive():
@@ -201,6 +241,17 @@ def launch_queue_workers(logger, queue, constructor, max_threads, fail_tolerant=
     return ret
 
 
+def alive_components(components):
+    """
+    Get components that did not terminate yet. Sentinels of terminated components are always ready, so waiting for them
+    does not block.
+
+    :param components: List with Component objects or None.
+    :return: List with Component objects.
+    """
+    return [c for c in components if c.is_alive()] if isinstance(components, list) else []
+
+
 def check_components(logger, components):
     """
     Check that all given processes are alive and raise an exception if it is not so.
@@ -259,19 +310,42 @@ class Component(multiprocessing.Process):
         # The only bad thing is that at this point we are not aware about lengths of suffixes to be used, so, if one
         # will suddenly exceed limit "255 - self.MAX_ID_LEN", there still will be an unclear failure in Bridge without
         # good unknown reports. Let's hope that this will not happen ever.
-        if len(self.id) > self.MAX_ID_LEN:
-            raise ValueError(
-                'Too large component identifier "{0}" (current length is {1} while {2} can be used at most)'
-                .format(self.id, len(self.id), self.MAX_ID_LEN))
+        self.__check_id()
 
         self.work_dir = work_dir if work_dir else self.name.lower()
         # Component start time.
         self.tasks_start_time = 0
+        # CPU time consumed by the process before the component start.
+        self.tasks_start_cpu_time = 0
         self.__pid = None
 
         self.clean_dir = False
         self._cur_dir = None
 
+    def __check_id(self):
+        if len(self.id) > self.MAX_ID_LEN:
+            raise ValueError(
+                'Too large component identifier "{0}" (current length is {1} while {2} can be used at most)'
+                .format(self.id, len(self.id), self.MAX_ID_LEN))
+
+    def reset(self, conf, logger, parent_id):
+        """
+        Prepare the component that has already run within the current process to run once again for another parent.
+
+        :param conf: Configuration.
+        :param logger: Parent logger.
+        :param parent_id: Parent identifier.
+        :return: None
+        """
+        self.conf = conf
+        self.logger = logger
+        self.id = os.path.join(parent_id, os.path.relpath(self.id, self.parent_id))
+        self.parent_id = parent_id
+        self.__check_id()
+        self.coverage = None
+        self.clean_dir = False
+        self._cur_dir = None
+
     def start(self):
         # Component working directory will be created in parent process.
         if self.separate_from_parent and not os.path.isdir(self.work_dir):
@@ -289,6 +363,9 @@ class Component(multiprocessing.Process):
     def run(self):
         # Remember approximate time of start to count wall time.
         self.tasks_start_time = time.time()
+        # Several components can be run one by one within the same process, so remember CPU time consumed by previous
+        # ones.
+        self.tasks_start_cpu_time = get_cpu_time(self.include_child_resources)
 
         # Remember component pid to distinguish it from its auxiliary subcomponents, e.g. synchronization managers,
         # later during finalization on stopping.
@@ -354,7 +431,7 @@ class Component(multiprocessing.Process):
                 child_resources = all_child_resources()
                 report = {'identifier': self.id}
                 report.update(count_consumed_resources(self.logger, self.tasks_start_time, self.include_child_resources,
-                                                       child_resources))
+                                                       child_resources, self.tasks_start_cpu_time))
                 # todo: this is embarrassing
                 if self.coverage:
                     report['coverage'] = self.coverage
@@ -367,7 +444,8 @@ class Component(multiprocessing.Process):
                 os.makedirs('child resources'.encode('utf-8'), exist_ok=True)
                 with open(os.path.join('child resources', self.name + '.json'), 'w', encoding='utf-8') as fp:
                     klever.core.utils.json_dump(count_consumed_resources(self.logger, self.tasks_start_time,
-                                                                         self.include_child_resources),
+                                                                         self.include_child_resources,
+                                                                         start_cpu_time=self.tasks_start_cpu_time),
                                                 fp, self.conf['keep intermediate files'])
         except Exception:  # pylint: disable=broad-exception-caught
             exception = True
@@ -450,7 +528,9 @@ class Component(multiprocessing.Process):
     def _report(self, kind, report, report_dir='', data_files=None):
         klever.core.utils.report(self.logger, kind, report, self.mqs['report files'],
                                  self.vals['report id'], self.conf['main working directory'],
-                                 report_dir, data_files)
+                                 report_dir, data_files,
+                                 in_memory=not self.conf['keep intermediate files'],
+                                 fsync=self.conf.get('fsync report file archives', True))
 
     def launch_subcomponents(self, *subcomponents):
         subcomponent_processes = []
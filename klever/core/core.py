@@ -47,6 +47,7 @@ class Core:
         self.session = None
         self.mqs = {}
         self.report_id = multiprocessing.Value('i', 1)
+        self.bridge_session = None
         self.uploading_reports_process = None
         self.is_start_report_uploaded = False
 
@@ -62,7 +63,10 @@ class Core:
             self.logger = klever.core.utils.get_logger(type(self).__name__, self.conf['logging'])
             self.logger.info('Solve job "%s"', self.conf['identifier'])
 
-            self.session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
+            # Share Bridge token with all Core components, so that they will not get it again.
+            self.bridge_session = multiprocessing.Manager().dict()
+            self.session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'],
+                                                       {'bridge session': self.bridge_session})
             self.session.start_job_decision(klever.core.job.JOB_FORMAT, klever.core.job.JOB_ARCHIVE)
 
             self.mqs['report files'] = multiprocessing.Manager().Queue()
@@ -70,7 +74,8 @@ class Core:
             os.makedirs('child resources'.encode('utf-8'))
 
             self.uploading_reports_process = Reporter(self.conf, self.logger, self.ID, self.mqs,
-                                                      {'report id': self.report_id})
+                                                      {'report id': self.report_id,
+                                                       'bridge session': self.bridge_session})
             self.uploading_reports_process.start()
 
             self.get_comp_desc()
@@ -89,13 +94,15 @@ class Core:
                 },
                 self.mqs['report files'],
                 self.report_id,
-                self.conf['main working directory']
+                self.conf['main working directory'],
+                **self.get_report_options()
             )
             self.is_start_report_uploaded = True
 
             klever.core.job.start_jobs(self, {
                 'report id': self.report_id,
-                'coverage_finished': multiprocessing.Manager().dict()
+                'coverage_finished': multiprocessing.Manager().dict(),
+                'bridge session': self.bridge_session
             })
         except Exception:  # pylint: disable=broad-exception-caught
             self.process_exception()
@@ -118,7 +125,8 @@ class Core:
                             },
                             self.mqs['report files'],
                             self.report_id,
-                            self.conf['main working directory']
+                            self.conf['main working directory'],
+                            **self.get_report_options()
                         )
                 except Exception:  # pylint: disable=broad-exception-caught
                     self.process_exception()
@@ -143,7 +151,7 @@ class Core:
                         report['log'] = klever.core.utils.ArchiveFiles(['log.txt'])
 
                     klever.core.utils.report(self.logger, 'finish', report, self.mqs['report files'], self.report_id,
-                                             self.conf['main working directory'])
+                                             self.conf['main working directory'], **self.get_report_options())
 
                     self.logger.info('Terminate report files message queue')
                     self.mqs['report files'].put(None)
@@ -224,6 +232,12 @@ class Core:
             'data': entities[1:]
         }
 
+    def get_report_options(self):
+        return {
+            'in_memory': not self.conf['keep intermediate files'],
+            'fsync': self.conf.get('fsync report file archives', True)
+        }
+
     def process_exception(self):
         self.exit_code = 1
 
@@ -234,37 +248,43 @@ class Core:
 
 
 class Reporter(klever.core.components.Component):
+    # Upload a batch of reports as soon as a total size of reports and their file archives reaches this limit.
+    BATCH_SIZE = 16 * 1024 * 1024
+    # Maximum time in seconds to wait for more reports before uploading a batch which is less than the limit.
+    BATCH_TIMEOUT = 1
 
     def send_reports(self):
-        session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
-        issleep = True
-        while True:
-            # Report batches of reports each 3 seconds. This reduces the number of requests quite considerably.
-            if issleep:
-                time.sleep(3)
-            else:
-                issleep = True
-
+        session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'],
+                                              self.vals)
+        is_finish = False
+        while not is_finish:
+            # Collect batches of reports limiting them by size rather than by the number of reports. This reduces the
+            # number of requests quite considerably when there are many small reports, while batches of large reports
+            # are uploaded immediately.
             reports_and_report_file_archives = []
-            is_finish = False
+            batch_size = 0
+            deadline = None
+            # TODO: replace MQ with "reports and report file archives".
+            report_and_report_file_archives = self.mqs['report files'].get()
             while True:
+                if report_and_report_file_archives is None:
+                    self.logger.debug('Report files message queue was terminated')
+                    is_finish = True
+                    break
+
+                reports_and_report_file_archives.append(report_and_report_file_archives)
+                batch_size += self.__get_size(report_and_report_file_archives)
+                if batch_size >= self.BATCH_SIZE:
+                    break
+
+                if deadline is None:
+                    deadline = time.time() + self.BATCH_TIMEOUT
+                timeout = deadline - time.time()
+                if timeout <= 0:
+                    break
+
                 try:
-                    # TODO: replace MQ with "reports and report file archives".
-                    report_and_report_file_archives = self.mqs['report files'].get_nowait()
-
-                    if report_and_report_file_archives is None:
-                        self.logger.debug('Report files message queue was terminated')
-                        is_finish = True
-                        break
-
-                    reports_and_report_file_archives.append(report_and_report_file_archives)
-
-                    # We may fail if we try to upload too big report.
-                    # In such a case we switch to upload reports separately.
-                    if len(reports_and_report_file_archives) == 10:
-                        # Do not sleep since there may be pending reports already.
-                        issleep = False
-                        break
+                    report_and_report_file_archives = self.mqs['report files'].get(timeout=timeout)
                 except queue.Empty:
                     break
 
@@ -283,7 +303,7 @@ class Reporter(klever.core.components.Component):
                 for report_and_report_file_archives in reports_and_report_file_archives:
                     report_file_archives = report_and_report_file_archives.get('report file archives')
                     self.logger.debug('Upload report file "%s" with report file archives:\n%s',
-                        report_and_report_file_archives['report file'],
+                        report_and_report_file_archives.get('report file', 'in memory'),
                         '\n'.join(['  {0}'.format(archive) for archive in report_file_archives])
                         if report_file_archives else '')
 
@@ -295,7 +315,20 @@ class Reporter(klever.core.components.Component):
                             self.logger.error(err_msg)
                             raise BridgeError(err_msg)
                             # TODO: we still may fail here in case of big report.
-            if is_finish:
-                break
+
+        session.log_latencies()
 
     main = send_reports
+
+    @staticmethod
+    def __get_size(report_and_report_file_archives):
+        size = len(report_and_report_file_archives.get('report', b''))
+        files = list(report_and_report_file_archives.get('report file archives') or [])
+        if 'report file' in report_and_report_file_archives:
+            files.append(report_and_report_file_archives['report file'])
+        for file in files:
+            try:
+                size += os.path.getsize(file)
+            except OSError:
+                pass
+        return size
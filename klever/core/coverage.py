@@ -15,11 +15,16 @@
 # limitations under the License.
 #
 
+import array
+import itertools
 import json
 import os
+import queue
 import shutil
 import re
 import multiprocessing
+import struct
+import zlib
 
 import klever.core.components
 import klever.core.utils
@@ -28,70 +33,216 @@ coverage_format_version = 1
 most_covered_lines_num = 100
 
 
-def add_to_coverage(merged_coverage_info, coverage_info):
+def merge_notes(prev_notes, note):
+    prev_verifier_assumptions = None
+    prev_verifier_op_stats = None
+    verifier_assumptions = None
+    verifier_op_stats = None
+
+    def split_multiple_notes(notes):
+        verifier_op_stats, verifier_assumptions = notes.split('ms. ')
+        return verifier_op_stats + 'ms', verifier_assumptions
+
+    if prev_notes['kind'] == 'Multiple notes':
+        prev_verifier_op_stats, prev_verifier_assumptions = split_multiple_notes(prev_notes['text'])
+    elif prev_notes['kind'] == 'Verifier assumption':
+        prev_verifier_assumptions = prev_notes['text']
+    else:
+        prev_verifier_op_stats = prev_notes['text']
+
+    if note['kind'] == 'Multiple notes':
+        verifier_op_stats, verifier_assumptions = split_multiple_notes(note['text'])
+    elif note['kind'] == 'Verifier assumption':
+        verifier_assumptions = note['text']
+    else:
+        verifier_op_stats = note['text']
+
+    merged_verifier_op_stats = merge_verifier_op_stats(prev_verifier_op_stats, verifier_op_stats)
+    merged_verifier_assumptions = merge_verifier_assumptions(prev_verifier_assumptions, verifier_assumptions)
+
+    if merged_verifier_assumptions and merged_verifier_op_stats:
+        return {'kind': 'Multiple notes', 'text': merged_verifier_op_stats + '. ' + merged_verifier_assumptions}
+    if merged_verifier_assumptions:
+        return {'kind': 'Verifier assumption', 'text': merged_verifier_assumptions}
+    return {'kind': 'Verifier operation statistics', 'text': merged_verifier_op_stats}
+
+
+# Code coverage of verification tasks is passed between processes in the binary format. It starts with a header
+# followed by records for source files. Each record consists of a record header, a file name, JSON encoded data that
+# is not numbers of line and function coverages, sorted line numbers and corresponding numbers of their coverages and
+# the same for functions. Numbers are unsigned 32-bit integers. Sections are aligned, so one can get arrays from
+# memory-mapped files without copying.
+COVERAGE_INFO_MAGIC = b'KCOV'
+COVERAGE_INFO_HEADER = struct.Struct('=4sI')
+COVERAGE_INFO_RECORD_HEADER = struct.Struct('=IIII')
+COVERAGE_INFO_ALIGNMENT = 8
+
+
+def _align(size):
+    return (size + COVERAGE_INFO_ALIGNMENT - 1) // COVERAGE_INFO_ALIGNMENT * COVERAGE_INFO_ALIGNMENT
+
+
+def _get_record_size(name_len, data_len, lines_num, functions_num):
+    return COVERAGE_INFO_RECORD_HEADER.size + _align(name_len + data_len) + 2 * _align(lines_num * 4) + \
+        2 * _align(functions_num * 4)
+
+
+def dump_coverage_info(coverage_info):
+    """
+    Convert code coverage in the format that is returned by LCOV.parse() to the binary format.
+
+    :param coverage_info: Dictionary with code coverage.
+    :return: Bytes.
+    """
+    chunks = [COVERAGE_INFO_HEADER.pack(COVERAGE_INFO_MAGIC, coverage_format_version)]
     for file_name, file_coverage_info in coverage_info.items():
-        merged_coverage_info.setdefault(file_name, {
-            'total functions': coverage_info[file_name]['total functions'],
-            'covered lines': {},
-            'covered functions': {},
-            'covered function names': [],
-            'notes': {}
-        })
+        name = file_name.encode('utf-8')
+        data = json.dumps({
+            'total functions': file_coverage_info['total functions'],
+            'covered function names': file_coverage_info['covered function names'],
+            'notes': file_coverage_info['notes'],
+            'original source file name': file_coverage_info.get('original source file name')
+        }, ensure_ascii=True).encode('utf-8')
+        chunks.append(COVERAGE_INFO_RECORD_HEADER.pack(len(name), len(data), len(file_coverage_info['covered lines']),
+                                                       len(file_coverage_info['covered functions'])))
+        chunks.append(name + data + bytes(_align(len(name) + len(data)) - len(name) - len(data)))
 
         for kind in ('covered lines', 'covered functions'):
-            for line, cov_num in file_coverage_info[kind].items():
-                merged_coverage_info[file_name][kind].setdefault(line, 0)
-                merged_coverage_info[file_name][kind][line] += cov_num
-
-        for cov_func_name in file_coverage_info['covered function names']:
-            if cov_func_name not in merged_coverage_info[file_name]['covered function names']:
-                merged_coverage_info[file_name]['covered function names'].append(cov_func_name)
-
-        for line, note in file_coverage_info['notes'].items():
-            # Specify first note for a given line.
-            if line not in merged_coverage_info[file_name]['notes']:
-                merged_coverage_info[file_name]['notes'][line] = note
-            # Merge new note with the previous one(s).
+            lines = sorted(file_coverage_info[kind])
+            for numbers in (lines, (file_coverage_info[kind][line] for line in lines)):
+                numbers_bytes = array.array('I', numbers).tobytes()
+                chunks.append(numbers_bytes + bytes(_align(len(numbers_bytes)) - len(numbers_bytes)))
+
+    return b''.join(chunks)
+
+
+def split_coverage_info(coverage_info):
+    """
+    Get records of source files from code coverage in the binary format without decoding them.
+
+    :param coverage_info: Bytes or any other object supporting the buffer protocol, e.g. a memory-mapped file.
+    :return: Iterator over pairs of source file names and memory views of their records.
+    """
+    buffer = memoryview(coverage_info)
+    magic, version = COVERAGE_INFO_HEADER.unpack_from(buffer)
+    if magic != COVERAGE_INFO_MAGIC or version != coverage_format_version:
+        raise ValueError('Code coverage has unsupported format')
+
+    offset = COVERAGE_INFO_HEADER.size
+    while offset < len(buffer):
+        name_len, data_len, lines_num, functions_num = COVERAGE_INFO_RECORD_HEADER.unpack_from(buffer, offset)
+        name_offset = offset + COVERAGE_INFO_RECORD_HEADER.size
+        record_size = _get_record_size(name_len, data_len, lines_num, functions_num)
+        yield str(buffer[name_offset:name_offset + name_len], 'utf-8'), buffer[offset:offset + record_size]
+        offset += record_size
+
+
+def join_coverage_info(records):
+    """
+    Make code coverage in the binary format from records of source files.
+
+    :param records: Memory views of records that are returned by split_coverage_info().
+    :return: Bytes.
+    """
+    return b''.join([COVERAGE_INFO_HEADER.pack(COVERAGE_INFO_MAGIC, coverage_format_version)] + list(records))
+
+
+def load_coverage_info(coverage_info):
+    """
+    Decode code coverage in the binary format. Numbers of line and function coverages are not copied.
+
+    :param coverage_info: Bytes or any other object supporting the buffer protocol, e.g. a memory-mapped file.
+    :return: Iterator over tuples with a source file name, a dictionary with data that is not numbers of line and
+             function coverages, memory views of sorted line numbers and numbers of their coverages, and memory views
+             of sorted function line numbers and numbers of their coverages.
+    """
+    for file_name, record in split_coverage_info(coverage_info):
+        name_len, data_len, lines_num, functions_num = COVERAGE_INFO_RECORD_HEADER.unpack_from(record)
+        offset = COVERAGE_INFO_RECORD_HEADER.size
+        data = json.loads(str(record[offset + name_len:offset + name_len + data_len], 'utf-8'))
+        offset += _align(name_len + data_len)
+
+        arrays = []
+        for num in (lines_num, functions_num):
+            for _ in range(2):
+                arrays.append(record[offset:offset + num * 4].cast('I'))
+                offset += _align(num * 4)
+
+        yield (file_name, data) + tuple(arrays)
+
+
+class TotalCoverage:
+    """
+    Compact accumulator of code coverage of many verification tasks. Numbers of line and function coverages are kept
+    within arrays indexed by line numbers rather than within dictionaries. Negative numbers correspond to lines that
+    are not considered at all.
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    def add(self, coverage_info):
+        """
+        Add code coverage of the verification task.
+
+        :param coverage_info: Code coverage in the binary format.
+        """
+        for file_name, data, lines, line_cov_nums, functions, function_cov_nums in load_coverage_info(coverage_info):
+            _, covered_lines, covered_functions, covered_function_names, notes = \
+                self.__get_file(file_name, data['total functions'])
+
+            self.__add_counters(covered_lines, lines, line_cov_nums)
+            self.__add_counters(covered_functions, functions, function_cov_nums)
+            self.__add_names_and_notes(covered_function_names, notes, data['covered function names'], data['notes'])
+
+    def get_file_coverage_info(self, file_name):
+        """
+        Get accumulated code coverage of the given file in the format that is returned by LCOV.
+
+        :param file_name: Source file name.
+        :return: Dictionary with code coverage of the file.
+        """
+        total_functions, covered_lines, covered_functions, covered_function_names, notes = self.files[file_name]
+        return {
+            'total functions': total_functions,
+            'covered lines': {line: cov_num for line, cov_num in enumerate(covered_lines) if cov_num >= 0},
+            'covered functions': {line: cov_num for line, cov_num in enumerate(covered_functions) if cov_num >= 0},
+            'covered function names': list(covered_function_names),
+            'notes': notes
+        }
+
+    def __get_file(self, file_name, total_functions):
+        if file_name not in self.files:
+            # Remember function names in the order they were met.
+            self.files[file_name] = (total_functions, array.array('q'), array.array('q'), {}, {})
+
+        return self.files[file_name]
+
+    @staticmethod
+    def __add_counters(counters, lines, cov_nums):
+        # Lines are sorted, so it is enough to extend counters just once.
+        if lines and lines[-1] >= len(counters):
+            counters.extend(itertools.repeat(-1, lines[-1] + 1 - len(counters)))
+
+        for line, cov_num in zip(lines, cov_nums):
+            if counters[line] < 0:
+                counters[line] = cov_num
             else:
-                prev_notes = merged_coverage_info[file_name]['notes'][line]
-                prev_verifier_assumptions = None
-                prev_verifier_op_stats = None
-                verifier_assumptions = None
-                verifier_op_stats = None
-                merged_verifier_assumptions = None
-                merged_verifier_op_stats = None
-
-                def split_multiple_notes(notes):
-                    verifier_op_stats, verifier_assumptions = notes.split('ms. ')
-                    return verifier_op_stats + 'ms', verifier_assumptions
-
-                if prev_notes['kind'] == 'Multiple notes':
-                    prev_verifier_op_stats, prev_verifier_assumptions = split_multiple_notes(prev_notes['text'])
-                elif prev_notes['kind'] == 'Verifier assumption':
-                    prev_verifier_assumptions = prev_notes['text']
-                else:
-                    prev_verifier_op_stats = prev_notes['text']
+                counters[line] += cov_num
+
+    @staticmethod
+    def __add_names_and_notes(covered_function_names, notes, new_covered_function_names, new_notes):
+        for cov_func_name in new_covered_function_names:
+            covered_function_names.setdefault(cov_func_name, None)
+
+        # Line numbers became strings after JSON encoding.
+        for line, note in new_notes.items():
+            line = int(line)
+            if line not in notes:
+                notes[line] = note
+            else:
+                notes[line] = merge_notes(notes[line], note)
 
-                if note['kind'] == 'Multiple notes':
-                    verifier_op_stats, verifier_assumptions = split_multiple_notes(note['text'])
-                elif note['kind'] == 'Verifier assumption':
-                    verifier_assumptions = note['text']
-                else:
-                    verifier_op_stats = note['text']
-
-                merged_verifier_op_stats = merge_verifier_op_stats(prev_verifier_op_stats, verifier_op_stats)
-                merged_verifier_assumptions = merge_verifier_assumptions(prev_verifier_assumptions,
-                                                                         verifier_assumptions)
-
-                if merged_verifier_assumptions and merged_verifier_op_stats:
-                    merged_coverage_info[file_name]['notes'][line] = {'kind': 'Multiple notes',
-                                                                      'text': merged_verifier_op_stats + '. ' + merged_verifier_assumptions}
-                elif merged_verifier_assumptions:
-                    merged_coverage_info[file_name]['notes'][line] = {'kind': 'Verifier assumption',
-                                                                      'text': merged_verifier_assumptions}
-                else:
-                    merged_coverage_info[file_name]['notes'][line] = {'kind': 'Verifier operation statistics',
-                                                                      'text': merged_verifier_op_stats}
 
 # For instance, merging:
 #     "1 stops for total time 14 ms"
@@ -253,29 +404,8 @@ def convert_coverage(merged_coverage_info, coverage_dir, pretty, src_files_info=
     }
 
     for file_name, file_coverage_info in merged_coverage_info.items():
-        file_coverage = {
-            'format': coverage_format_version,
-            'line coverage': file_coverage_info['covered lines'],
-            'function coverage': file_coverage_info['covered functions'],
-            'notes': file_coverage_info['notes']
-        }
-
-        os.makedirs(os.path.join(coverage_dir, os.path.dirname(file_name)), exist_ok=True)
-        with open(os.path.join(coverage_dir, file_name + '.cov.json'), 'w') as fp:
-            klever.core.utils.json_dump(file_coverage, fp, pretty)
-
-        coverage_stats['coverage statistics'][file_name] = [
-            # Total number of covered lines of code.
-            len([line_number for line_number, line_coverage in file_coverage_info['covered lines'].items()
-                 if line_coverage]),
-            # Total number of considered lines of code.
-            len(file_coverage_info['covered lines']),
-            # Total number of covered functions.
-            len([func_line_number for func_line_number, func_coverage in file_coverage_info['covered functions'].items()
-                 if func_coverage]),
-            # Total number of considered functions.
-            len(file_coverage_info['covered functions'])
-        ]
+        coverage_stats['coverage statistics'][file_name] = convert_file_coverage(file_name, file_coverage_info,
+                                                                                 coverage_dir, pretty)
 
     # Obtain most covered lines for code coverage of verification tasks.
     if not total:
@@ -301,6 +431,36 @@ def convert_coverage(merged_coverage_info, coverage_dir, pretty, src_files_info=
                     break
                 coverage_stats['most covered lines'].append(sorted_file_most_covered_lines[i][0])
 
+    save_coverage_stats(coverage_stats, coverage_dir, pretty, src_files_info)
+
+
+def convert_file_coverage(file_name, file_coverage_info, coverage_dir, pretty):
+    file_coverage = {
+        'format': coverage_format_version,
+        'line coverage': file_coverage_info['covered lines'],
+        'function coverage': file_coverage_info['covered functions'],
+        'notes': file_coverage_info['notes']
+    }
+
+    os.makedirs(os.path.join(coverage_dir, os.path.dirname(file_name)), exist_ok=True)
+    with open(os.path.join(coverage_dir, file_name + '.cov.json'), 'w') as fp:
+        klever.core.utils.json_dump(file_coverage, fp, pretty)
+
+    return [
+        # Total number of covered lines of code.
+        len([line_number for line_number, line_coverage in file_coverage_info['covered lines'].items()
+             if line_coverage]),
+        # Total number of considered lines of code.
+        len(file_coverage_info['covered lines']),
+        # Total number of covered functions.
+        len([func_line_number for func_line_number, func_coverage in file_coverage_info['covered functions'].items()
+             if func_coverage]),
+        # Total number of considered functions.
+        len(file_coverage_info['covered functions'])
+    ]
+
+
+def save_coverage_stats(coverage_stats, coverage_dir, pretty, src_files_info=None):
     if src_files_info:
         # Remove data for covered source files. It is out of interest, but we did not know these files earlier.
         for file_name in coverage_stats['coverage statistics']:
@@ -332,9 +492,40 @@ def convert_coverage(merged_coverage_info, coverage_dir, pretty, src_files_info=
         klever.core.utils.json_dump(coverage_stats, fp, pretty)
 
 
-class JCR(klever.core.components.Component):
+def collect_coverage_shard(in_queue, out_queue):
+    """
+    Accumulate code coverage of source files of the shard and convert it to the required format on demand.
+
+    :param in_queue: Queue with code coverage of source files of the shard and requests for converting it.
+    :param out_queue: Queue for coverage statistics of converted source files.
+    """
+    # Accumulated code coverage for each sub-job and requirement.
+    total_coverages = {}
+    while True:
+        message = in_queue.get()
+        if message is None:
+            break
+
+        kind, sub_job_id, data = message
+        if kind == 'add':
+            req_spec_id, coverage_info = data
+            total_coverages.setdefault(sub_job_id, {}).setdefault(req_spec_id, TotalCoverage()).add(coverage_info)
+        elif kind == 'convert':
+            pretty, total_coverage_dirs = data
+            coverage_stats = {}
+            for req_spec_id, total_coverage in total_coverages.pop(sub_job_id, {}).items():
+                coverage_stats[req_spec_id] = {}
+                for file_name in total_coverage.files:
+                    coverage_stats[req_spec_id][file_name] = convert_file_coverage(
+                        file_name, total_coverage.get_file_coverage_info(file_name),
+                        total_coverage_dirs[req_spec_id], pretty)
+
+            out_queue.put((sub_job_id, coverage_stats))
+        else:
+            raise NotImplementedError('Message of kind {!r} is not supported'.format(kind))
+
 
-    COVERAGE_FILE_NAME = "cached coverage.json"
+class JCR(klever.core.components.Component):
 
     def __init__(self, conf, logger, parent_id, mqs, vals, queues_to_terminate):
         super().__init__(conf, logger, parent_id, mqs, vals, separate_from_parent=False,
@@ -348,9 +539,18 @@ class JCR(klever.core.components.Component):
     def collect_total_coverage(self):
         self.logger.debug("Begin collecting coverage")
 
-        total_coverage_infos = {}
+        # Code coverage of each source file is accumulated by the only shard, so shards do not need to merge anything
+        # and they can convert code coverage in parallel. Here just coverage statistics from all shards is combined.
+        shards_num = klever.core.utils.get_parallel_threads_num(self.logger, self.conf, 'Results processing')
+        shard_queues = [multiprocessing.Queue() for _ in range(shards_num)]
+        coverage_stats_queue = multiprocessing.Queue()
+        shards = [multiprocessing.Process(target=collect_coverage_shard, args=(shard_queue, coverage_stats_queue))
+                  for shard_queue in shard_queues]
+        for shard in shards:
+            shard.start()
+
+        req_spec_ids = {}
         os.mkdir('total coverages')
-        counters = {}
         try:
             while True:
                 coverage_info = self.mqs['req spec ids and coverage info'].get()
@@ -365,44 +565,51 @@ class JCR(klever.core.components.Component):
                 self.logger.debug('Get coverage for sub-job %r', sub_job_id)
 
                 if 'coverage info' in coverage_info:
-                    if sub_job_id not in total_coverage_infos:
-                        total_coverage_infos[sub_job_id] = {}
                     req_spec_id = coverage_info['req spec id']
-                    total_coverage_infos[sub_job_id].setdefault(req_spec_id, {})
-
-                    loaded_coverage_info = coverage_info['coverage info']
-
-                    add_to_coverage(total_coverage_infos[sub_job_id][req_spec_id], loaded_coverage_info)
-                    del loaded_coverage_info
-
-                    counters.setdefault(sub_job_id, {})
-                    counters[sub_job_id].setdefault(req_spec_id, 0)
-                    counters[sub_job_id][req_spec_id] += 1
-                    if counters[sub_job_id][req_spec_id] >= 10:
-                        self.__read_data(total_coverage_infos, sub_job_id, req_spec_id)
-                        self.__save_data(total_coverage_infos, sub_job_id, req_spec_id)
-                        self.__clean_data(total_coverage_infos, sub_job_id, req_spec_id)
-                        counters[sub_job_id][req_spec_id] = 0
-                elif sub_job_id in total_coverage_infos:
+                    req_spec_ids.setdefault(sub_job_id, set()).add(req_spec_id)
+
+                    # Records of source files are passed to shards without decoding.
+                    shard_records = [[] for _ in range(shards_num)]
+                    for file_name, record in split_coverage_info(coverage_info['coverage info']):
+                        shard_records[self.__get_shard(file_name, shards_num)].append(record)
+
+                    for shard_queue, records in zip(shard_queues, shard_records):
+                        if records:
+                            shard_queue.put(('add', sub_job_id, (req_spec_id, join_coverage_info(records))))
+                elif sub_job_id in req_spec_ids:
                     self.logger.debug('Calculate total coverage for job %r', sub_job_id)
 
                     total_coverages = {}
-                    total_coverage_dirs = []
+                    total_coverage_dirs = {}
 
                     src_files_info = self.vals['coverage src info'][sub_job_id]
 
-                    for req_spec_id in counters[sub_job_id]:
-                        self.__read_data(total_coverage_infos, sub_job_id, req_spec_id)
-                        coverage_info = total_coverage_infos[sub_job_id][req_spec_id]
+                    for req_spec_id in req_spec_ids[sub_job_id]:
                         total_coverage_dir = os.path.join(self.__get_total_cov_dir(sub_job_id, req_spec_id), 'report')
-
-                        convert_coverage(coverage_info, total_coverage_dir, self.conf['keep intermediate files'],
-                                         src_files_info, total=True)
-                        total_coverage_dirs.append(total_coverage_dir)
-
+                        os.mkdir(total_coverage_dir)
+                        total_coverage_dirs[req_spec_id] = total_coverage_dir
+
+                    for shard_queue in shard_queues:
+                        shard_queue.put(('convert', sub_job_id,
+                                         (self.conf['keep intermediate files'], total_coverage_dirs)))
+
+                    coverage_stats = {
+                        req_spec_id: {
+                            'format': coverage_format_version,
+                            'coverage statistics': {},
+                            'data statistics': {}
+                        }
+                        for req_spec_id in total_coverage_dirs
+                    }
+                    for shard_coverage_stats in self.__get_shards_coverage_stats(shards, coverage_stats_queue,
+                                                                                 sub_job_id):
+                        for req_spec_id, files_coverage_stats in shard_coverage_stats.items():
+                            coverage_stats[req_spec_id]['coverage statistics'].update(files_coverage_stats)
+
+                    for req_spec_id, total_coverage_dir in total_coverage_dirs.items():
+                        save_coverage_stats(coverage_stats[req_spec_id], total_coverage_dir,
+                                            self.conf['keep intermediate files'], src_files_info)
                         total_coverages[req_spec_id] = klever.core.utils.ArchiveFiles([total_coverage_dir])
-                        self.__save_data(total_coverage_infos, sub_job_id, req_spec_id)
-                        self.__clean_data(total_coverage_infos, sub_job_id, req_spec_id)
 
                     del self.vals['coverage src info'][sub_job_id]
 
@@ -427,10 +634,10 @@ class JCR(klever.core.components.Component):
                                  },
                                  os.path.join('total coverages', sub_job_id))
 
-                    del total_coverage_infos[sub_job_id]
+                    del req_spec_ids[sub_job_id]
 
                     if not self.conf['keep intermediate files']:
-                        for total_coverage_dir in total_coverage_dirs:
+                        for total_coverage_dir in total_coverage_dirs.values():
                             shutil.rmtree(total_coverage_dir, ignore_errors=True)
 
                     self.vals['coverage_finished'][sub_job_id] = True
@@ -439,6 +646,11 @@ class JCR(klever.core.components.Component):
             for sub_job_id in self.vals['coverage_finished'].keys():
                 self.vals['coverage_finished'][sub_job_id] = True
 
+            for shard_queue in shard_queues:
+                shard_queue.put(None)
+            for shard in shards:
+                shard.join()
+
         self.logger.info("Finish coverage reporting")
 
         # Clean
@@ -447,6 +659,27 @@ class JCR(klever.core.components.Component):
 
     main = collect_total_coverage
 
+    @staticmethod
+    def __get_shard(file_name, shards_num):
+        # Do not use hash() since it is randomized for strings.
+        return zlib.crc32(file_name.encode('utf-8')) % shards_num
+
+    def __get_shards_coverage_stats(self, shards, coverage_stats_queue, sub_job_id):
+        for _ in shards:
+            while True:
+                try:
+                    shard_sub_job_id, shard_coverage_stats = coverage_stats_queue.get(timeout=1)
+                    break
+                except queue.Empty:
+                    if not all(shard.is_alive() for shard in shards):
+                        raise RuntimeError('Some code coverage shard failed') from None
+
+            if shard_sub_job_id != sub_job_id:
+                raise RuntimeError('Expect code coverage statistics for sub-job {!r} but got it for sub-job {!r}'
+                                   .format(sub_job_id, shard_sub_job_id))
+
+            yield shard_coverage_stats
+
     def __get_total_cov_dir(self, sub_job_id, requirement):
         total_coverage_dir = os.path.join('total coverages', sub_job_id, re.sub(r'/', '-', requirement))
 
@@ -455,49 +688,6 @@ class JCR(klever.core.components.Component):
 
         return total_coverage_dir
 
-    def __read_data(self, cache, sub_job_id, requirement):
-        file_name = os.path.join(self.__get_total_cov_dir(sub_job_id, requirement), self.COVERAGE_FILE_NAME)
-
-        if os.path.isfile(file_name):
-            with open(file_name, 'r', encoding='utf-8') as fp:
-                large_cache = json.load(fp)
-        else:
-            large_cache = {}
-
-        cache.setdefault(sub_job_id, {})
-        cache[sub_job_id].setdefault(requirement, {})
-
-        for file_name in large_cache:
-            # todo: This code is close to function add_to_coverage
-            cache[sub_job_id][requirement].setdefault(file_name, {
-                'total functions': large_cache[file_name]['total functions'],
-                'covered lines': {},
-                'covered functions': {},
-                'covered function names': [],
-                'notes': {}
-            })
-
-            for path in ('covered lines', 'covered functions'):
-                for line, value in large_cache[file_name][path].items():
-                    if isinstance(line, str):
-                        line = int(line)
-                    cache[sub_job_id][requirement][file_name][path].setdefault(line, 0)
-                    cache[sub_job_id][requirement][file_name][path][line] += value
-            if large_cache[file_name].get('covered function names'):
-                for name in large_cache[file_name]['covered function names']:
-                    if name not in cache[sub_job_id][requirement][file_name]['covered function names']:
-                        cache[sub_job_id][requirement][file_name]['covered function names'].append(name)
-
-    def __save_data(self, cache, sub_job_id, requirement):
-        file_name = os.path.join(self.__get_total_cov_dir(sub_job_id, requirement), self.COVERAGE_FILE_NAME)
-        cache.setdefault(sub_job_id, {})
-        cache[sub_job_id].setdefault(requirement, {})
-        with open(file_name, 'w', encoding='utf-8') as fp:
-            json.dump(cache[sub_job_id][requirement], fp)
-
-    def __clean_data(self, cache, job_id, requirement):
-        cache[job_id].pop(requirement, None)
-
 
 class LCOV:
     FILENAME_PREFIX = "SF:"
@@ -532,16 +722,17 @@ class LCOV:
         # Import coverage
         try:
             coverage_info = self.parse()
+            compact_coverage_info = dump_coverage_info(coverage_info) if coverage_info else None
 
-            if self.keep_intermediate_files:
-                with open(self.coverage_id, 'w', encoding='utf-8') as fp:
-                    klever.core.utils.json_dump(coverage_info, fp, True)
+            if self.keep_intermediate_files and compact_coverage_info:
+                with open(self.coverage_id, 'wb') as fp:
+                    fp.write(compact_coverage_info)
 
             convert_coverage(coverage_info, 'coverage', self.keep_intermediate_files)
         except Exception as exception:
             shutil.rmtree('coverage', ignore_errors=True)
             raise exception
-        return coverage_info
+        return compact_coverage_info
 
     def parse(self):
         # Parse coverage file.
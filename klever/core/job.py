@@ -738,7 +738,8 @@ class Job(klever.core.components.Component):
         # any changes in meta.
         src_id += '-' + klever.core.utils.get_file_name_checksum(json.dumps(self.clade.get_meta()))[:12]
 
-        session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
+        session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'],
+                                              self.vals)
 
         if session.check_original_sources(src_id):
             self.logger.info('Original sources were uploaded already')
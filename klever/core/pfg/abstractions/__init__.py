@@ -19,11 +19,14 @@ import os
 import glob
 
 from klever.core.utils import make_relative_path
+from klever.core.pfg.abstractions.callgraph_repr import CallGraph
 from klever.core.pfg.abstractions.files_repr import File
 from klever.core.pfg.abstractions.fragments_repr import Fragment
 
 
 class Program:
+    # Number of files which callgraph and function definitions are loaded from the build base at once.
+    CALLGRAPH_BATCH_SIZE = 1000
 
     def __init__(self, logger, clade, source_paths, memory_efficient_mode=False, skip_missing_files=False):
         """
@@ -33,7 +36,7 @@ class Program:
         :param logger: Logger object.
         :param clade: Clade object.
         :param source_paths: Iterable with paths to source code.
-        :param memory_efficient_mode: Can we build a call graph?
+        :param memory_efficient_mode: Do not extract dependencies between files from the call graph.
         :param skip_missing_files: Tolerate errors when a CC input file is missing.
         """
         self.logger = logger
@@ -41,11 +44,12 @@ class Program:
         self.source_paths = source_paths
         self._files = {}
         self._fragments = {}
+        # Reverse index of file names to fragments that contain them
+        self._files_fragments = {}
         self.__divide(skip_missing_files)
+        self.callgraph = CallGraph(sorted(self._files))
         if not memory_efficient_mode:
             self.logger.info("Extract dependencies between files from the program callgraph")
-            # This is very memory inefficient operation, so for Linux this is an optional step to prevent consuming
-            # gigabytes of memory
             self.__establish_dependencies()
 
     def create_fragment(self, name, files, add=False):
@@ -70,6 +74,8 @@ class Program:
     def add_fragment(self, fragment):
         if fragment.name not in self._fragments:
             self._fragments[fragment.name] = fragment
+            fragment.program = self
+            self.update_fragment_files(fragment, fragment.files, ())
         else:
             if not self._fragments[fragment.name].files.symmetric_difference(fragment.files):
                 self.logger.warning("There are several equal fragments {!r} extracted, keep only one".
@@ -177,7 +183,26 @@ class Program:
         if name not in self._fragments:
             raise ValueError("Cannot remove already missing fragment {!r}".format(fragment.name))
 
-        del self._fragments[name]
+        fragment = self._fragments.pop(name)
+        self.update_fragment_files(fragment, (), fragment.files)
+        fragment.program = None
+
+    def update_fragment_files(self, fragment, added, removed):
+        """
+        Update the reverse index of files to fragments. Fragments call it on their own when their files are changed.
+
+        :param fragment: Fragment object.
+        :param added: File objects added to the fragment.
+        :param removed: File objects removed from the fragment.
+        """
+        for file in added:
+            self._files_fragments.setdefault(file.name, set()).add(fragment)
+        for file in removed:
+            fragments = self._files_fragments.get(file.name)
+            if fragments:
+                fragments.discard(fragment)
+                if not fragments:
+                    del self._files_fragments[file.name]
 
     @property
     def files(self):
@@ -344,11 +369,8 @@ class Program:
         :return: Set of Fragment objects.
         """
         frags = set()
-        files = {f if isinstance(f, str) else f.name for f in files}
-        if files:
-            for frag in self.fragments:
-                if {f.name for f in frag.files}.intersection(files):
-                    frags.add(frag)
+        for file in files:
+            frags.update(self._files_fragments.get(file if isinstance(file, str) else file.name, ()))
         return frags
 
     def get_files_calling_functions(self, functions):
@@ -359,10 +381,8 @@ class Program:
         :return: File objects.
         """
         files = set()
-        if functions:
-            for file in self.files:
-                if set(file.import_functions.keys()).intersection(functions):
-                    files.add(file)
+        for function in functions:
+            files.update(self._files[name] for name in self.callgraph.get_callers(function))
         return files
 
     def collect_dependencies(self, files, filter_func=lambda x: True, depth=None, max_files=None):
@@ -434,36 +454,41 @@ class Program:
     def __establish_dependencies(self):
         """
         Analyze the callgraph of the program and add to each File object function names that are exported and function
-        names that are imported with links to File objects that export these functions. This function requires an
-        extremely huge amount of memory if the program is very big. This is because the callgraph itself can be quite
-        large.
+        names that are imported with links to File objects that export these functions. The callgraph of the whole
+        program can be extremely large, so it is loaded by batches of files and kept in the compact form.
         """
-        cg = self.clade.callgraph
-        fs = self.clade.functions_by_file
+        files = sorted(self._files)
+        batches = [files[i:i + self.CALLGRAPH_BATCH_SIZE] for i in range(0, len(files), self.CALLGRAPH_BATCH_SIZE)]
+
+        # Collect definitions of global functions first since only calls of them are dependencies
+        for batch in batches:
+            fs = self.clade.get_functions_by_file(batch, add_unknown=False)
+            for path, functions in ((p, f) for p, f in fs.items() if p in self._files):
+                for func, func_desc in functions.items():
+                    if func_desc.get('type', 'static') != 'static':
+                        self.callgraph.add_definition(path, func)
 
         # Fulfil callgraph dependencies
-        for path, functions in ((p, f) for p, f in cg.items() if p in self._files):
-            file_repr = self._files[path]
-            for func, func_desc in functions.items():
-                tp = func_desc.get('type', 'static')
-                if tp != 'static':
-                    file_repr.add_export_function(func)
-
-                for called_definition_scope, called_functions in \
-                        ((s, d) for s, d in func_desc.get('calls', {}).items()
-                         if s != path and s != 'unknown' and s in self._files):
-                    called_definition_file = self._files[called_definition_scope]
-                    # Beware of such bugs in callgraph
-                    for called_function in (c for c in called_functions
-                                            if fs.get(called_definition_scope, {}).get(c, {}).
-                                            get('type', 'static') != 'static'):
-                        match_score = list(called_functions[called_function].values())[0]["match_type"]
-                        file_repr.add_import_function(called_function, called_definition_file, match_score)
+        for batch in batches:
+            cg = self.clade.get_callgraph(batch, add_unknown=False)
+            for path, functions in ((p, f) for p, f in cg.items() if p in self._files):
+                file_repr = self._files[path]
+                for func, func_desc in functions.items():
+                    tp = func_desc.get('type', 'static')
+                    if tp != 'static':
+                        file_repr.add_export_function(func)
+
+                    for called_definition_scope, called_functions in \
+                            ((s, d) for s, d in func_desc.get('calls', {}).items()
+                             if s != path and s != 'unknown' and s in self._files):
+                        called_definition_file = self._files[called_definition_scope]
+                        # Beware of such bugs in callgraph
+                        for called_function in (c for c in called_functions
+                                                if self.callgraph.is_defined(called_definition_scope, c)):
+                            match_score = list(called_functions[called_function].values())[0]["match_type"]
+                            file_repr.add_import_function(called_function, called_definition_file, match_score)
+                            self.callgraph.add_call(path, called_definition_scope, called_function)
 
         # Add rest global functions
-        for path, functions in ((p, f) for p, f in fs.items() if p in self._files):
-            file_repr = self._files[path]
-            for func, func_desc in functions.items():
-                tp = func_desc.get('type', 'static')
-                if tp != 'static':
-                    file_repr.add_export_function(func)
+        for path, func in self.callgraph.definitions:
+            self._files[path].add_export_function(func)
@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import bisect
+from array import array
+
+
+class CallGraph:
+    """
+    Compact representation of calls of global functions between files. Files and functions are replaced with integer
+    identifiers and calls and definitions are kept in arrays, so even the callgraph of Linux takes tens of megabytes.
+    """
+
+    def __init__(self, files):
+        """
+        Create an empty callgraph.
+
+        :param files: Names of files.
+        """
+        self._files = list(files)
+        self._file_ids = {name: i for i, name in enumerate(self._files)}
+        self._functions = []
+        self._function_ids = {}
+
+        # Definitions of global functions as (file identifier << 32 | function identifier) in the order of addition
+        self._definitions = array('Q')
+        self._sorted_definitions = None
+
+        # Calls as triples of arrays (caller file, definition file, function)
+        self._callers = array('I')
+        self._callees = array('I')
+        self._called_functions = array('I')
+
+        # Callers of each function as offsets into the array of caller files sorted by functions
+        self._function_offsets = None
+        self._function_callers = None
+
+    def __len__(self):
+        return len(self._callers)
+
+    def __function_id(self, function, add=False):
+        function_id = self._function_ids.get(function)
+        if function_id is None and add:
+            function_id = len(self._functions)
+            self._function_ids[function] = function_id
+            self._functions.append(function)
+        return function_id
+
+    def add_definition(self, file, function):
+        """
+        Add a definition of the global function.
+
+        :param file: File name.
+        :param function: Function name.
+        """
+        self._definitions.append(self._file_ids[file] << 32 | self.__function_id(function, add=True))
+        self._sorted_definitions = None
+
+    def is_defined(self, file, function):
+        """
+        Check that the file defines the global function.
+
+        :param file: File name.
+        :param function: Function name.
+        :return: Bool.
+        """
+        function_id = self.__function_id(function)
+        if function_id is None or file not in self._file_ids:
+            return False
+
+        if self._sorted_definitions is None:
+            self._sorted_definitions = array('Q', sorted(self._definitions))
+        key = self._file_ids[file] << 32 | function_id
+        i = bisect.bisect_left(self._sorted_definitions, key)
+        return i < len(self._sorted_definitions) and self._sorted_definitions[i] == key
+
+    @property
+    def definitions(self):
+        """Iterate over pairs (file name, function name) of definitions of global functions in the order of addition."""
+        for key in self._definitions:
+            yield self._files[key >> 32], self._functions[key & 0xFFFFFFFF]
+
+    def add_call(self, caller, callee, function):
+        """
+        Add a call of the global function.
+
+        :param caller: Name of the file that calls the function.
+        :param callee: Name of the file that defines the function.
+        :param function: Function name.
+        """
+        self._callers.append(self._file_ids[caller])
+        self._callees.append(self._file_ids[callee])
+        self._called_functions.append(self.__function_id(function, add=True))
+        self._function_offsets = None
+
+    @property
+    def calls(self):
+        """Iterate over triples (caller file name, definition file name, function name) of calls."""
+        for caller, callee, function in zip(self._callers, self._callees, self._called_functions):
+            yield self._files[caller], self._files[callee], self._functions[function]
+
+    def get_callers(self, function):
+        """
+        Get files that call the global function.
+
+        :param function: Function name.
+        :return: Set of file names.
+        """
+        function_id = self.__function_id(function)
+        if function_id is None:
+            return set()
+
+        if self._function_offsets is None:
+            self.__index_callers()
+        return {self._files[caller] for caller in
+                self._function_callers[self._function_offsets[function_id]:self._function_offsets[function_id + 1]]}
+
+    def __index_callers(self):
+        # Counting sort of caller files by called functions
+        self._function_offsets = array('I', bytes(4 * (len(self._functions) + 1)))
+        for function_id in self._called_functions:
+            self._function_offsets[function_id + 1] += 1
+        for function_id in range(len(self._functions)):
+            self._function_offsets[function_id + 1] += self._function_offsets[function_id]
+
+        positions = array('I', self._function_offsets[:-1])
+        self._function_callers = array('I', bytes(4 * len(self._callers)))
+        for caller, function_id in zip(self._callers, self._called_functions):
+            self._function_callers[positions[function_id]] = caller
+            positions[function_id] += 1
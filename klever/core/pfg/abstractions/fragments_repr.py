@@ -16,6 +16,86 @@
 #
 
 
+class FragmentFiles(set):
+    """
+    Set of files of a fragment that notifies the program about changes, so that it can maintain the reverse index of
+    files to fragments.
+    """
+
+    def __init__(self, fragment, files=()):
+        super().__init__(files)
+        self.fragment = fragment
+
+    def __notify(self, added, removed):
+        program = self.fragment.program
+        if program and (added or removed):
+            program.update_fragment_files(self.fragment, added, removed)
+
+    def add(self, file):
+        if file not in self:
+            super().add(file)
+            self.__notify({file}, ())
+
+    def remove(self, file):
+        super().remove(file)
+        self.__notify((), {file})
+
+    def discard(self, file):
+        if file in self:
+            super().discard(file)
+            self.__notify((), {file})
+
+    def pop(self):
+        file = super().pop()
+        self.__notify((), {file})
+        return file
+
+    def clear(self):
+        removed = set(self)
+        super().clear()
+        self.__notify((), removed)
+
+    def update(self, *others):
+        added = {f for other in others for f in other if f not in self}
+        super().update(added)
+        self.__notify(added, ())
+
+    def difference_update(self, *others):
+        removed = {f for other in others for f in other if f in self}
+        super().difference_update(removed)
+        self.__notify((), removed)
+
+    def intersection_update(self, *others):
+        kept = set(self).intersection(*others)
+        removed = set(self).difference(kept)
+        super().difference_update(removed)
+        self.__notify((), removed)
+
+    def symmetric_difference_update(self, other):
+        other = set(other)
+        removed = set(self).intersection(other)
+        added = other.difference(removed)
+        super().difference_update(removed)
+        super().update(added)
+        self.__notify(added, removed)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+
 class Fragment:
     """Represent a program fragment - a set of files."""
 
@@ -28,8 +108,11 @@ class Fragment:
         # Identifier
         self.name = identifier
 
+        # Program which collection contains the fragment
+        self.program = None
+
         # Description of the module content
-        self.files = set()
+        self._files = FragmentFiles(self)
 
     def __lt__(self, other):
         return self.name < other.id
@@ -49,6 +132,16 @@ class Fragment:
     def __cmp__(self, rhs):
         return self.name.__cmp__(rhs.name)
 
+    @property
+    def files(self):
+        return self._files
+
+    @files.setter
+    def files(self, files):
+        files = set(files)
+        self._files.intersection_update(files)
+        self._files.update(files)
+
     @property
     def unique_files(self):
         return set(f for f in self.files if f.unique)
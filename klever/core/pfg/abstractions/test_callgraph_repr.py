@@ -0,0 +1,62 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from klever.core.pfg.abstractions.callgraph_repr import CallGraph
+
+
+def test_definitions():
+    callgraph = CallGraph(['a.c', 'b.c', 'c.c'])
+    callgraph.add_definition('b.c', 'g')
+    callgraph.add_definition('a.c', 'f')
+    assert callgraph.is_defined('a.c', 'f')
+    assert callgraph.is_defined('b.c', 'g')
+    assert not callgraph.is_defined('a.c', 'g')
+    assert not callgraph.is_defined('a.c', 'h')
+    assert not callgraph.is_defined('d.c', 'f')
+
+    # Definitions added after lookups are visible as well
+    callgraph.add_definition('c.c', 'g')
+    assert callgraph.is_defined('c.c', 'g')
+    assert list(callgraph.definitions) == [('b.c', 'g'), ('a.c', 'f'), ('c.c', 'g')]
+
+
+def test_callers():
+    callgraph = CallGraph(['a.c', 'b.c', 'c.c'])
+    assert callgraph.get_callers('f') == set()
+
+    callgraph.add_definition('a.c', 'f')
+    callgraph.add_call('b.c', 'a.c', 'f')
+    assert callgraph.get_callers('f') == {'b.c'}
+
+    # Calls and definitions added after lookups invalidate the index of callers
+    callgraph.add_definition('b.c', 'g')
+    callgraph.add_call('c.c', 'b.c', 'g')
+    callgraph.add_call('c.c', 'a.c', 'f')
+    callgraph.add_call('a.c', 'b.c', 'g')
+    assert callgraph.get_callers('f') == {'b.c', 'c.c'}
+    assert callgraph.get_callers('g') == {'a.c', 'c.c'}
+    assert callgraph.get_callers('h') == set()
+
+    # Functions that are called but never defined are known as well
+    callgraph.add_call('a.c', 'c.c', 'h')
+    assert callgraph.get_callers('h') == {'a.c'}
+    assert not callgraph.is_defined('c.c', 'h')
+
+    assert len(callgraph) == 5
+    assert list(callgraph.calls) == [('b.c', 'a.c', 'f'), ('c.c', 'b.c', 'g'), ('c.c', 'a.c', 'f'),
+                                     ('a.c', 'b.c', 'g'), ('a.c', 'c.c', 'h')]
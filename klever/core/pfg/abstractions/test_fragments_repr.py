@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import logging
+
+import pytest
+
+from klever.core.pfg.abstractions import Program
+from klever.core.pfg.abstractions.files_repr import File
+
+
+@pytest.fixture()
+def program():
+    # Do not divide the program into files with Clade, the reverse index of fragments does not depend on that
+    program = Program.__new__(Program)
+    program.logger = logging.getLogger('test')
+    program._files = {name: File(name) for name in ('a.c', 'b.c', 'c.c', 'd.c')}
+    program._fragments = {}
+    program._files_fragments = {}
+    return program
+
+
+def files_fragments(program):
+    return {name: {fragment.name for fragment in fragments}
+            for name, fragments in program._files_fragments.items()}
+
+
+def test_create_remove(program):
+    a, b, c, _ = (program._files[name] for name in sorted(program._files))
+    program.create_fragment('x', {a, b}, add=True)
+    program.create_fragment('y', {b, c}, add=True)
+    # Fragments that are not added to the program do not change the index
+    program.create_fragment('z', {a, c})
+    assert files_fragments(program) == {'a.c': {'x'}, 'b.c': {'x', 'y'}, 'c.c': {'y'}}
+    assert {f.name for f in program.get_fragments_with_files(['b.c', c])} == {'x', 'y'}
+
+    program.remove_fragment('x')
+    assert files_fragments(program) == {'b.c': {'y'}, 'c.c': {'y'}}
+    assert not program.get_fragments_with_files([a])
+
+    # Removed fragments do not notify the program anymore
+    fragment = program.get_fragment('y')
+    program.remove_fragment(fragment)
+    fragment.files.add(a)
+    assert not files_fragments(program)
+
+
+def test_update(program):
+    a, b, c, d = (program._files[name] for name in sorted(program._files))
+    fragment = program.create_fragment('x', {a}, add=True)
+
+    fragment.files.update({b}, [c])
+    assert files_fragments(program) == {'a.c': {'x'}, 'b.c': {'x'}, 'c.c': {'x'}}
+
+    fragment.files -= {a, d}
+    assert files_fragments(program) == {'b.c': {'x'}, 'c.c': {'x'}}
+
+    fragment.files &= {c, d}
+    assert files_fragments(program) == {'c.c': {'x'}}
+
+    fragment.files |= {a}
+    fragment.files.discard(c)
+    assert files_fragments(program) == {'a.c': {'x'}}
+
+    fragment.files ^= {a, d}
+    assert files_fragments(program) == {'d.c': {'x'}}
+    assert fragment.files == {d}
+
+
+def test_assign(program):
+    a, b, c, d = (program._files[name] for name in sorted(program._files))
+    fragment = program.create_fragment('x', {a, b}, add=True)
+    program.create_fragment('y', {b}, add=True)
+
+    fragment.files = {b, c, d}
+    assert files_fragments(program) == {'b.c': {'x', 'y'}, 'c.c': {'x'}, 'd.c': {'x'}}
+    assert fragment.files == {b, c, d}
+
+    fragment.files = set()
+    assert files_fragments(program) == {'b.c': {'y'}}
+    assert not fragment.files
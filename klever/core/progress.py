@@ -34,7 +34,8 @@ class PW(klever.core.components.Component):
         self.vals['task solving flag'] = self.first_task_flag
         self.subjobs = multiprocessing.Manager().dict()
         self.vals['subjobs progress'] = self.subjobs
-        self.session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
+        self.session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'],
+                                                   self.vals)
         if total_subjobs >= 0:
             self.subjobs_number = total_subjobs
             self.job_mode = False
@@ -0,0 +1,117 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+from klever.core.solutions_store import clone_file
+
+# Attributes of verification task descriptions that do not influence verification results.
+VOLATILE_TASK_DESC_ATTRS = ('id', 'job id', 'priority', 'upload verifier input files', 'additional sources',
+                            'solutions storage')
+
+
+class ResultsCache:
+    """
+    Content addressed storage of decision results of verification tasks. It can be shared by different jobs, so
+    verification tasks that did not change since previous runs are not solved again.
+    """
+
+    def __init__(self, logger, cache_dir):
+        self.logger = logger
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def get_key(task_desc, task_archive):
+        """
+        Calculate the key of the verification task on the basis of its description including verifier name, version
+        and resource limits and contents of its files. Benchmark definition with verifier options is among these files.
+
+        :param task_desc: Verification task description.
+        :param task_archive: Path to the archive with verification task files.
+        :return: Hex digest.
+        """
+        key = hashlib.sha256()
+        key.update(json.dumps({attr: val for attr, val in task_desc.items() if attr not in VOLATILE_TASK_DESC_ATTRS},
+                              sort_keys=True).encode('utf-8'))
+
+        # Do not take into account ZIP metadata like modification times which differ from run to run.
+        with zipfile.ZipFile(task_archive) as zfp:
+            for name in sorted(zfp.namelist()):
+                key.update(name.encode('utf-8'))
+                key.update(b'\0')
+                with zfp.open(name) as fp:
+                    for chunk in iter(functools.partial(fp.read, 1024 * 1024), b''):
+                        key.update(chunk)
+                key.update(b'\0')
+
+        return key.hexdigest()
+
+    def __get_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.zip')
+
+    def get(self, key, archive=None):
+        """
+        Get decision results of the verification task.
+
+        :param key: Key of the verification task.
+        :param archive: Path where the archive with decision results should be placed. Entries can be removed from the
+                        cache at any moment, so use this to keep results that will be processed later.
+        :return: Path to the archive with decision results or None if there are no results in the cache.
+        """
+        path = self.__get_path(key)
+        try:
+            if archive:
+                if os.path.exists(archive):
+                    os.remove(archive)
+                clone_file(path, archive)
+            elif not os.path.isfile(path):
+                return None
+        except FileNotFoundError:
+            return None
+
+        self.logger.info('Found cached decision results "%s"', path)
+        return archive or path
+
+    def put(self, key, archive):
+        """
+        Save decision results of the verification task.
+
+        :param key: Key of the verification task.
+        :param archive: Path to the archive with decision results.
+        :return: None
+        """
+        path = self.__get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Several jobs can share the cache, so never expose partially written archives.
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as fp, open(archive, 'rb') as archive_fp:
+                shutil.copyfileobj(archive_fp, fp)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.logger.info('Cache decision results as "%s"', path)
@@ -15,11 +15,23 @@
 # limitations under the License.
 #
 
+import io
 import json
 import os
+import random
+import re
+import tarfile
+import tempfile
 import time
 import zipfile
 import requests
+import requests.adapters
+
+from klever.core.solutions_store import BUFFER_SIZE
+
+# HTTP sessions and request latencies are kept per process since connections can not be shared by forked processes.
+_HTTP_SESSIONS = {}
+_LATENCIES = {}
 
 
 class UnexpectedStatusCode(IOError):
@@ -32,7 +44,15 @@ class BridgeError(IOError):
 
 # TODO: it would be better to name it BridgeRequests. This is the case for Scheduler and CLI.
 class Session:
-    def __init__(self, logger, bridge, job_id):
+    # Report file archives are ZIP archives already, so there is no much sense to compress reports bundles harder
+    BUNDLE_COMPRESS_LEVEL = 6
+    # Keep alive this number of connections to Bridge within each process.
+    POOL_SIZE = 4
+    # Initial and maximum delays in seconds between attempts to send requests when Bridge is not available.
+    RETRY_DELAY = 0.2
+    MAX_RETRY_DELAY = 30
+
+    def __init__(self, logger, bridge, job_id, vals=None):
         logger.info('Create session for user "{0}" at Klever Bridge "{1}"'.format(bridge['user'], bridge['name']))
 
         self.logger = logger
@@ -46,16 +66,60 @@ class Session:
             'password': bridge['password']
         }
 
-        # Sign in.
-        self.__signin()
+        # Token can be shared by all Core processes, so they do not need to get it each time.
+        self.__shared_data = vals.get('bridge session') if vals else None
+
+        # Reuse connections to Bridge that were established by other sessions of the same process.
+        session_key = (os.getpid(), self.name, bridge['user'])
+        if session_key not in _HTTP_SESSIONS:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.POOL_SIZE)
+            session.mount('http://', adapter)
+            _HTTP_SESSIONS[session_key] = session
+        self.session = _HTTP_SESSIONS[session_key]
+
+        if 'Authorization' not in self.session.headers:
+            token = self.__shared_data.get('token') if self.__shared_data is not None else None
+            if token:
+                self.session.headers.update({'Authorization': 'Token {}'.format(token)})
+                self.logger.debug('Session was created with shared token')
+            else:
+                # Sign in.
+                self.__signin()
 
     # TODO: It is not signing in anymore. It is getting token. This is the case for Scheduler and CLI.
     def __signin(self):
-        self.session = requests.Session()
+        self.session.headers.pop('Authorization', None)
         resp = self.__request('service/get_token/', 'POST', data=self.__parameters)
-        self.session.headers.update({'Authorization': 'Token {}'.format(resp.json()['token'])})
+        token = resp.json()['token']
+        self.session.headers.update({'Authorization': 'Token {}'.format(token)})
+        if self.__shared_data is not None:
+            self.__shared_data['token'] = token
         self.logger.debug('Session was created')
 
+    @staticmethod
+    def get_latencies():
+        """
+        Get latencies of requests to Bridge sent by all sessions of the current process.
+
+        :return: Dictionary mapping endpoints like "GET service/tasks/<id>/" to the number of requests, the total and
+                 the maximum latency in seconds.
+        """
+        return {endpoint: tuple(latencies) for endpoint, latencies in _LATENCIES.get(os.getpid(), {}).items()}
+
+    def log_latencies(self):
+        for endpoint, (requests_num, total_latency, max_latency) in sorted(self.get_latencies().items()):
+            self.logger.info('Sent %d "%s" requests with average latency %.3f s and maximum latency %.3f s',
+                             requests_num, endpoint, total_latency / requests_num, max_latency)
+
+    @staticmethod
+    def __get_endpoint(method, path_url):
+        # Do not distinguish requests that differ just by identifiers and query parameters.
+        path = path_url.split('?')[0]
+        path = re.sub(r'/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}', '/<id>', path)
+        path = re.sub(r'/\d+', '/<id>', path)
+        return '{0} {1}'.format(method, path)
+
     def __request(self, path_url, method, **kwargs):
         url = 'http://' + self.name + '/' + path_url
 
@@ -63,9 +127,28 @@ class Session:
 
         self.logger.debug('Send "{0}" request to "{1}"'.format(method, url))
 
+        endpoint = self.__get_endpoint(method, path_url)
+        attempt = 0
+        signed_in = False
         while True:
             try:
+                start_time = time.time()
                 resp = self.session.request(method, url, **kwargs)
+                latency = time.time() - start_time
+                latencies = _LATENCIES.setdefault(os.getpid(), {}).setdefault(endpoint, [0, 0.0, 0.0])
+                latencies[0] += 1
+                latencies[1] += latency
+                latencies[2] = max(latencies[2], latency)
+
+                # Shared token can become invalid, so get a new one and repeat the request. Do this just once since
+                # Bridge can reject new tokens as well, e.g. for removed users.
+                if resp.status_code == 401 and path_url != 'service/get_token/' and not signed_in:
+                    resp.close()
+                    self.logger.warning('Token is not valid anymore, get a new one')
+                    self.__signin()
+                    signed_in = True
+                    self.__rewind_files(kwargs)
+                    continue
 
                 if resp.status_code not in (200, 201, 204):
                     if resp.headers['content-type'] == 'application/json':
@@ -83,7 +166,23 @@ class Session:
                 return resp
             except requests.ConnectionError:
                 self.logger.warning('Could not send "{0}" request to "{1}"'.format(method, url))
-                time.sleep(0.2)
+                # Use exponential backoff with full jitter, so that many processes do not retry simultaneously.
+                time.sleep(random.uniform(0, min(self.MAX_RETRY_DELAY, self.RETRY_DELAY * 2 ** attempt)))
+                attempt += 1
+                self.__rewind_files(kwargs)
+
+    @staticmethod
+    def __rewind_files(kwargs):
+        # Files can be read partially or completely by previous attempts to send the request.
+        files = kwargs.get('files')
+        if not files:
+            return
+
+        for file in files.values() if isinstance(files, dict) else (file for _, file in files):
+            if isinstance(file, tuple):
+                file = file[1]
+            if hasattr(file, 'seek'):
+                file.seek(0)
 
     def start_job_decision(self, job_format, archive):
         self.__download_archive('job', 'jobs/api/download-files/' + self.job_id,
@@ -109,6 +208,22 @@ class Session:
         resp = self.__request('service/tasks/?job={}&fields=status&fields=id'.format(self.job_id), method='GET')
         return resp.json()
 
+    def get_tasks_statuses_changes(self, cursor=None, timeout=0):
+        """
+        Get statuses of tasks that were changed after the given cursor. Bridge waits for changes up to the given
+        timeout, so this request blocks rather than returns empty results.
+
+        :param cursor: Cursor returned by the previous call or None to get statuses of all tasks.
+        :param timeout: Seconds to wait for changes.
+        :return: A new cursor and a list of changed tasks statuses.
+        """
+        params = {'timeout': timeout}
+        if cursor is not None:
+            params['cursor'] = cursor
+        resp = self.__request('service/tasks-statuses/{}/'.format(self.job_id), method='GET', params=params)
+        data = resp.json()
+        return data['cursor'], data['tasks']
+
     def get_task_error(self, task_id):
         resp = self.__request('service/tasks/{}/?fields=error'.format(task_id), method='GET')
         return resp.json()['error']
@@ -126,34 +241,37 @@ class Session:
                                {'archive': src_archive})
 
     def upload_reports_and_report_file_archives(self, reports_and_report_file_archives, keep_reports):
+        # Reports are kept serialized as they are passed in memory, so just join them into the single JSON array.
         batch_reports = []
         batch_report_file_archives = []
         image_reports = []
+        task_ids = []
         for report_and_report_file_archives in reports_and_report_file_archives:
-            with open(report_and_report_file_archives['report file'], encoding='utf-8') as fp:
-                report = json.load(fp)
+            if 'report' in report_and_report_file_archives:
+                batch_reports.append(report_and_report_file_archives['report'])
+            else:
+                with open(report_and_report_file_archives['report file'], encoding='utf-8') as fp:
+                    report = json.load(fp)
                 if report['type'] == 'image':
                     image_reports.append(report)
-                else:
-                    batch_reports.append(report)
+                    continue
+                batch_reports.append(json.dumps(report, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+                if 'task identifier' in report:
+                    task_ids.append(report['task identifier'])
+
+            if 'task identifier' in report_and_report_file_archives:
+                task_ids.append(report_and_report_file_archives['task identifier'])
 
             report_file_archives = report_and_report_file_archives.get('report file archives')
             if report_file_archives:
                 batch_report_file_archives.extend(report_file_archives)
 
-        # TODO: report is likely should be compressed.
-        self.__upload_archives('reports/api/upload/{0}/'.format(self.job_id),
-                               {
-                                   'reports': json.dumps(batch_reports),
-                                   'archives': json.dumps([os.path.basename(archive)
-                                                           for archive in batch_report_file_archives])
-                               },
-                               {os.path.basename(archive): archive for archive in batch_report_file_archives})
+        if batch_reports:
+            self.__upload_reports_bundle(b'[' + b','.join(batch_reports) + b']', batch_report_file_archives)
 
         # We can safely remove task and its files after uploading report referencing task files.
-        for report in batch_reports:
-            if 'task identifier' in report:
-                self.remove_task(report['task identifier'])
+        for task_id in task_ids:
+            self.remove_task(task_id)
 
         # We can safely upload images only after all reports were uploaded since image reports refer component reports.
         for image_report in image_reports:
@@ -163,7 +281,8 @@ class Session:
         # Remove reports and report file archives if needed.
         if not keep_reports:
             for report_and_report_file_archives in reports_and_report_file_archives:
-                os.remove(report_and_report_file_archives['report file'])
+                if 'report file' in report_and_report_file_archives:
+                    os.remove(report_and_report_file_archives['report file'])
                 report_file_archives = report_and_report_file_archives.get('report file archives')
                 if report_file_archives:
                     for archive in report_file_archives:
@@ -173,6 +292,23 @@ class Session:
                 os.remove(image_report['dot file'])
                 os.remove(image_report['image file'])
 
+    def __upload_reports_bundle(self, reports_data, report_file_archives):
+        # Put reports and report file archives into the single gzip compressed TAR stream so that Bridge gets
+        # everything within one compact request. Reports file goes first as Bridge reads the stream sequentially.
+        with tempfile.TemporaryFile() as bundle:
+            with tarfile.open(fileobj=bundle, mode='w:gz', compresslevel=self.BUNDLE_COMPRESS_LEVEL) as tar:
+                tar_info = tarfile.TarInfo('reports.json')
+                tar_info.size = len(reports_data)
+                tar.addfile(tar_info, io.BytesIO(reports_data))
+
+                for archive in report_file_archives:
+                    tar.add(archive, arcname=os.path.basename(archive))
+
+            bundle.seek(0)
+            resp = self.__request('reports/api/upload/{0}/'.format(self.job_id), 'POST',
+                                  files={'bundle': ('reports.tar.gz', bundle)}, stream=True)
+            resp.close()
+
     def submit_progress(self, progress):
         self.logger.info('Submit solution progress')
         self.__request('service/progress/{0}/'.format(self.job_id), 'PATCH', data=progress)
@@ -185,7 +321,7 @@ class Session:
 
                 self.logger.debug('Write {0} archive to "{1}"'.format(kind, archive))
                 with open(archive, 'wb') as fp:
-                    for chunk in resp.iter_content(1024):
+                    for chunk in resp.iter_content(BUFFER_SIZE):
                         fp.write(chunk)
 
                 if not zipfile.is_zipfile(archive) or zipfile.ZipFile(archive).testzip():
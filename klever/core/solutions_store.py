@@ -0,0 +1,162 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import errno
+import fcntl
+import fnmatch
+import glob
+import os
+import shutil
+import uuid
+
+import klever.core.utils
+
+# Files of solutions that are processed by RP. Other files produced by verifiers are neither extracted nor linked.
+SOLUTION_FILES = (
+    'decision results.json',
+    'output/*.results.xml',
+    'output/benchmark*logfiles/*',
+    'output/witness.*.graphml',
+    'output/*.info'
+)
+
+# Buffer size for copying and transferring solution files.
+BUFFER_SIZE = 1024 * 1024
+
+# Linux ioctl for sharing data between files on file systems supporting reflinks like Btrfs and XFS.
+FICLONE = 0x40049409
+
+
+def is_solution_file(name):
+    """
+    Check whether RP needs the solution file.
+
+    :param name: Path to the file relative to the solution directory.
+    :return: Bool.
+    """
+    return any(fnmatch.fnmatch(name, pattern) for pattern in SOLUTION_FILES)
+
+
+def clone_file(src, dst):
+    """
+    Make a copy of the file sharing data with the original one whenever it is possible. Try hard links, then reflinks
+    and only then copy data.
+
+    :param src: Path to the source file.
+    :param dst: Path to the destination file that should not exist.
+    :return: None
+    """
+    try:
+        os.link(src, dst)
+        return
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+
+    with open(src, 'rb') as src_fp, open(dst, 'wb') as dst_fp:
+        try:
+            fcntl.ioctl(dst_fp.fileno(), FICLONE, src_fp.fileno())
+        except OSError:
+            shutil.copyfileobj(src_fp, dst_fp, BUFFER_SIZE)
+
+
+class SolutionsStore:
+    """
+    Content addressed storage of solution files on a file system shared by schedulers and Klever Core. Schedulers put
+    files there instead of archiving and uploading them to Bridge, while RP links just files it needs to its working
+    directory. Each solution holds a reference (hard link) to each of its files, so files shared by several solutions
+    are removed just after all of them are released.
+    """
+
+    def __init__(self, logger, store_dir):
+        self.logger = logger
+        self.store_dir = store_dir
+
+    def __get_path(self, digest):
+        return os.path.join(self.store_dir, digest[:2], digest)
+
+    def __lock(self):
+        # Putting and releasing files should not interleave, otherwise files that are put again can be removed
+        return klever.core.utils.LockedOpen(os.path.join(self.store_dir, 'store'), 'w')
+
+    def put(self, solution_dir):
+        """
+        Put files needed by RP from the solution directory to the storage.
+
+        :param solution_dir: Path to the solution directory.
+        :return: Manifest, i.e. dictionary with a reference of the solution and paths to files relative to the solution
+                 directory and their digests.
+        """
+        files = {}
+        for dirpath, _, filenames in os.walk(solution_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, solution_dir)
+                if is_solution_file(name):
+                    files[name] = (path, klever.core.utils.get_file_checksum(path))
+
+        reference = uuid.uuid4().hex
+        os.makedirs(self.store_dir, exist_ok=True)
+        with self.__lock():
+            for path, digest in files.values():
+                store_path = self.__get_path(digest)
+                if not os.path.exists(store_path):
+                    os.makedirs(os.path.dirname(store_path), exist_ok=True)
+                    clone_file(path, store_path + '.tmp')
+                    os.replace(store_path + '.tmp', store_path)
+                reference_path = '{0}.{1}'.format(store_path, reference)
+                if not os.path.exists(reference_path):
+                    os.link(store_path, reference_path)
+
+        self.logger.debug('Put %s solution files to "%s"', len(files), self.store_dir)
+        return {'reference': reference, 'files': {name: digest for name, (_, digest) in files.items()}}
+
+    def get(self, manifest, dest_dir):
+        """
+        Link files of the solution to the given directory.
+
+        :param manifest: Manifest returned by put().
+        :param dest_dir: Path to the destination directory.
+        :return: None
+        """
+        for name, digest in manifest['files'].items():
+            dest = os.path.join(dest_dir, name)
+            os.makedirs(os.path.dirname(dest) or os.path.curdir, exist_ok=True)
+            if os.path.lexists(dest):
+                os.remove(dest)
+            clone_file(self.__get_path(digest), dest)
+
+    def release(self, manifest):
+        """
+        Drop references of the solution to its files and remove files that are not referred by other solutions.
+
+        :param manifest: Manifest returned by put().
+        :return: None
+        """
+        with self.__lock():
+            for digest in set(manifest['files'].values()):
+                store_path = self.__get_path(digest)
+                try:
+                    os.remove('{0}.{1}'.format(store_path, manifest['reference']))
+                except FileNotFoundError:
+                    pass
+
+                if not glob.glob(glob.escape(store_path) + '.*'):
+                    try:
+                        os.remove(store_path)
+                    except FileNotFoundError:
+                        pass
@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import logging
+import mmap
+
+import pytest
+
+from klever.core.coverage import LCOV, TotalCoverage, dump_coverage_info, join_coverage_info, load_coverage_info, \
+    merge_notes, split_coverage_info
+
+CIL_FILE = '''#line 1 "/storage/src/drivers/drv.c"
+int f(void)
+{
+  return 0;
+}
+#line 10 "/storage/src/drivers/drv.h"
+static int g(void) { return 1; }
+int h(void) { return 2; }
+'''
+
+COVERAGE_FILE = '''TN:
+SF:/home/cpachecker/output/cil.i
+FN:2,f
+FN:7,g
+FN:8,h
+FNDA:3,f
+FNDA:0,g
+FNDA:0,h
+DA:2,3
+TIMERS:1 stops for total time 14 ms
+DA:3,3
+ADD:size = {[1..3], 5}
+DA:4,0
+TIMERS:1 stops for total time 4 ms
+ADD:node = {11}
+DA:5,3
+end_of_record
+'''
+
+
+@pytest.fixture()
+def coverage_info(tmp_path):
+    cil_file = tmp_path / 'cil.i'
+    cil_file.write_text(CIL_FILE, encoding='utf-8')
+    coverage_file = tmp_path / 'coverage.info'
+    coverage_file.write_text(COVERAGE_FILE, encoding='utf-8')
+
+    lcov = LCOV(logging.getLogger('test'), str(coverage_file), '/storage', ['/src'], [], 'All source files', False,
+                'coverage', {'cil.i': str(cil_file)})
+    return lcov.parse()
+
+
+def load(compact_coverage_info):
+    # Convert decoded code coverage to the format that is returned by LCOV.
+    coverage_info = {}
+    for file_name, data, lines, line_cov_nums, functions, function_cov_nums in \
+            load_coverage_info(compact_coverage_info):
+        coverage_info[file_name] = dict(data, **{
+            'covered lines': dict(zip(lines, line_cov_nums)),
+            'covered functions': dict(zip(functions, function_cov_nums)),
+            'notes': {int(line): note for line, note in data['notes'].items()}
+        })
+    return coverage_info
+
+
+def test_lcov(coverage_info):
+    assert sorted(coverage_info) == ['source files/drivers/drv.c', 'source files/drivers/drv.h']
+    assert coverage_info['source files/drivers/drv.c']['covered lines'] == {1: 3, 2: 3, 3: 0, 4: 3}
+    # The header has not covered functions but it does not have covered lines at all
+    assert coverage_info['source files/drivers/drv.h']['covered lines'] == {}
+    assert coverage_info['source files/drivers/drv.h']['covered functions'] == {10: 0, 11: 0}
+
+
+def test_dump_load(coverage_info):
+    assert load(dump_coverage_info(coverage_info)) == coverage_info
+
+
+def test_load_mmap(coverage_info, tmp_path):
+    compact_coverage_info_file = tmp_path / 'coverage.kcov'
+    compact_coverage_info_file.write_bytes(dump_coverage_info(coverage_info))
+    with open(compact_coverage_info_file, 'rb') as fp:
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as compact_coverage_info:
+            assert load(compact_coverage_info) == coverage_info
+
+
+def test_split_join(coverage_info):
+    compact_coverage_info = dump_coverage_info(coverage_info)
+    records = dict(split_coverage_info(compact_coverage_info))
+    assert sorted(records) == sorted(coverage_info)
+    assert join_coverage_info(records.values()) == compact_coverage_info
+
+    # Records can be joined by shards in any combinations
+    for file_name, record in records.items():
+        assert load(join_coverage_info([record])) == {file_name: coverage_info[file_name]}
+
+
+def test_empty():
+    assert not load(dump_coverage_info({}))
+
+    coverage_info = {'empty.c': {
+        'covered lines': {}, 'covered functions': {}, 'covered function names': [], 'total functions': 0,
+        'notes': {}, 'original source file name': None
+    }}
+    assert load(dump_coverage_info(coverage_info)) == coverage_info
+    assert load(join_coverage_info(record for _, record in split_coverage_info(dump_coverage_info(coverage_info)))) \
+        == coverage_info
+
+
+def test_unsupported_format(coverage_info):
+    compact_coverage_info = dump_coverage_info(coverage_info)
+    with pytest.raises(ValueError):
+        list(load_coverage_info(b'LCOV' + compact_coverage_info[4:]))
+
+
+def test_total_coverage(coverage_info):
+    total_coverage = TotalCoverage()
+    for _ in range(2):
+        total_coverage.add(dump_coverage_info(coverage_info))
+
+    for file_name, file_coverage_info in coverage_info.items():
+        assert total_coverage.get_file_coverage_info(file_name) == {
+            'total functions': file_coverage_info['total functions'],
+            'covered lines': {line: 2 * cov_num for line, cov_num in file_coverage_info['covered lines'].items()},
+            'covered functions': {line: 2 * cov_num
+                                  for line, cov_num in file_coverage_info['covered functions'].items()},
+            'covered function names': file_coverage_info['covered function names'],
+            'notes': {line: merge_notes(note, note) for line, note in file_coverage_info['notes'].items()}
+        }
@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import logging
+from unittest import mock
+
+import pytest
+
+from klever.core.session import BridgeError, Session
+
+
+def response(status_code, data):
+    resp = mock.Mock(status_code=status_code, headers={'content-type': 'application/json'})
+    resp.json.return_value = data
+    return resp
+
+
+@pytest.fixture()
+def requests(monkeypatch):
+    requests = []
+
+    def request(_, method, url, **__):
+        requests.append((method, url))
+        if url.endswith('service/get_token/'):
+            return response(200, {'token': str(len(requests))})
+        # Bridge rejects all tokens like for removed users
+        return response(401, {'detail': 'Invalid token.'})
+
+    monkeypatch.setattr('requests.Session.request', request)
+    return requests
+
+
+def test_signin_once(requests):
+    session = Session(logging.getLogger('test'), {'name': 'bridge.test', 'user': 'user', 'password': 'password'},
+                      'job')
+    assert requests == [('POST', 'http://bridge.test/service/get_token/')]
+
+    with pytest.raises(BridgeError):
+        session.remove_task(1)
+    assert requests[1:] == [
+        ('DELETE', 'http://bridge.test/service/tasks/1/'),
+        ('POST', 'http://bridge.test/service/get_token/'),
+        ('DELETE', 'http://bridge.test/service/tasks/1/')
+    ]
+    assert session.error == {'detail': 'Invalid token.'}
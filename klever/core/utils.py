@@ -32,6 +32,8 @@ import shutil
 import resource
 import traceback
 
+from clade import Clade
+
 import klever
 
 
@@ -370,6 +372,26 @@ def get_logger(name, conf):
     return logger
 
 
+# Clade objects opened by the current process. Persistent workers reuse them instead of opening build bases again.
+_CLADE_OBJECTS = {}
+
+
+def get_clade(build_base):
+    """
+    Get Clade object for the given build base. The object is created just once per a process.
+
+    :param build_base: Path to the build base.
+    :return: Clade object.
+    """
+    if build_base not in _CLADE_OBJECTS:
+        clade = Clade(work_dir=build_base, conf={"log_level": "ERROR"})
+        if not clade.work_dir_ok():
+            raise RuntimeError('Build base is not OK')
+        _CLADE_OBJECTS[build_base] = clade
+
+    return _CLADE_OBJECTS[build_base]
+
+
 def get_parallel_threads_num(logger, conf, action=None):
     logger.info('Get the number of parallel threads for "{0}"'.format(action if action else "Default"))
 
@@ -440,7 +462,7 @@ class ArchiveFiles:
         self.arcnames = arcnames
         self.archive = None
 
-    def make_archive(self, archive):
+    def make_archive(self, archive, fsync=True):
         self.archive = archive
 
         with open(self.archive, mode='w+b', buffering=0) as f:
@@ -459,7 +481,8 @@ class ArchiveFiles:
                     else:
                         raise NotImplementedError("Cannot interpret a kind of an object {!r}".format(file_or_dir))
 
-                os.fsync(zfp.fp)
+                if fsync:
+                    os.fsync(zfp.fp)
 
 
 class ExtendedJSONEncoder(json.JSONEncoder):
@@ -495,7 +518,28 @@ def capitalize_attr_names(attrs):
             capitalize_attr_names(attr['value'])
 
 
-def report(logger, kind, report_data, mq, report_id, main_work_dir, report_dir='', data_files=None):
+# Reports which serialized representation exceeds this size are passed to the report files message queue through
+# files rather than in memory.
+REPORT_SPILL_SIZE = 1024 * 1024
+
+
+def report(logger, kind, report_data, mq, report_id, main_work_dir, report_dir='', data_files=None, in_memory=True,
+           fsync=True):
+    """
+    Create a report and put it to the report files message queue.
+
+    :param logger: Logger object.
+    :param kind: Report type.
+    :param report_data: Report data.
+    :param mq: Report files message queue.
+    :param report_id: Shared counter of reports.
+    :param main_work_dir: Main working directory.
+    :param report_dir: Directory where symlinks to report files archives are created.
+    :param data_files: Files of data attributes.
+    :param in_memory: Pass serialized reports through the message queue rather than through report files. Reports
+                      which size exceeds REPORT_SPILL_SIZE are always passed through files.
+    :param fsync: Flush report files archives to disk.
+    """
     if not mq:
         return
     logger.debug('Create {0} report'.format(kind))
@@ -520,7 +564,8 @@ def report(logger, kind, report_data, mq, report_id, main_work_dir, report_dir='
                 with zipfile.ZipFile(f, mode='w', compression=zipfile.ZIP_DEFLATED) as zfp:
                     for df in data_files:
                         zfp.write(df)
-                    os.fsync(zfp.fp)
+                    if fsync:
+                        os.fsync(zfp.fp)
             report_data['attr_data'] = archive_name
             archives.append(data_zip)
 
@@ -537,7 +582,7 @@ def report(logger, kind, report_data, mq, report_id, main_work_dir, report_dir='
 
             archive = tempfile.mktemp(prefix='{0}-'.format(cur_report_id), suffix='.zip',
                                       dir=os.path.join(main_work_dir, 'reports'))
-            elem.make_archive(archive)
+            elem.make_archive(archive, fsync)
             archives.append(elem.archive)
 
             # Create symlink to report files archive in current working directory.
@@ -550,10 +595,25 @@ def report(logger, kind, report_data, mq, report_id, main_work_dir, report_dir='
             logger.debug('{0} report files were packed to archive "{1}"'.format(kind.capitalize(),
                                                                                 cwd_report_files_archive))
 
-    # Create report file in reports directory.
     report_file = os.path.join(main_work_dir, 'reports', '{0}.json'.format(cur_report_id))
-    with open(report_file, 'w', encoding='utf-8') as fp:
-        json.dump(report_data, fp, cls=ExtendedJSONEncoder, ensure_ascii=False, sort_keys=True, indent=4)
+    if in_memory:
+        # Serialize report compactly just once. The same bytes will be uploaded to Bridge as is.
+        serialized_report = json.dumps(report_data, cls=ExtendedJSONEncoder, ensure_ascii=False,
+                                       separators=(',', ':')).encode('utf-8')
+        if len(serialized_report) <= REPORT_SPILL_SIZE:
+            message = {'report': serialized_report, 'report file archives': archives}
+            if 'task identifier' in report_data:
+                message['task identifier'] = report_data['task identifier']
+            mq.put(message)
+            return
+
+        # Spill too large report to disk to avoid passing it through the message queue.
+        with open(report_file, 'wb') as fp:
+            fp.write(serialized_report)
+    else:
+        # Create report file in reports directory.
+        with open(report_file, 'w', encoding='utf-8') as fp:
+            json.dump(report_data, fp, cls=ExtendedJSONEncoder, ensure_ascii=False, sort_keys=True, indent=4)
 
     # Put report file and report file archives to message queue if it is specified.
     mq.put({'report file': report_file, 'report file archives': archives})
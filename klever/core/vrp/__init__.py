@@ -19,9 +19,10 @@ import glob
 import json
 import multiprocessing
 import os
+import queue
 import re
+import shutil
 import sys
-import time
 import traceback
 import zipfile
 from xml.etree import ElementTree
@@ -32,6 +33,8 @@ import klever.core.components
 import klever.core.session
 import klever.core.utils
 from klever.core.coverage import LCOV
+from klever.core.results_cache import ResultsCache
+from klever.core.solutions_store import SolutionsStore, is_solution_file
 from klever.core.vrp.et import import_error_trace, ErrorTraceParser
 
 MEA_LIB = os.path.join("MEA", "cv")
@@ -76,42 +79,63 @@ class VRP(klever.core.components.Component):
     def __result_processing(self):
         self.logger.info('Start waiting messages from VTG to track their statuses')
         pending = {}
+        # Statuses of tasks that were finished but were not received from VTG yet
+        finished = {}
+        cursor = None
         # todo: implement them in GUI
-        solution_timeout = 1
+        # Seconds to wait for new tasks or for changes of statuses of pending tasks
+        solution_timeout = 10
 
         receiving = True
-        session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
+        session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'],
+                                              self.vals)
         while True:
             # Get new tasks
             if receiving:
-                # Functions below close the queue!
                 data = []
-                res = klever.core.utils.drain_queue(data, self.mqs['pending tasks'])
-                if not res:
-                    receiving = False
+                if pending:
+                    # Functions below close the queue!
+                    receiving = klever.core.utils.drain_queue(data, self.mqs['pending tasks'])
+                else:
+                    # There is nothing to track, so just wait for new tasks
+                    try:
+                        item = self.mqs['pending tasks'].get(True, timeout=solution_timeout)
+                        if item is None:
+                            self.mqs['pending tasks'].close()
+                            receiving = False
+                        else:
+                            data.append(item)
+                            receiving = klever.core.utils.drain_queue(data, self.mqs['pending tasks'])
+                    except queue.Empty:
+                        pass
+
+                if not receiving:
                     self.logger.info("Expect no tasks to be generated")
 
                 if data:
                     self.logger.info('Received %s items', len(data))
                 for item in data:
                     assert item
-                    pending[item[0]] = item
+                    if item[0] is None:
+                        # Decision results of the task are taken from the cache, so it was not scheduled at all
+                        self.logger.info('Track processing task %s', str(item[1]))
+                        self.processing_tasks.put(['finished', item])
+                    else:
+                        pending[item[0]] = item
+
+            # Plan for processing tasks that were finished before they were received
+            self.__plan_finished_tasks(pending, finished)
 
-            # Plan for processing new tasks
+            # Wait for changes of statuses of pending tasks. Bridge returns just changed statuses, so there is no need
+            # to get statuses of all tasks each time.
             if pending:
-                tasks_statuses = session.get_tasks_statuses()
+                cursor, tasks_statuses = session.get_tasks_statuses_changes(cursor, solution_timeout)
                 for item in tasks_statuses:
-                    task = str(item['id'])
-                    if task in pending:
-                        if item['status'] in ('FINISHED', 'ERROR'):
-                            task_data = pending[task]
-                            self.logger.info('Track processing task %s', str(task_data[1]))
-                            self.processing_tasks.put([item['status'].lower(), task_data])
-                            del pending[task]
-                        elif item['status'] in ('PENDING', 'PROCESSING'):
-                            pass
-                        else:
-                            raise NotImplementedError('Unknown task status {!r}'.format(item['status']))
+                    if item['status'] in ('FINISHED', 'ERROR'):
+                        finished[str(item['id'])] = item['status']
+                    elif item['status'] not in ('PENDING', 'PROCESSING'):
+                        raise NotImplementedError('Unknown task status {!r}'.format(item['status']))
+                self.__plan_finished_tasks(pending, finished)
 
             if not receiving and not pending:
                 for _ in range(self.__workers):
@@ -119,10 +143,15 @@ class VRP(klever.core.components.Component):
                 self.processing_tasks.close()
                 break
 
-            time.sleep(solution_timeout)
-
+        session.log_latencies()
         self.logger.debug("Shutting down result processing gracefully")
 
+    def __plan_finished_tasks(self, pending, finished):
+        for task in [task for task in pending if task in finished]:
+            task_data = pending.pop(task)
+            self.logger.info('Track processing task %s', str(task_data[1]))
+            self.processing_tasks.put([finished.pop(task).lower(), task_data])
+
     def __loop_worker(self):
         self.logger.info("VRP fetcher is ready to work")
 
@@ -180,7 +209,8 @@ class RP(klever.core.components.Component):
         super().__init__(conf, logger, parent_id, mqs, vals, cur_id, work_dir, separate_from_parent=True)
 
         self.clean_dir = True
-        self.session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
+        self.session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'],
+                                                   self.vals)
 
         # Obtain file prefixes that can be removed from file paths.
         clade_conf = {"log_level": "ERROR"}
@@ -196,7 +226,8 @@ class RP(klever.core.components.Component):
     def fetcher(self):
         self.logger.info("VRP instance is ready to work")
         status, data = self.element
-        task_id, task_desc, opts, program_fragment_desc, verifier, self.additional_srcs, verification_task_files = data
+        task_id, task_desc, opts, program_fragment_desc, verifier, self.additional_srcs, verification_task_files, \
+            cache_key, cached_archive = data
         self.program_fragment_id, _, self.envmodel, self.req_spec_id, _, envattrs = task_desc
         self.verification_task_files = verification_task_files
         self.logger.debug("Process results of task %s", task_id)
@@ -244,7 +275,7 @@ class RP(klever.core.components.Component):
 
         try:
             if status == 'finished':
-                self.process_finished_task(task_id, opts, verifier)
+                self.process_finished_task(task_id, opts, verifier, cache_key, cached_archive)
             elif status == 'error':
                 self.process_failed_task(task_id)
                 # Raise exception just here since the method above has callbacks.
@@ -394,8 +425,7 @@ class RP(klever.core.components.Component):
                 else:
                     os.symlink(os.path.relpath(log_file, 'verification'), verification_problem_desc)
 
-                klever.core.utils.report(
-                    self.logger,
+                self._report(
                     'unknown',
                     {
                         # There may be the only Unknown, so, "/" uniquely distinguishes it.
@@ -407,9 +437,6 @@ class RP(klever.core.components.Component):
                             {verification_problem_desc: 'problem desc.txt'}
                         )
                     },
-                    self.mqs['report files'],
-                    self.vals['report id'],
-                    self.conf['main working directory'],
                     'verification'
                 )
 
@@ -428,15 +455,39 @@ class RP(klever.core.components.Component):
         # We do not need task and its files anymore.
         self.session.remove_task(task_id)
 
-    def process_finished_task(self, task_id, opts, verifier):
-        self.session.download_decision(task_id)
+    def process_finished_task(self, task_id, opts, verifier, cache_key=None, cached_archive=None):
+        results_cache = None
+        if cache_key:
+            results_cache = ResultsCache(self.logger, self.conf['verification results cache'])
+
+        if task_id is None:
+            # Verification task was not scheduled since its decision results were cached. VTG took them from the cache
+            # in advance, so they are available even if the cache entry was removed since then.
+            if not cached_archive or not os.path.isfile(cached_archive):
+                raise RuntimeError('Cached decision results of the verification task were not kept')
+            shutil.copy(cached_archive, 'decision result files.zip')
+        else:
+            self.session.download_decision(task_id)
 
+        # Extract just files that are processed below
         with zipfile.ZipFile('decision result files.zip') as zfp:
-            zfp.extractall()
+            zfp.extractall(members=[name for name in zfp.namelist() if is_solution_file(name)])
 
         with open('decision results.json', encoding='utf-8') as fp:
             decision_results = json.load(fp)
 
+        if 'solution files' in decision_results:
+            # Solution files were put to the storage shared with the scheduler
+            solutions_store = SolutionsStore(self.logger, decision_results['solution files']['storage'])
+            solutions_store.get(decision_results['solution files'], os.path.curdir)
+            solutions_store.release(decision_results['solution files'])
+
+        # Decision results of local runs refer output directories that can be removed, so do not cache them. The
+        # archive does not contain solution files passed through the storage as well.
+        if results_cache and task_id is not None and "output dir" not in decision_results and \
+                'solution files' not in decision_results:
+            results_cache.put(cache_key, 'decision result files.zip')
+
         if "output dir" in decision_results:
             # Local run, the data is on the file system
             if not os.path.exists('output'):
@@ -483,7 +534,7 @@ class RP(klever.core.components.Component):
         if not self.logger.disabled and log_file and self.conf['weight'] == "0":
             report['log'] = klever.core.utils.ArchiveFiles([log_file], {log_file: 'log.txt'})
 
-        if self.conf['upload verifier input files']:
+        if self.conf['upload verifier input files'] and task_id is not None:
             report['task'] = task_id
 
         # Remember exception and raise it if verdict is not unknown
@@ -514,8 +565,8 @@ class RP(klever.core.components.Component):
                                                  self.req_spec_id.replace('/', '-'))
                 coverage_info_dir = os.path.join(self.conf['main working directory'], coverage_info_dir)
                 os.makedirs(coverage_info_dir, exist_ok=True)
-                coverage_info_file = os.path.join(coverage_info_dir,
-                                                  "{0}_coverage_info.json".format(task_id.replace('/', '-')))
+                coverage_info_file = os.path.join(coverage_info_dir, "{0}_coverage_info.bin"
+                                                  .format((task_id or cache_key).replace('/', '-')))
 
                 lcov = LCOV(self.logger, coverage_file,
                             self.clade.storage_dir, self.source_paths,
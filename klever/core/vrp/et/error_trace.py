@@ -23,6 +23,76 @@ import klever.core.utils
 from klever.core.highlight import Highlight
 
 
+class _Element:
+    # Map keys used by error trace transformations to attributes of compact objects. Unset attributes correspond to
+    # absent keys, so objects behave like dictionaries without storing per-object hash tables.
+    KEYS = {}
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self.KEYS[key])
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, self.KEYS[key], value)
+
+    def __delitem__(self, key):
+        try:
+            delattr(self, self.KEYS[key])
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.KEYS and hasattr(self, self.KEYS[key])
+
+    def get(self, key, default=None):
+        return getattr(self, self.KEYS[key], default)
+
+    def __repr__(self):
+        return '{0}({1})'.format(type(self).__name__, ', '.join(
+            '{0!r}: {1!r}'.format(key, self[key]) for key in self.KEYS
+            if key in self and key not in ('in', 'out', 'source node', 'target node')))
+
+
+class Node(_Element):
+    KEYS = {'id': 'id', 'in': 'in_edges', 'out': 'out_edges'}
+    __slots__ = tuple(KEYS.values())
+
+    def __init__(self, identifier):
+        self.id = identifier
+        self.in_edges = []
+        self.out_edges = []
+
+
+class Edge(_Element):
+    KEYS = {
+        'source node': 'source_node',
+        'target node': 'target_node',
+        'file': 'file',
+        'line': 'line',
+        'source': 'source',
+        'thread': 'thread',
+        'enter': 'enter',
+        'unmerged enter': 'unmerged_enter',
+        'return': 'return_',
+        'assumption scope': 'assumption_scope',
+        'assumption': 'assumption',
+        'condition': 'condition',
+        'declaration': 'declaration',
+        'notes': 'notes',
+        'action': 'action',
+        'display': 'display',
+        'entry_point': 'entry_point'
+    }
+    __slots__ = tuple(KEYS.values())
+
+    def __init__(self, source_node=None, target_node=None):
+        self.source_node = source_node
+        self.target_node = target_node
+
+
 class ErrorTrace:
     ERROR_TRACE_FORMAT_VERSION = 1
     MODEL_COMMENT_TYPES = r'NOTE\d?|ASSERT|CIF|EMG_WRAPPER'
@@ -359,14 +429,17 @@ class ErrorTrace:
     def add_node(self, node_id):
         if node_id in self._nodes:
             raise ValueError('There is already added node with an identifier {!r}'.format(node_id))
-        self._nodes[node_id] = {'id': node_id, 'in': [], 'out': []}
+        self._nodes[node_id] = Node(node_id)
         return self._nodes[node_id]
 
-    def add_edge(self, source, target):
+    def add_edge(self, source, target, edge=None):
         source_node = self._nodes[source]
         target_node = self._nodes[target]
 
-        edge = {'source node': source_node, 'target node': target_node}
+        if edge is None:
+            edge = Edge()
+        edge['source node'] = source_node
+        edge['target node'] = target_node
         source_node['out'].append(edge)
         target_node['in'].append(edge)
         return edge
@@ -447,11 +520,8 @@ class ErrorTrace:
             current = self.next_edge(current)
 
     def insert_edge_and_target_node(self, edge, after=True):
-        new_edge = {
-            'target node': None,
-            'source node': None,
-            'file': 0
-        }
+        new_edge = Edge()
+        new_edge['file'] = 0
         new_node = self.add_node(int(len(self._nodes)))
 
         if after:
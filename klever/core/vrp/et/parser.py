@@ -20,11 +20,14 @@ import re
 import xml.etree.ElementTree as ET
 import collections
 
-from klever.core.vrp.et.error_trace import ErrorTrace
+from klever.core.vrp.et.error_trace import ErrorTrace, Edge
 
 
 class ErrorTraceParser:
-    WITNESS_NS = {'graphml': 'http://graphml.graphdrawing.org/xmlns'}
+    GRAPH_TAG = '{http://graphml.graphdrawing.org/xmlns}graph'
+    DATA_TAG = '{http://graphml.graphdrawing.org/xmlns}data'
+    NODE_TAG = '{http://graphml.graphdrawing.org/xmlns}node'
+    EDGE_TAG = '{http://graphml.graphdrawing.org/xmlns}edge'
     # There may be several violation witnesses that refer to the same program file (CIL file), so, it is a good optimization
     # to parse it once.
     PROGRAMFILE_LINE_MAP = {}
@@ -59,16 +62,48 @@ class ErrorTraceParser:
     def _parse_witness(self, witness):
         self._logger.info('Parse witness {!r}'.format(witness))
 
-        with open(witness, encoding='utf-8') as fp:
-            tree = ET.parse(fp)
+        # Violation witnesses can be very large, so do not build the whole XML tree. Instead process graph data, nodes
+        # and edges as soon as they are parsed and free corresponding XML elements. Edges are linked at the very end
+        # since nodes can follow edges referring them while all sink nodes should be known in advance.
+        sink_nodes = set()
+        nodes_number = 0
+        edges = []
+        self.__unsupported_node_data_keys = []
+        self.__unsupported_edge_data_keys = []
+        with open(witness, 'rb') as fp:
+            elements = []
+            for event, element in ET.iterparse(fp, events=('start', 'end')):
+                if event == 'start':
+                    elements.append(element)
+                    continue
+
+                elements.pop()
+                # Data of nodes and edges is processed together with them.
+                if len(elements) != 2 or elements[1].tag != self.GRAPH_TAG:
+                    continue
+
+                if element.tag == self.DATA_TAG:
+                    self.__parse_witness_data(element)
+                elif element.tag == self.NODE_TAG:
+                    if self.__parse_witness_node(element):
+                        sink_nodes.add(element.attrib['id'])
+                    else:
+                        nodes_number += 1
+                elif element.tag == self.EDGE_TAG:
+                    edges.append(self.__parse_witness_edge(element))
+
+                element.clear()
+                elements[1].remove(element)
 
-        root = tree.getroot()
+        # Sanity checks.
+        if not self.error_trace.entry_node:
+            raise KeyError('Entry node was not found')
+        if len(list(self.error_trace.violation_nodes)) == 0:
+            raise KeyError('Violation nodes were not found')
 
-        graph = root.find('graphml:graph', self.WITNESS_NS)
+        self._logger.debug('Parse {0} nodes and {1} sink nodes'.format(nodes_number, len(sink_nodes)))
 
-        self.__parse_witness_data(graph)
-        sink_nodes = self.__parse_witness_nodes(graph)
-        self.__parse_witness_edges(graph, sink_nodes)
+        self.__link_witness_edges(edges, sink_nodes)
 
     @staticmethod
     def reset():
@@ -76,176 +111,156 @@ class ErrorTraceParser:
         ErrorTraceParser.PROGRAMFILE_CONTENT = ''
         ErrorTraceParser.FILE_NAMES = collections.OrderedDict()
 
-    def __parse_witness_data(self, graph):
-        for data in graph.findall('graphml:data', self.WITNESS_NS):
-            if 'klever-attrs' in data.attrib and data.attrib['klever-attrs'] == 'true':
-                self.error_trace.add_attr(data.attrib['key'], data.text,
-                                          data.attrib['associate'] == 'true',
-                                          data.attrib['compare'] == 'true')
-
-            # TODO: at the moment violation witnesses do not support multiple program files.
-            if data.attrib['key'] == 'programfile':
-                if not ErrorTraceParser.PROGRAMFILE_LINE_MAP:
-                    with open(self.verification_task_files[os.path.normpath(data.text)]) as fp:
-                        line_num = 1
-                        orig_file_id = None
-                        orig_file_line_num = 0
-                        line_preprocessor_directive = re.compile(r'\s*#line\s+(\d+)\s*(.*)')
-                        # By some reason it takes enormous CPU and wall time to store content of large CIL files into
-                        # class objects iteratively. So use temporary variable for this.
-                        content = ''
-                        for line in fp:
-                            content += line
-                            m = line_preprocessor_directive.match(line)
-                            if m:
-                                orig_file_line_num = int(m.group(1))
-                                if m.group(2):
-                                    file_name = m.group(2)[1:-1]
-                                    # Do not treat artificial file references. Let's hope that they will disappear one
-                                    # day.
-                                    if not os.path.basename(file_name) == '<built-in>':
-                                        orig_file_id = self.error_trace.add_file(file_name)
-                                        if file_name not in ErrorTraceParser.FILE_NAMES:
-                                            ErrorTraceParser.FILE_NAMES[file_name] = True
-                            else:
-                                ErrorTraceParser.PROGRAMFILE_LINE_MAP[line_num] = (orig_file_id, orig_file_line_num)
-                                orig_file_line_num += 1
-                            line_num += 1
-
-                        ErrorTraceParser.PROGRAMFILE_CONTENT = content
-                # Add file names to error trace object exactly in the same order in what they were met during the first
-                # parsing of program file (CIL file). This is not necessary for the time of parsing since this is done
-                # above to get file identifiers.
-                else:
-                    for file_name in ErrorTraceParser.FILE_NAMES:
-                        self.error_trace.add_file(file_name)
-
-                self.error_trace.programfile_line_map = ErrorTraceParser.PROGRAMFILE_LINE_MAP
-
-    def __parse_witness_nodes(self, graph):
-        sink_nodes = []
-        unsupported_node_data_keys = []
-        nodes_number = 0
-
-        for node in graph.findall('graphml:node', self.WITNESS_NS):
-            is_sink = False
-
-            for data in node.findall('graphml:data', self.WITNESS_NS):
-                data_key = data.attrib['key']
-                if data_key == 'entry':
-                    self.error_trace.add_entry_node_id(node.attrib['id'])
-                    self._logger.debug('Parse entry node {!r}'.format(node.attrib['id']))
-                elif data_key == 'sink':
-                    is_sink = True
-                    self._logger.debug('Parse sink node {!r}'.format(node.attrib['id']))
-                elif data_key == 'violation':
-                    if len(list(self.error_trace.violation_nodes)) > 0:
-                        raise NotImplementedError('Several violation nodes are not supported')
-                    self.error_trace.add_violation_node_id(node.attrib['id'])
-                    self._logger.debug('Parse violation node {!r}'.format(node.attrib['id']))
-                elif data_key not in unsupported_node_data_keys:
-                    self._logger.warning('Node data key {!r} is not supported'.format(data_key))
-                    unsupported_node_data_keys.append(data_key)
-
-            # Do not track sink nodes as all other nodes. All edges leading to sink nodes will be excluded as well.
-            if is_sink:
-                sink_nodes.append(node.attrib['id'])
+    def __parse_witness_data(self, data):
+        if 'klever-attrs' in data.attrib and data.attrib['klever-attrs'] == 'true':
+            self.error_trace.add_attr(data.attrib['key'], data.text,
+                                      data.attrib['associate'] == 'true',
+                                      data.attrib['compare'] == 'true')
+
+        # TODO: at the moment violation witnesses do not support multiple program files.
+        if data.attrib['key'] == 'programfile':
+            if not ErrorTraceParser.PROGRAMFILE_LINE_MAP:
+                with open(self.verification_task_files[os.path.normpath(data.text)]) as fp:
+                    line_num = 1
+                    orig_file_id = None
+                    orig_file_line_num = 0
+                    line_preprocessor_directive = re.compile(r'\s*#line\s+(\d+)\s*(.*)')
+                    # By some reason it takes enormous CPU and wall time to store content of large CIL files into
+                    # class objects iteratively. So use temporary variable for this.
+                    content = ''
+                    for line in fp:
+                        content += line
+                        m = line_preprocessor_directive.match(line)
+                        if m:
+                            orig_file_line_num = int(m.group(1))
+                            if m.group(2):
+                                file_name = m.group(2)[1:-1]
+                                # Do not treat artificial file references. Let's hope that they will disappear one
+                                # day.
+                                if not os.path.basename(file_name) == '<built-in>':
+                                    orig_file_id = self.error_trace.add_file(file_name)
+                                    if file_name not in ErrorTraceParser.FILE_NAMES:
+                                        ErrorTraceParser.FILE_NAMES[file_name] = True
+                        else:
+                            ErrorTraceParser.PROGRAMFILE_LINE_MAP[line_num] = (orig_file_id, orig_file_line_num)
+                            orig_file_line_num += 1
+                        line_num += 1
+
+                    ErrorTraceParser.PROGRAMFILE_CONTENT = content
+            # Add file names to error trace object exactly in the same order in what they were met during the first
+            # parsing of program file (CIL file). This is not necessary for the time of parsing since this is done
+            # above to get file identifiers.
             else:
-                nodes_number += 1
-                self.error_trace.add_node(node.attrib['id'])
-
+                for file_name in ErrorTraceParser.FILE_NAMES:
+                    self.error_trace.add_file(file_name)
+
+            self.error_trace.programfile_line_map = ErrorTraceParser.PROGRAMFILE_LINE_MAP
+
+    def __parse_witness_node(self, node):
+        is_sink = False
+
+        for data in node.iterfind(self.DATA_TAG):
+            data_key = data.attrib['key']
+            if data_key == 'entry':
+                self.error_trace.add_entry_node_id(node.attrib['id'])
+                self._logger.debug('Parse entry node {!r}'.format(node.attrib['id']))
+            elif data_key == 'sink':
+                is_sink = True
+                self._logger.debug('Parse sink node {!r}'.format(node.attrib['id']))
+            elif data_key == 'violation':
+                if len(list(self.error_trace.violation_nodes)) > 0:
+                    raise NotImplementedError('Several violation nodes are not supported')
+                self.error_trace.add_violation_node_id(node.attrib['id'])
+                self._logger.debug('Parse violation node {!r}'.format(node.attrib['id']))
+            elif data_key not in self.__unsupported_node_data_keys:
+                self._logger.warning('Node data key {!r} is not supported'.format(data_key))
+                self.__unsupported_node_data_keys.append(data_key)
+
+        # Do not track sink nodes as all other nodes. All edges leading to sink nodes will be excluded as well.
+        if not is_sink:
+            self.error_trace.add_node(node.attrib['id'])
+
+        return is_sink
+
+    def __parse_witness_edge(self, edge):
         # Sanity checks.
-        if not self.error_trace.entry_node:
-            raise KeyError('Entry node was not found')
-        if len(list(self.error_trace.violation_nodes)) == 0:
-            raise KeyError('Violation nodes were not found')
-
-        self._logger.debug('Parse {0} nodes and {1} sink nodes'.format(nodes_number, len(sink_nodes)))
-        return sink_nodes
+        if 'source' not in edge.attrib:
+            raise KeyError('Source node was not found')
+        if 'target' not in edge.attrib:
+            raise KeyError('Destination node was not found')
+
+        # Remember just offsets since program file can be parsed after edges.
+        _edge = Edge()
+        startoffset = None
+        endoffset = None
+        startline = None
+        control = None
+        for data in edge.iterfind(self.DATA_TAG):
+            data_key = data.attrib['key']
+            if data_key == 'startoffset':
+                startoffset = int(data.text)
+            elif data_key == 'endoffset':
+                endoffset = int(data.text)
+            elif data_key == 'startline':
+                startline = int(data.text)
+            elif data_key in ['enterFunction', 'returnFrom', 'assumption.scope']:
+                self.error_trace.add_function(data.text)
+                if data_key == 'enterFunction':
+                    _edge['enter'] = self.error_trace.resolve_function_id(data.text)
+                    # Frama-C (CIL) can add artificial suffixes "_\d+" for functions with the same name during merge
+                    # to avoid conflicts during subsequent name resolution. Remember references to original function
+                    # names that can be useful later, e.g. when adding displays for instrumenting functions.
+                    m = re.search(r'(.+)(_\d+)$', data.text)
+                    if m:
+                        unmerged_func_name = m.group(1)
+                        self.error_trace.add_function(unmerged_func_name)
+                        _edge['unmerged enter'] = self.error_trace.resolve_function_id(unmerged_func_name)
+                elif data_key == 'returnFrom':
+                    _edge['return'] = self.error_trace.resolve_function_id(data.text)
+                else:
+                    _edge['assumption scope'] = self.error_trace.resolve_function_id(data.text)
+            elif data_key == 'control':
+                control = data.text == 'condition-true'
+                _edge['condition'] = True
+            elif data_key == 'assumption':
+                _edge['assumption'] = data.text
+            elif data_key == 'threadId':
+                # TODO: SV-COMP states that thread identifiers should unique, they may be non-numbers as we want.
+                _edge['thread'] = int(data.text)
+            elif data_key == 'declaration':
+                _edge['declaration'] = True
+            elif data_key == 'note':
+                m = re.match(r'level="(\d+)" hide="(false|true)" value="(.+)"$', data.text)
+                if m:
+                    if 'notes' not in _edge:
+                        _edge['notes'] = []
+                    _edge['notes'].append({
+                        'level': int(m.group(1)),
+                        'hide': m.group(2) != 'false',
+                        'text': m.group(3).replace('\\\"', '\"')
+                    })
+                else:
+                    self._logger.warning('Invalid format of note "{0}"'.format(data.text))
+            elif data_key not in self.__unsupported_edge_data_keys:
+                self._logger.warning('Edge data key {!r} is not supported'.format(data_key))
+                self.__unsupported_edge_data_keys.append(data_key)
 
-    def __parse_witness_edges(self, graph, sink_nodes):
-        unsupported_edge_data_keys = []
+        return _edge, edge.attrib['source'], edge.attrib['target'], startoffset, endoffset, startline, control
 
-        # Use maps for source files and functions as for nodes. Add artificial map to 0 for default file without
-        # explicitly specifying its path.
+    def __link_witness_edges(self, edges, sink_nodes):
         # The number of edges leading to sink nodes. Such edges will be completely removed.
         sink_edges_num = 0
         edges_num = 0
 
         edges_to_remove = []
         referred_file_ids = set()
-        for edge in graph.findall('graphml:edge', self.WITNESS_NS):
-            # Sanity checks.
-            if 'source' not in edge.attrib:
-                raise KeyError('Source node was not found')
-            if 'target' not in edge.attrib:
-                raise KeyError('Destination node was not found')
-
-            source_node_id = edge.attrib['source']
-
-            if edge.attrib['target'] in sink_nodes:
+        for _edge, source_node_id, target_node_id, startoffset, endoffset, startline, control in edges:
+            if target_node_id in sink_nodes:
                 sink_edges_num += 1
                 continue
 
-            target_node_id = edge.attrib['target']
-
             # Update lists of input and output edges for source and target nodes.
-            _edge = self.error_trace.add_edge(source_node_id, target_node_id)
-
-            startoffset = None
-            endoffset = None
-            startline = None
-            control = None
-            for data in edge.findall('graphml:data', self.WITNESS_NS):
-                data_key = data.attrib['key']
-                if data_key == 'startoffset':
-                    startoffset = int(data.text)
-                elif data_key == 'endoffset':
-                    endoffset = int(data.text)
-                elif data_key == 'startline':
-                    startline = int(data.text)
-                elif data_key in ['enterFunction', 'returnFrom', 'assumption.scope']:
-                    self.error_trace.add_function(data.text)
-                    if data_key == 'enterFunction':
-                        _edge['enter'] = self.error_trace.resolve_function_id(data.text)
-                        # Frama-C (CIL) can add artificial suffixes "_\d+" for functions with the same name during
-                        # merge to avoid conflicts during subsequent name resolution. Remember references to original
-                        # function names that can be useful later, e.g. when adding displays for instrumenting
-                        # functions.
-                        m = re.search(r'(.+)(_\d+)$', data.text)
-                        if m:
-                            unmerged_func_name = m.group(1)
-                            self.error_trace.add_function(unmerged_func_name)
-                            _edge['unmerged enter'] = self.error_trace.resolve_function_id(unmerged_func_name)
-                    elif data_key == 'returnFrom':
-                        _edge['return'] = self.error_trace.resolve_function_id(data.text)
-                    else:
-                        _edge['assumption scope'] = self.error_trace.resolve_function_id(data.text)
-                elif data_key == 'control':
-                    control = data.text == 'condition-true'
-                    _edge['condition'] = True
-                elif data_key == 'assumption':
-                    _edge['assumption'] = data.text
-                elif data_key == 'threadId':
-                    # TODO: SV-COMP states that thread identifiers should unique, they may be non-numbers as we want.
-                    _edge['thread'] = int(data.text)
-                elif data_key == 'declaration':
-                    _edge['declaration'] = True
-                elif data_key == 'note':
-                    m = re.match(r'level="(\d+)" hide="(false|true)" value="(.+)"$', data.text)
-                    if m:
-                        if 'notes' not in _edge:
-                            _edge['notes'] = []
-                        _edge['notes'].append({
-                            'level': int(m.group(1)),
-                            'hide': m.group(2) != 'false',
-                            'text': m.group(3).replace('\\\"', '\"')
-                        })
-                    else:
-                        self._logger.warning('Invalid format of note "{0}"'.format(data.text))
-                elif data_key not in unsupported_edge_data_keys:
-                    self._logger.warning('Edge data key {!r} is not supported'.format(data_key))
-                    unsupported_edge_data_keys.append(data_key)
+            self.error_trace.add_edge(source_node_id, target_node_id, _edge)
 
             if startoffset and endoffset and startline:
                 _edge['source'] = ErrorTraceParser.PROGRAMFILE_CONTENT[startoffset:(endoffset + 1)]
@@ -22,6 +22,8 @@ import copy
 import hashlib
 import importlib
 import collections
+import logging
+import multiprocessing
 import resource
 
 import yaml
@@ -29,6 +31,8 @@ import yaml
 import klever.core.components
 import klever.core.utils
 import klever.core.session
+from klever.core.results_cache import ResultsCache
+from klever.core.vtg.emg.common.c.types import reset_types_state
 
 from klever.scheduler.schedulers.global_config import clear_workers_cpu_cores, reserve_workers_cpu_cores
 
@@ -37,6 +41,118 @@ Abstract = collections.namedtuple('AbstractTask', 'fragment rule_class')
 Task = collections.namedtuple('Task', 'fragment rule_class envmodel rule workdir, envattrs')
 
 
+def report_task_failure(conf, mqs, task):
+    """
+    Notify VTG and the progress watcher that the abstract task or the task was not generated.
+
+    :param conf: Configuration.
+    :param mqs: Message queues.
+    :param task: Abstract or Task object.
+    :return: None
+    """
+    mqs['processed'].put((type(task).__name__, tuple(task)))
+    if 'verification statuses' in mqs:
+        mqs['verification statuses'].put({
+            'program fragment id': task.fragment,
+            'req spec id': task.rule if hasattr(task, 'rule') else task.rule_class,
+            'environment model': task.envmodel if hasattr(task, 'envmodel') else 'base',
+            'verdict': 'non-verifier unknown',
+            'sub-job identifier': conf['sub-job identifier'],
+            'ideal verdicts': conf['ideal verdicts'],
+            'data': conf.get('data')
+        })
+
+
+class VTGWPool:
+    """
+    Fixed number of persistent workers generating tasks one by one. Each worker takes tasks from its own queue and
+    tells when it becomes ready for the next task, so the pool knows which task each worker processes. Tasks of workers
+    that exit unexpectedly, e.g. due to OOM killer, are not lost silently.
+    """
+
+    def __init__(self, logger, size, create_worker):
+        """
+        Create a pool of workers but do not start them.
+
+        :param logger: Logger object.
+        :param size: Number of workers.
+        :param create_worker: Function that gets a worker index, its tasks queue and the queue of ready workers and
+                              returns a process object. The process should put its index to the queue of ready workers
+                              after processing each task and it should exit after getting None.
+        """
+        self.logger = logger
+        self.size = size
+        self.create_worker = create_worker
+        self.ready = multiprocessing.Queue()
+        self.workers = []
+        # Tasks being processed by workers or None for idle workers
+        self.tasks = []
+
+    def start(self):
+        for i in range(self.size):
+            self.workers.append(self.__start_worker(i))
+            self.tasks.append(None)
+
+    def __start_worker(self, index):
+        worker = self.create_worker(index, multiprocessing.Queue(), self.ready)
+        worker.start()
+        return worker
+
+    def __free_ready_workers(self):
+        ready = []
+        klever.core.utils.drain_queue(ready, self.ready)
+        for index in ready:
+            self.tasks[index] = None
+
+    def check(self):
+        """
+        Free workers that have processed their tasks and restart workers that have exited.
+
+        :return: List of tasks that were being processed by exited workers.
+        """
+        self.__free_ready_workers()
+
+        lost = []
+        for i, worker in enumerate(self.workers):
+            if worker.is_alive():
+                continue
+
+            # The worker could tell that it has processed its task just before exit
+            self.__free_ready_workers()
+            self.logger.warning('Persistent worker %s has exited unexpectedly with code %s, restart it', i,
+                                worker.exitcode)
+            if self.tasks[i] is not None:
+                lost.append(self.tasks[i])
+            self.workers[i] = self.__start_worker(i)
+            self.tasks[i] = None
+
+        return lost
+
+    @property
+    def idle(self):
+        """Return indexes of workers without tasks."""
+        return [i for i, task in enumerate(self.tasks) if task is None]
+
+    def submit(self, index, task):
+        """
+        Give the task to the idle worker.
+
+        :param index: Worker index.
+        :param task: Task.
+        :return: None
+        """
+        self.tasks[index] = task
+        self.workers[index].tasks.put(task)
+
+    def stop(self):
+        for worker in self.workers:
+            worker.tasks.put(None)
+        for worker in self.workers:
+            worker.join()
+            worker.tasks.close()
+        self.ready.close()
+
+
 class VTG(klever.core.components.Component):
 
     def __init__(self, conf, logger, parent_id, mqs, vals, cur_id=None, work_dir=None, attrs=None,
@@ -49,6 +165,11 @@ class VTG(klever.core.components.Component):
         self.fragment_descs = {}
         self.resource_limits = klever.core.utils.read_max_resource_limitations(self.logger, self.conf)
         self.max_worker_threads = klever.core.utils.get_parallel_threads_num(self.logger, self.conf, 'EMG')
+        # Generate tasks by a fixed number of long-lived processes rather than by a new process per each task
+        self.persistent_workers = self.conf.get('persistent task generation workers', False)
+        self.prepare_workers = []
+        self.pool = None
+        self.pool_emgw = 0
 
     def generate_verification_tasks(self):
         self.__extract_fragments_descs()
@@ -273,7 +394,44 @@ class VTG(klever.core.components.Component):
 
         self.logger.info("Generated %s requirement classes from given descriptions", len(self.req_spec_classes))
 
+    def __start_pool(self):
+        pool_size = max(self.max_worker_threads,
+                        klever.core.utils.get_parallel_threads_num(self.logger, self.conf, 'Plugins'))
+        self.logger.info('Start %s persistent workers to generate tasks', pool_size)
+        self.pool = VTGWPool(self.logger, pool_size, self.__create_pool_worker)
+        self.pool.start()
+        reserve_workers_cpu_cores(pool_size)
+
+    def __create_pool_worker(self, index, tasks, ready):
+        return VTGWPoolWorker(self.conf, self.logger, self.parent_id, self.mqs, self.vals, index, tasks, ready,
+                              self.fragment_descs, self.resource_limits)
+
+    def __gradual_submit_to_pool(self, items_queue, quota):
+        # Workers should not die, but if it happens due to OOM killer or so, consider their tasks as failed ones. VTG
+        # will process failures like other results, so counters of tasks being processed will be decreased as well.
+        for kind, identifier, _, _, task in self.pool.check():
+            self.logger.warning('Failed to generate %s since its worker has exited', identifier)
+            report_task_failure(self.conf, self.mqs, Abstract(*task) if kind == EMGW.__name__ else Task(*task))
+
+        # Keep the number of abstract tasks being processed simultaneously within the limit for EMG
+        submitted = 0
+        for index in self.pool.idle:
+            if submitted >= quota or not items_queue:
+                break
+            if items_queue[-1][0] == EMGW.__name__:
+                if self.pool_emgw >= self.max_worker_threads:
+                    break
+                self.pool_emgw += 1
+            self.pool.submit(index, items_queue.pop())
+            submitted += 1
+
+        self.logger.info("Submitted %s new tasks to persistent workers", submitted)
+        return submitted
+
     def __gradual_submit(self, items_queue, quota):
+        if self.persistent_workers:
+            return self.__gradual_submit_to_pool(items_queue, quota)
+
         # Because we use i for deletion we always delete the element near the end to not break order of
         # following of the rest unprocessed elements
         for i, p in reversed(list(enumerate(list(self.prepare_workers)))):
@@ -334,9 +492,7 @@ class VTG(klever.core.components.Component):
                     identifier = "EMGW/{}/{}".format(fragment, rule_class_id)
                     workdir = os.path.join(fragment, "rule_class_{}".format(rule_class_id))
                     plugin_conf = next(iter(self.req_spec_classes[rule_class_id].values()))['plugins'][0]
-                    worker = EMGW(self.conf, self.logger, self.parent_id, self.mqs, self.vals, identifier,
-                                  workdir, plugin_conf, self.fragment_descs[fragment], task, self.resource_limits)
-                    prepare.append(worker)
+                    prepare.append(self.__create_worker(EMGW, identifier, workdir, plugin_conf, task))
 
         self.logger.info('There are %s abstract tasks in total', len(prepare))
 
@@ -358,6 +514,8 @@ class VTG(klever.core.components.Component):
         self.prepare_workers = []
         is_agile_threads = True
         clear_workers_cpu_cores()
+        if self.persistent_workers:
+            self.__start_pool()
 
         while prepare or waiting:
             self.logger.debug('Going to process %s tasks and abstract tasks and wait for %s', len(prepare), waiting)
@@ -366,14 +524,23 @@ class VTG(klever.core.components.Component):
             quota = (max_tasks - waiting) if max_tasks > waiting else 0
             waiting += self.__gradual_submit(prepare, quota)
 
-            # Get processed abstract tasks.
-            new_items = klever.core.utils.get_waiting_first(self.mqs['processed'], timeout=3)
+            # Get processed abstract tasks. Wake up as soon as either new items come or some worker finishes, so new
+            # workers can be started immediately.
+            if self.persistent_workers:
+                klever.core.components.wait_for_events(self.pool.workers, [self.mqs['processed'], self.pool.ready],
+                                                       timeout=3)
+            else:
+                klever.core.components.wait_for_events(self.prepare_workers, [self.mqs['processed']], timeout=3)
+            new_items = []
+            klever.core.utils.drain_queue(new_items, self.mqs['processed'])
             for kind, desc, *other in new_items:
                 waiting -= 1
                 self.logger.debug('Received item %s', kind)
                 if kind == Abstract.__name__:
                     atask = Abstract(*desc)
                     left_abstract_tasks -= 1
+                    if self.persistent_workers:
+                        self.pool_emgw -= 1
                     models = None
                     if other:
                         aworkdir, models = other
@@ -395,10 +562,8 @@ class VTG(klever.core.components.Component):
                                 identifier = "PLUGINS/{}/{}/{}/{}".format(atask.fragment, atask.rule_class,
                                                                           env_model, rule)
                                 plugin_conf = self.req_spec_classes[atask.rule_class][rule]['plugins'][1:]
-                                worker = PLUGINS(self.conf, self.logger, self.parent_id, self.mqs, self.vals,
-                                                 identifier, new_workdir, plugin_conf,
-                                                 self.fragment_descs[atask.fragment], new, self.resource_limits)
-                                prepare.append(worker)
+                                prepare.append(self.__create_worker(PLUGINS, identifier, new_workdir, plugin_conf,
+                                                                    new))
                                 if not single_model:
                                     total_tasks += 1
                     else:
@@ -447,17 +612,95 @@ class VTG(klever.core.components.Component):
                             del atask_tasks[atask]
                             del atask_work_dirs[atask]
 
+        if self.persistent_workers:
+            self.pool.stop()
         clear_workers_cpu_cores()
         # Close the queue
         self.mqs['processed'].close()
 
         self.logger.info("Stop generating verification tasks")
 
+    def __create_worker(self, worker_class, identifier, workdir, plugin_conf, task):
+        if self.persistent_workers:
+            # Persistent workers will create components by themselves
+            return worker_class.__name__, identifier, workdir, plugin_conf, tuple(task)
+
+        return worker_class(self.conf, self.logger, self.parent_id, self.mqs, self.vals, identifier, workdir,
+                            plugin_conf, self.fragment_descs[task.fragment], task, self.resource_limits)
+
+
+class VTGWPoolWorker(klever.core.components.Component):
+    """
+    Long-lived process that generates tasks one by one. It keeps imported plugins, their instances and opened build
+    bases, so tasks generation does not suffer from forking new processes and their startup.
+    """
+
+    def __init__(self, conf, logger, parent_id, mqs, vals, index, tasks, ready, fragment_descs, resource_limits):
+        super().__init__(conf, logger, parent_id, mqs, vals, 'VTGWPoolWorker{}'.format(index))
+        # Each worker has its own resources file
+        self.name = 'VTGWPoolWorker{}'.format(index)
+        self.index = index
+        self.tasks = tasks
+        self.ready = ready
+        self.fragment_descs = fragment_descs
+        self.resource_limits = resource_limits
+        # Plugin instances by plugin names
+        self.plugins = {}
+
+    def process_tasks(self):
+        while True:
+            item = self.tasks.get()
+            if item is None:
+                break
+
+            kind, identifier, workdir, plugin_conf, task = item
+            if kind == EMGW.__name__:
+                worker = EMGW(self.conf, self.logger, self.parent_id, self.mqs, self.vals, identifier, workdir,
+                              plugin_conf, self.fragment_descs[task[0]], Abstract(*task), self.resource_limits,
+                              self.plugins)
+            else:
+                worker = PLUGINS(self.conf, self.logger, self.parent_id, self.mqs, self.vals, identifier, workdir,
+                                 plugin_conf, self.fragment_descs[task[0]], Task(*task), self.resource_limits,
+                                 self.plugins)
+            self.__run_worker(worker)
+            self.ready.put(self.index)
+
+        self.logger.info('Persistent worker has finished')
+
+    main = process_tasks
+
+    def __run_worker(self, worker):
+        loggers = {name: list(logger.handlers) for name, logger in logging.root.manager.loggerDict.items()
+                   if isinstance(logger, logging.Logger)}
+        start_cpu_time = klever.core.components.get_cpu_time()
+        limits = {limit: resource.getrlimit(limit) for limit in (resource.RLIMIT_CPU, resource.RLIMIT_AS)}
+        try:
+            os.makedirs(worker.work_dir.encode('utf-8'), exist_ok=True)
+            worker.run()
+        except klever.core.components.ComponentError:
+            self.logger.warning('Failed to generate %s', worker.task)
+        finally:
+            # Tasks can change limitations and global state of plugins, so restore them for next tasks whatever happens
+            for limit, value in limits.items():
+                resource.prlimit(0, limit, value)
+            reset_types_state()
+
+            # Components get their loggers each time they start, so release handlers of finished ones
+            for name, logger in logging.root.manager.loggerDict.items():
+                if isinstance(logger, logging.Logger):
+                    for handler in list(logger.handlers):
+                        if handler not in loggers.get(name, ()):
+                            logger.removeHandler(handler)
+                            handler.close()
+
+            # Resources of the component are reported separately, so exclude them from resources of the worker
+            self.tasks_start_cpu_time += klever.core.components.get_cpu_time() - start_cpu_time
+
 
 class VTGW(klever.core.components.Component):
 
     def __init__(self, conf, logger, parent_id, mqs, vals, cur_id, work_dir, plugin_conf,
-                 fragment_desc, task, resource_limits):
+                 fragment_desc, task, resource_limits, plugins=None):
         super().__init__(conf, logger, parent_id, mqs, vals, cur_id, work_dir, [], True)
         self.initial_abstract_task_desc_file = 'initial abstract task.json'
         self.out_abstract_task_desc_file = 'abstract tasks.json'
@@ -470,6 +713,8 @@ class VTGW(klever.core.components.Component):
 
         self.fragment_desc = fragment_desc
         self.prepared_tasks = []
+        # Plugin instances to be reused by names if tasks are generated one by one within the same process
+        self.plugins = plugins
 
     def tasks_generator_worker(self):
         self._submit_attrs()
@@ -497,32 +742,27 @@ class VTGW(klever.core.components.Component):
         # current description of abstract verification task into plugin configuration.
         self.dump_if_necessary(plugin_conf_file, plugin_conf, "configuration of plugin {}".format(plugin_name))
 
-        plugin = getattr(importlib.import_module(f'.{plugin_name.lower()}', 'klever.core.vtg'), plugin_name)
-        p = plugin(plugin_conf, self.logger, self.id, self.mqs, self.vals, abstract_task_desc, plugin_name,
-                   # Weaver can execute workers in parallel but it does not launch any heavyweight subprocesses for
-                   # which it is necessary to include child resources. These workers can execute time consuming CIF and
-                   # appropriate resources are dumped to directory "child resources" and after all they are taken into
-                   # account when calculating Weaver resources since we wouldn't like to separately show resources
-                   # consumed by workers. Moreover, we even wouldn't like to execute them in separate working
-                   # directories like sub-jobs to simplify the workflow and debugging.
-                   include_child_resources=plugin_name != 'Weaver')
+        if self.plugins and plugin_name in self.plugins:
+            p = self.plugins[plugin_name]
+            p.reuse(plugin_conf, self.logger, self.id, abstract_task_desc)
+        else:
+            plugin = getattr(importlib.import_module(f'.{plugin_name.lower()}', 'klever.core.vtg'), plugin_name)
+            p = plugin(plugin_conf, self.logger, self.id, self.mqs, self.vals, abstract_task_desc, plugin_name,
+                       # Weaver can execute workers in parallel but it does not launch any heavyweight subprocesses for
+                       # which it is necessary to include child resources. These workers can execute time consuming
+                       # CIF and appropriate resources are dumped to directory "child resources" and after all they
+                       # are taken into account when calculating Weaver resources since we wouldn't like to separately
+                       # show resources consumed by workers. Moreover, we even wouldn't like to execute them in
+                       # separate working directories like sub-jobs to simplify the workflow and debugging.
+                       include_child_resources=plugin_name != 'Weaver')
+            if self.plugins is not None:
+                self.plugins[plugin_name] = p
 
         return p.run()
 
     def plugin_fail_processing(self):
         self.logger.debug('Submit the information about the failure to the Job processing class')
-        data = type(self.task).__name__, tuple(self.task)
-        self.mqs['processed'].put(data)
-        if 'verification statuses' in self.mqs:
-            self.mqs['verification statuses'].put({
-                'program fragment id': self.task.fragment,
-                'req spec id': self.task.rule if hasattr(self.task, 'rule') else self.task.rule_class,
-                'environment model': self.task.envmodel if hasattr(self.task, 'envmodel') else 'base',
-                'verdict': 'non-verifier unknown',
-                'sub-job identifier': self.conf['sub-job identifier'],
-                'ideal verdicts': self.conf['ideal verdicts'],
-                'data': self.conf.get('data')
-            })
+        report_task_failure(self.conf, self.mqs, self.task)
 
     def _submit_attrs(self):
         # Prepare program fragment description file
@@ -597,6 +837,10 @@ class EMGW(VTGW):
             'Got the following limitations for EMG: CPU time = %ss, '
             'memory = %sB', cpu_time_limit, memory_limit
         )
+        # CPU time limit is applied to the whole process which can generate several tasks one by one
+        cpu_time_limit += int(klever.core.components.get_cpu_time())
+        if hard_time != resource.RLIM_INFINITY:
+            cpu_time_limit = min(cpu_time_limit, hard_time)
         resource.prlimit(0, resource.RLIMIT_CPU, (cpu_time_limit, hard_time))
         resource.prlimit(0, resource.RLIMIT_AS, (memory_limit, hard_mem))
 
@@ -609,10 +853,10 @@ class EMGW(VTGW):
         except klever.core.components.ComponentError:
             self.logger.warning('EMG has failed')
             self.plugin_fail_processing()
-
-        # Restore limitations
-        resource.prlimit(0, resource.RLIMIT_CPU, (soft_time, hard_time))
-        resource.prlimit(0, resource.RLIMIT_AS, (soft_mem, hard_mem))
+        finally:
+            # Restore limitations
+            resource.prlimit(0, resource.RLIMIT_CPU, (soft_time, hard_time))
+            resource.prlimit(0, resource.RLIMIT_AS, (soft_mem, hard_mem))
 
     def __prepare_initial_abstract_task(self, fragment, rule_class):
         # Initial abstract verification task looks like corresponding program fragment.
@@ -667,20 +911,41 @@ class PLUGINS(VTGW):
 
         # VTG will consume this abstract verification task description file.
         if "task description" in final_task_data:
-            session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'])
-            task_id = session.schedule_task(final_task_data['task description'],
-                                            final_task_data['task archive'])
+            cache_key = None
+            cached_archive = None
+            task_id = None
+            if self.conf.get('verification results cache'):
+                cache_key = ResultsCache.get_key(final_task_data['task description'],
+                                                 final_task_data['task archive'])
+                # Keep cached decision results with task files until VRP processes them since they can be removed from
+                # the cache in between
+                cached_archive = ResultsCache(self.logger, self.conf['verification results cache']).get(
+                    cache_key, os.path.join(os.path.dirname(final_task_data['task archive']),
+                                            'cached decision result files.zip'))
+                if cached_archive:
+                    # There is no need to solve the task again, VRP will take decision results from the cache
+                    self.logger.info("Verification task was already solved, use cached decision results %s",
+                                     cache_key)
+                else:
+                    task_id = self.__schedule_task(final_task_data)
+            else:
+                task_id = self.__schedule_task(final_task_data)
 
             # Plan for checking status
             self.mqs['pending tasks'].put(
-                [str(task_id), tuple(self.task), final_task_data["result processing"], self.fragment_desc,
+                [task_id, tuple(self.task), final_task_data["result processing"], self.fragment_desc,
                  final_task_data['verifier'], final_task_data['additional sources'],
-                 final_task_data['verification task files']])
-
-            self.logger.info("Submitted successfully verification task for solution %s", task_id)
+                 final_task_data['verification task files'], cache_key, cached_archive])
         else:
             self.logger.warning("There is no verification task generated by the last plugin")
 
+    def __schedule_task(self, final_task_data):
+        session = klever.core.session.Session(self.logger, self.conf['Klever Bridge'], self.conf['identifier'],
+                                              self.vals)
+        task_id = session.schedule_task(final_task_data['task description'], final_task_data['task archive'])
+        self.logger.info("Submitted successfully verification task for solution %s", task_id)
+        return str(task_id)
+
     def _generate_abstract_verification_task_desc(self):
         # Prepare initial task desc
         self.logger.info("Start generating tasks for %s", self.task)
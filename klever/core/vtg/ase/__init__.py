@@ -17,7 +17,6 @@
 
 import fileinput
 import os
-from clade import Clade
 
 import klever.core.utils
 import klever.core.vtg.plugins
@@ -68,10 +67,7 @@ class ASE(klever.core.vtg.plugins.Plugin):
 
     def request_arg_signs(self):
         self.logger.info('Request argument signatures')
-        clade_conf = {"log_level": "ERROR"}
-        clade = Clade(work_dir=self.conf['build base'], conf=clade_conf)
-        if not clade.work_dir_ok():
-            raise RuntimeError('Build base is not OK')
+        clade = klever.core.utils.get_clade(self.conf['build base'])
         meta = clade.get_meta()
 
         for request_aspect in self.conf['request aspects']:
@@ -16,7 +16,9 @@
 #
 
 import copy
+import hashlib
 import json
+import os
 
 from klever.core.utils import report, report_image
 from klever.core.vtg.plugins import Plugin
@@ -26,6 +28,7 @@ from klever.core.vtg.emg.common.process import ProcessCollection
 from klever.core.vtg.emg.translation import translate_intermediate_model
 from klever.core.vtg.emg.decomposition import decompose_intermediate_model
 from klever.core.vtg.emg.common.c.source import create_source_representation
+from klever.core.vtg.emg.common.c.types.typeParser import load_parse_cache, save_parse_cache
 
 
 class EMG(Plugin):
@@ -46,6 +49,7 @@ class EMG(Plugin):
         self.logger.info("Start environment model generator %s", self.id)
 
         # Initialization of EMG
+        parse_cache = self.__load_parse_cache()
         self.logger.info("Import results of source analysis")
         sa = create_source_representation(self.logger, self.conf, self.abstract_task_desc)
 
@@ -86,6 +90,12 @@ class EMG(Plugin):
         if len(self.abstract_task_desc) == 0:
             raise ValueError('There is no generated environment models')
 
+        if parse_cache:
+            try:
+                save_parse_cache(parse_cache)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self.logger.warning("Cannot save parsed declarations to %r: %s", parse_cache, e)
+
         self.logger.info("Send data report to the server")
         self.send_data_report_if_necessary(self.id, data_report)
 
@@ -98,3 +108,18 @@ class EMG(Plugin):
                              self.mqs['report files'], self.vals['report id'], self.conf['main working directory'])
 
     main = generate_environment
+
+    def __load_parse_cache(self):
+        # Parsed declarations depend on nothing but declarations themselves. Keep them per build base since EMG runs
+        # for the same build base parse mostly the same declarations.
+        if not self.conf.get('parsed declarations cache'):
+            return None
+
+        parse_cache = os.path.join(
+            self.conf['parsed declarations cache'],
+            hashlib.sha256(os.path.realpath(self.conf['build base']).encode('utf-8')).hexdigest() + '.pickle')
+        try:
+            load_parse_cache(parse_cache)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.logger.warning("Cannot load parsed declarations from %r: %s", parse_cache, e)
+        return parse_cache
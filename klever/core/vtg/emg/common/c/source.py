@@ -15,14 +15,18 @@
 # limitations under the License.
 #
 
+import hashlib
 import os
+import pickle
 import re
+import tempfile
 import ujson
 import sortedcontainers
-from clade import Clade
 
+from klever.core.utils import get_clade
 from klever.core.vtg.emg.common.c import Function, Variable, Macro, import_declaration
-from klever.core.vtg.emg.common.c.types import import_typedefs, extract_name, dump_types
+from klever.core.vtg.emg.common.c.types import import_typedefs, extract_name, dump_types, get_types_state, \
+    set_types_state
 from klever.core.vtg.utils import find_file_or_dir
 
 
@@ -35,22 +39,28 @@ def create_source_representation(logger, conf, abstract_task):
     :param abstract_task: Abstract task dict.
     :return: Source object.
     """
-    # Initialize Clade client to make requests
-    clade_conf = {"log_level": "ERROR"}
-    clade = Clade(conf['build base'], conf=clade_conf)
-    if not clade.work_dir_ok():
-        raise RuntimeError('Build base is not OK')
+    # Abstract tasks for the same program fragment but different requirement specification classes result in the
+    # same source representation, so build it once and then load it from a snapshot
+    snapshot = _snapshot_file(logger, conf, abstract_task)
+    collection = _load_snapshot(logger, snapshot) if snapshot else None
 
-    prefixes = _prefixes(conf, clade)
+    if not collection:
+        # Initialize Clade client to make requests
+        clade = get_clade(conf['build base'])
 
-    # Ask for dependencies for each CC
-    cfiles, dep_paths, files_map = _collect_file_dependencies(clade, abstract_task)
+        prefixes = _prefixes(conf, clade)
 
-    # Read file with source analysis
-    collection = Source(cfiles, prefixes, dep_paths)
-    collection.c_full_paths = _c_full_paths(collection, cfiles)
+        # Ask for dependencies for each CC
+        cfiles, dep_paths, files_map = _collect_file_dependencies(clade, abstract_task)
+
+        # Read file with source analysis
+        collection = Source(cfiles, prefixes, dep_paths)
+        collection.c_full_paths = _c_full_paths(collection, cfiles)
+
+        _import_code_analysis(logger, conf, clade, files_map, collection)
+        if snapshot:
+            _save_snapshot(logger, snapshot, collection)
 
-    _import_code_analysis(logger, conf, clade, files_map, collection)
     if conf.get('dump types'):
         dump_types('type collection.json')
     if conf.get('dump source code analysis'):
@@ -58,6 +68,60 @@ def create_source_representation(logger, conf, abstract_task):
     return collection
 
 
+def _snapshot_file(logger, conf, abstract_task):
+    if not conf.get('cache source representations', True):
+        return None
+
+    # Source representation depends on nothing but the build base, working source trees, CCs of the program fragment
+    # and the white list of macros
+    key = hashlib.sha256()
+    key.update(ujson.dumps([
+        os.path.realpath(conf['build base']),
+        conf['working source trees'],
+        sorted(desc['CC'] for group in abstract_task['grps'] for desc in group['Extra CCs'])
+    ]).encode('utf-8'))
+    macros_file = conf.get('macros white list', 'linux/emg/macros white list.json')
+    if macros_file:
+        with open(find_file_or_dir(logger, conf['main working directory'], macros_file), 'rb') as fp:
+            key.update(fp.read())
+
+    return os.path.join(conf['main working directory'], 'source representations',
+                        '{}.pickle'.format(key.hexdigest()))
+
+
+def _load_snapshot(logger, snapshot):
+    if not os.path.isfile(snapshot):
+        return None
+
+    logger.info("Load source representation from %r", snapshot)
+    try:
+        with open(snapshot, 'rb') as fp:
+            collection, types_state = pickle.load(fp)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("Cannot load source representation from %r: %s", snapshot, e)
+        return None
+
+    # Functions and variables refer imported types, so restore them as well
+    set_types_state(*types_state)
+    return collection
+
+
+def _save_snapshot(logger, snapshot, collection):
+    # Several EMG instances can build the same source representation simultaneously, so never expose partially written
+    # snapshots
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(snapshot))
+        with os.fdopen(fd, 'wb') as fp:
+            pickle.dump((collection, get_types_state()), fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("Cannot save source representation to %r: %s", snapshot, e)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 def _prefixes(conf, clade):
     return {spath: clade.get_storage_path(spath) for spath in conf["working source trees"] + ['']}
 
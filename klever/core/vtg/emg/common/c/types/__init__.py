@@ -16,8 +16,8 @@
 #
 
 import re
-import copy
 import json
+import pickle
 import sortedcontainers
 
 from klever.core.vtg.emg.common.c.types.typeParser import parse_declaration
@@ -85,7 +85,9 @@ def import_typedefs(tds, dependencies):
         if name in _typedefs:
             _typedefs[typename][1].add(filename)
         else:
-            _typedefs[typename] = [typeast, {filename}]
+            # Keep abstract syntax trees pickled since their copies are obtained by unpickling much faster than by deep
+            # copying
+            _typedefs[typename] = [pickle.dumps(typeast, pickle.HIGHEST_PROTOCOL), {filename}]
 
     candidates = [t for t in _type_collection if isinstance(_type_collection[t], Primitive)]
     for dep, decl in ((dep, decl) for dep in sorted(tds.keys()) for decl in tds[dep]):
@@ -93,7 +95,7 @@ def import_typedefs(tds, dependencies):
             ast = parse_declaration(decl)
         except Exception as e:
             raise ValueError(f"Cannot parse typedef declaration: '{decl}'") from e
-        name = extract_name(decl)
+        name = extract_name(ast)
 
         add_file(ast, name, dep)
         for file in dependencies.get(dep, []):
@@ -142,7 +144,7 @@ def import_declaration(declaration, ast=None, track_typedef=False):
         ast_class = ast.get('specifiers', {}).get('type specifier', {}).get('class')
 
         if ast_class == 'typedef' and ast['specifiers']['type specifier']['name'] in _typedefs:
-            ret = import_declaration(None, copy.deepcopy(_typedefs[ast['specifiers']['type specifier']['name']][0]))
+            ret = import_declaration(None, pickle.loads(_typedefs[ast['specifiers']['type specifier']['name']][0]))
             ret.typedef = ast['specifiers']['type specifier']['name']
             typedef = ret.typedef
         elif ast_class == 'structure':
@@ -168,7 +170,7 @@ def import_declaration(declaration, ast=None, track_typedef=False):
                     ret = Union(ast)
                 elif ast_type == 'typedef' and ast['specifiers']['type specifier']['name'] in _typedefs:
                     type_name = ast['specifiers']['type specifier']['name']
-                    ret = import_declaration(None, copy.deepcopy(_typedefs[type_name][0]))
+                    ret = import_declaration(None, pickle.loads(_typedefs[type_name][0]))
                     ret.typedef = type_name
                     typedef = ret.typedef
                 else:
@@ -208,6 +210,41 @@ def dump_types(file_name):
         json.dump({str(k): v.dump() for k, v in _type_collection.items()}, fp, indent=2, sort_keys=True)
 
 
+def get_types_state():
+    """
+    Get imported types and typedefs to save them together with objects that refer them.
+
+    :return: Tuple (type collection, typedefs, last identifier of anonymous types).
+    """
+    return _type_collection, _typedefs, _noname_identifier
+
+
+def set_types_state(type_collection, typedefs, noname_identifier):
+    """
+    Replace imported types and typedefs with ones obtained by get_types_state() earlier.
+
+    :param type_collection: Type collection.
+    :param typedefs: Typedefs.
+    :param noname_identifier: Last identifier of anonymous types.
+    :return: None
+    """
+    global _type_collection, _typedefs, _noname_identifier
+
+    _type_collection = type_collection
+    _typedefs = typedefs
+    _noname_identifier = noname_identifier
+
+
+def reset_types_state():
+    """
+    Forget all imported types and typedefs. It is necessary when several environment models are generated one by one
+    within the same process.
+
+    :return: None
+    """
+    set_types_state(sortedcontainers.SortedDict(), sortedcontainers.SortedDict(), 0)
+
+
 def _take_pointer(exp, tp):
     if isinstance(tp, (Array, Function)):
         return '(*' + exp + ')'
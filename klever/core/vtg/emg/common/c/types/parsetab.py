@@ -0,0 +1,135 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'ATTRIBUTE BIT_SIZE_DELIMITER BLOCK_CLOSE BLOCK_OPEN COMMA DOTS END ENUM EQUAL_SIGN FUNCTION_SPECIFIER IDENTIFIER INTERFACE NUMBER PARENTH_CLOSE PARENTH_OPEN SQUARE_BCLOSE_SIGN SQUARE_BOPEN_SIGN STAR_SIGN STORAGE_CLASS_SPECIFIER STRING STRUCT TYPE_QUALIFIER TYPE_SPECIFIER UNION UNKNOWN\n    full_declaration : parameter_declaration BIT_SIZE_DELIMITER NUMBER END\n                     | parameter_declaration BIT_SIZE_DELIMITER NUMBER\n                     | parameter_declaration END\n                     | parameter_declaration\n    \n    declaration_specifiers_list : prefix_specifiers_list type_specifier suffix_specifiers_list\n                                | prefix_specifiers_list type_specifier\n                                | type_specifier suffix_specifiers_list\n                                | type_specifier\n    \n    prefix_specifiers_list : prefix_specifiers_option prefix_specifiers_list\n                           | prefix_specifiers_option\n    \n    prefix_specifiers_option : STORAGE_CLASS_SPECIFIER\n                             | TYPE_QUALIFIER\n                             | FUNCTION_SPECIFIER\n    \n    suffix_specifiers_list : suffix_specifiers_option suffix_specifiers_list\n                           | suffix_specifiers_option\n    \n    suffix_specifiers_option : TYPE_QUALIFIER\n    \n    type_specifier : type_specifier_list\n                   | struct_specifier\n                   | union_specifier\n                   | enum_specifier\n                   | typedef\n    \n    type_specifier_list : TYPE_SPECIFIER type_specifier_list\n                        | TYPE_SPECIFIER attribute_dict\n                        | TYPE_SPECIFIER\n    \n    struct_specifier : complete_struct_specifier attribute_dict\n                     | short_struct_specifier attribute_dict\n                     | complete_struct_specifier\n                     | short_struct_specifier\n    \n    short_struct_specifier : STRUCT BLOCK_OPEN struct_declaration_list BLOCK_CLOSE\n                           | STRUCT BLOCK_OPEN BLOCK_CLOSE\n    \n    complete_struct_specifier : STRUCT IDENTIFIER BLOCK_OPEN struct_declaration_list BLOCK_CLOSE\n                              | STRUCT IDENTIFIER BLOCK_OPEN BLOCK_CLOSE\n                              | STRUCT IDENTIFIER\n    \n    attribute_dict : attribute attribute_dict\n                   | attribute\n    \n    attribute : ATTRIBUTE PARENTH_OPEN PARENTH_OPEN inside_attr_list PARENTH_CLOSE PARENTH_CLOSE\n              | ATTRIBUTE PARENTH_OPEN PARENTH_OPEN PARENTH_CLOSE PARENTH_CLOSE\n    \n    inside_attr_list : inside_attr COMMA inside_attr_list\n                     | inside_attr\n    \n    inside_attr : IDENTIFIER PARENTH_OPEN attr_param_list PARENTH_CLOSE\n                | IDENTIFIER PARENTH_OPEN PARENTH_CLOSE\n                | IDENTIFIER\n    \n    attr_param_list : attr_param COMMA attr_param_list\n                    | attr_param\n    \n    attr_param : STRING IDENTIFIER STRING\n               | IDENTIFIER\n               | NUMBER\n    \n    struct_declaration_list : struct_declaration struct_declaration_list\n                            | struct_declaration\n    \n    struct_declaration : parameter_declaration BIT_SIZE_DELIMITER NUMBER END\n                       | parameter_declaration BIT_SIZE_DELIMITER NUMBER\n                       | parameter_declaration END\n    \n    union_specifier : union_partial_complex_specifier attribute_dict\n                    | union_partial_complex_specifier\n                    | union_partial_simple_specifier\n    \n    union_partial_simple_specifier : UNION IDENTIFIER\n    \n    union_partial_complex_specifier : UNION BLOCK_OPEN struct_declaration_list BLOCK_CLOSE\n                                    | UNION BLOCK_OPEN BLOCK_CLOSE\n    \n    enum_specifier : ENUM IDENTIFIER\n                   | ENUM BLOCK_OPEN enumerator_list BLOCK_CLOSE\n    \n    enumerator_list : enumerator COMMA enumerator_list\n                    | enumerator\n    \n    enumerator : IDENTIFIER\n               | IDENTIFIER EQUAL_SIGN NUMBER\n    \n    typedef : IDENTIFIER TYPE_SPECIFIER\n            | IDENTIFIER attribute_dict\n            | IDENTIFIER\n    \n    declarator : pointer direct_declarator\n               | direct_declarator\n    \n    pointer : STAR_SIGN suffix_specifiers_list pointer\n            | STAR_SIGN suffix_specifiers_list\n            | STAR_SIGN pointer\n            | STAR_SIGN\n    \n    direct_declarator : direct_declarator array_list\n                      | direct_declarator PARENTH_OPEN PARENTH_CLOSE\n                      | direct_declarator PARENTH_OPEN function_parameters_list PARENTH_CLOSE\n                      | PARENTH_OPEN declarator PARENTH_CLOSE\n                      | IDENTIFIER\n    \n    array_list : array_expression array_list\n               | array_expression\n    \n    array_expression : SQUARE_BOPEN_SIGN array_size SQUARE_BCLOSE_SIGN\n                     | SQUARE_BOPEN_SIGN SQUARE_BCLOSE_SIGN\n    \n    array_size : suffix_specifiers_list STAR_SIGN\n               | suffix_specifiers_list NUMBER\n               | STAR_SIGN\n               | NUMBER\n    \n    function_parameters_list : parameter_declaration COMMA function_parameters_list\n                             | parameter_declaration\n    \n    parameter_declaration : declaration_specifiers_list declarator\n                          | declaration_specifiers_list abstract_declarator\n                          | UNKNOWN declarator\n                          | INTERFACE declarator\n                          | UNKNOWN abstract_declarator\n                          | INTERFACE abstract_declarator\n                          | declaration_specifiers_list\n                          | UNKNOWN\n                          | INTERFACE\n                          | DOTS\n    \n    abstract_declarator : pointer direct_abstract_declarator\n                        | direct_abstract_declarator\n                        | pointer\n    \n    direct_abstract_declarator : direct_abstract_declarator array_list\n                               | direct_abstract_declarator PARENTH_OPEN PARENTH_CLOSE\n                               | direct_abstract_declarator PARENTH_OPEN function_parameters_list PARENTH_CLOSE\n                               | PARENTH_OPEN abstract_declarator PARENTH_CLOSE\n    '
+    
+_lr_action_items = {'UNKNOWN':([0,58,59,65,69,81,84,112,115,127,133,],[4,4,4,4,4,4,4,-52,4,-51,-50,]),'INTERFACE':([0,58,59,65,69,81,84,112,115,127,133,],[5,5,5,5,5,5,5,-52,5,-51,-50,]),'DOTS':([0,58,59,65,69,81,84,112,115,127,133,],[6,6,6,6,6,6,6,-52,6,-51,-50,]),'STORAGE_CLASS_SPECIFIER':([0,9,15,16,17,58,59,65,69,81,84,112,115,127,133,],[15,15,-11,-12,-13,15,15,15,15,15,15,-52,15,-51,-50,]),'TYPE_QUALIFIER':([0,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,24,34,41,43,44,46,47,48,50,51,52,53,55,56,57,58,59,60,65,67,69,76,81,83,84,87,104,108,109,112,113,115,126,127,130,133,134,],[16,44,16,-17,-18,-19,-20,-21,-11,-12,-13,-24,-27,-28,-54,-55,-67,44,44,44,-16,-22,-23,-35,-25,-26,-53,-59,-65,-66,-33,16,16,-56,16,44,16,-34,16,-30,16,-58,-60,-32,-29,-52,-57,16,-31,-51,-37,-50,-36,]),'FUNCTION_SPECIFIER':([0,9,15,16,17,58,59,65,69,81,84,112,115,127,133,],[17,17,-11,-12,-13,17,17,17,17,17,17,-52,17,-51,-50,]),'TYPE_SPECIFIER':([0,7,9,15,16,17,18,24,45,58,59,65,69,81,84,112,115,127,133,],[18,18,-10,-11,-12,-13,18,55,-9,18,18,18,18,18,18,-52,18,-51,-50,]),'ENUM':([0,7,9,15,16,17,45,58,59,65,69,81,84,112,115,127,133,],[23,23,-10,-11,-12,-13,-9,23,23,23,23,23,23,-52,23,-51,-50,]),'IDENTIFIER':([0,3,4,5,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,31,34,35,41,42,43,44,45,46,47,48,50,51,52,53,54,55,56,57,58,59,60,65,69,70,71,74,75,76,81,83,84,87,100,103,104,105,108,109,112,113,115,126,127,130,131,132,133,134,140,143,],[24,36,36,36,24,-8,-10,-17,-18,-19,-20,-21,-11,-12,-13,-24,-27,-28,-54,-55,53,-67,57,60,36,-73,36,-6,-7,-15,-16,-9,-22,-23,-35,-25,-26,-53,-59,80,-65,-66,-33,24,24,-56,24,24,-71,-72,-5,-14,-34,24,-30,24,-58,-70,123,-60,80,-32,-29,-52,-57,24,-31,-51,-37,123,136,-50,-36,144,136,]),'STRUCT':([0,7,9,15,16,17,45,58,59,65,69,81,84,112,115,127,133,],[25,25,-10,-11,-12,-13,-9,25,25,25,25,25,25,-52,25,-51,-50,]),'UNION':([0,7,9,15,16,17,45,58,59,65,69,81,84,112,115,127,133,],[26,26,-10,-11,-12,-13,-9,26,26,26,26,26,26,-52,26,-51,-50,]),'$end':([1,2,3,4,5,6,8,10,11,12,13,14,18,19,20,21,22,24,28,29,30,31,32,33,34,36,37,38,39,40,41,42,43,44,46,47,48,50,51,52,53,55,56,57,60,61,62,63,64,66,68,70,71,74,75,76,83,87,88,89,92,94,98,100,101,102,104,108,109,113,114,116,119,126,130,134,],[0,-4,-95,-96,-97,-98,-8,-17,-18,-19,-20,-21,-24,-27,-28,-54,-55,-67,-3,-89,-90,-101,-69,-100,-73,-78,-91,-93,-92,-94,-6,-7,-15,-16,-22,-23,-35,-25,-26,-53,-59,-65,-66,-33,-56,-2,-68,-99,-74,-80,-102,-71,-72,-5,-14,-34,-30,-58,-1,-75,-79,-82,-103,-70,-77,-105,-60,-32,-29,-57,-76,-81,-104,-31,-37,-36,]),'BIT_SIZE_DELIMITER':([2,3,4,5,6,8,10,11,12,13,14,18,19,20,21,22,24,29,30,31,32,33,34,36,37,38,39,40,41,42,43,44,46,47,48,50,51,52,53,55,56,57,60,62,63,64,66,68,70,71,74,75,76,83,85,87,89,92,94,98,100,101,102,104,108,109,113,114,116,119,126,130,134,],[27,-95,-96,-97,-98,-8,-17,-18,-19,-20,-21,-24,-27,-28,-54,-55,-67,-89,-90,-101,-69,-100,-73,-78,-91,-93,-92,-94,-6,-7,-15,-16,-22,-23,-35,-25,-26,-53,-59,-65,-66,-33,-56,-68,-99,-74,-80,-102,-71,-72,-5,-14,-34,-30,111,-58,-75,-79,-82,-103,-70,-77,-105,-60,-32,-29,-57,-76,-81,-104,-31,-37,-36,]),'END':([2,3,4,5,6,8,10,11,12,13,14,18,19,20,21,22,24,29,30,31,32,33,34,36,37,38,39,40,41,42,43,44,46,47,48,50,51,52,53,55,56,57,60,61,62,63,64,66,68,70,71,74,75,76,83,85,87,89,92,94,98,100,101,102,104,108,109,113,114,116,119,126,127,130,134,],[28,-95,-96,-97,-98,-8,-17,-18,-19,-20,-21,-24,-27,-28,-54,-55,-67,-89,-90,-101,-69,-100,-73,-78,-91,-93,-92,-94,-6,-7,-15,-16,-22,-23,-35,-25,-26,-53,-59,-65,-66,-33,-56,88,-68,-99,-74,-80,-102,-71,-72,-5,-14,-34,-30,112,-58,-75,-79,-82,-103,-70,-77,-105,-60,-32,-29,-57,-76,-81,-104,-31,133,-37,-36,]),'COMMA':([3,4,5,6,8,10,11,12,13,14,18,19,20,21,22,24,29,30,31,32,33,34,36,37,38,39,40,41,42,43,44,46,47,48,50,51,52,53,55,56,57,60,62,63,64,66,68,70,71,74,75,76,79,80,83,87,89,91,92,94,98,100,101,102,104,108,109,113,114,116,119,122,123,125,126,130,134,136,138,139,141,142,146,],[-95,-96,-97,-98,-8,-17,-18,-19,-20,-21,-24,-27,-28,-54,-55,-67,-89,-90,-101,-69,-100,-73,-78,-91,-93,-92,-94,-6,-7,-15,-16,-22,-23,-35,-25,-26,-53,-59,-65,-66,-33,-56,-68,-99,-74,-80,-102,-71,-72,-5,-14,-34,105,-63,-30,-58,-75,115,-79,-82,-103,-70,-77,-105,-60,-32,-29,-57,-76,-81,-104,131,-42,-64,-31,-37,-36,-46,-41,143,-47,-40,-45,]),'PARENTH_CLOSE':([3,4,5,6,8,10,11,12,13,14,18,19,20,21,22,24,29,30,31,32,33,34,36,37,38,39,40,41,42,43,44,46,47,48,50,51,52,53,55,56,57,60,62,63,64,65,66,68,69,70,71,72,73,74,75,76,83,87,89,90,91,92,94,98,99,100,101,102,103,104,108,109,113,114,116,119,120,121,122,123,126,128,129,130,132,134,135,136,137,138,139,141,142,145,146,],[-95,-96,-97,-98,-8,-17,-18,-19,-20,-21,-24,-27,-28,-54,-55,-67,-89,-90,-101,-69,-100,-73,-78,-91,-93,-92,-94,-6,-7,-15,-16,-22,-23,-35,-25,-26,-53,-59,-65,-66,-33,-56,-68,-99,-74,89,-80,-102,98,-71,-72,101,102,-5,-14,-34,-30,-58,-75,114,-88,-79,-82,-103,119,-70,-77,-105,121,-60,-32,-29,-57,-76,-81,-104,129,130,-39,-42,-31,-87,134,-37,138,-36,-38,-46,142,-41,-44,-47,-40,-43,-45,]),'STAR_SIGN':([3,4,5,8,10,11,12,13,14,18,19,20,21,22,24,34,35,41,42,43,44,46,47,48,50,51,52,53,55,56,57,60,67,70,74,75,76,83,87,95,104,108,109,113,126,130,134,],[34,34,34,-8,-17,-18,-19,-20,-21,-24,-27,-28,-54,-55,-67,34,34,-6,-7,-15,-16,-22,-23,-35,-25,-26,-53,-59,-65,-66,-33,-56,96,34,-5,-14,-34,-30,-58,117,-60,-32,-29,-57,-31,-37,-36,]),'PARENTH_OPEN':([3,4,5,8,10,11,12,13,14,18,19,20,21,22,24,31,32,33,34,35,36,41,42,43,44,46,47,48,49,50,51,52,53,55,56,57,60,62,63,64,66,68,70,71,74,75,76,77,83,87,89,92,94,98,100,101,102,104,108,109,113,114,116,119,123,126,130,134,],[35,35,35,-8,-17,-18,-19,-20,-21,-24,-27,-28,-54,-55,-67,35,65,69,-73,35,-78,-6,-7,-15,-16,-22,-23,-35,77,-25,-26,-53,-59,-65,-66,-33,-56,65,69,-74,-80,-102,-71,-72,-5,-14,-34,103,-30,-58,-75,-79,-82,-103,-70,-77,-105,-60,-32,-29,-57,-76,-81,-104,132,-31,-37,-36,]),'ATTRIBUTE':([18,19,20,21,24,48,57,83,87,108,109,113,126,130,134,],[49,49,49,49,49,49,-33,-30,-58,-32,-29,-57,-31,-37,-36,]),'BLOCK_OPEN':([23,25,26,57,],[54,58,59,81,]),'NUMBER':([27,43,44,67,75,95,106,111,132,143,],[61,-15,-16,97,-14,118,125,127,141,141,]),'SQUARE_BOPEN_SIGN':([32,33,36,62,63,64,66,68,89,92,94,98,101,102,114,116,119,],[67,67,-78,67,67,-74,67,-102,-75,-79,-82,-103,-77,-105,-76,-81,-104,]),'BLOCK_CLOSE':([58,59,78,79,80,81,82,84,86,107,110,112,124,125,127,133,],[83,87,104,-62,-63,108,109,-49,113,126,-48,-52,-61,-64,-51,-50,]),'SQUARE_BCLOSE_SIGN':([67,93,96,97,117,118,],[94,116,-85,-86,-83,-84,]),'EQUAL_SIGN':([80,],[106,]),'STRING':([132,143,144,],[140,140,146,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'full_declaration':([0,],[1,]),'parameter_declaration':([0,58,59,65,69,81,84,115,],[2,85,85,91,91,85,85,91,]),'declaration_specifiers_list':([0,58,59,65,69,81,84,115,],[3,3,3,3,3,3,3,3,]),'prefix_specifiers_list':([0,9,58,59,65,69,81,84,115,],[7,45,7,7,7,7,7,7,7,]),'type_specifier':([0,7,58,59,65,69,81,84,115,],[8,41,8,8,8,8,8,8,8,]),'prefix_specifiers_option':([0,9,58,59,65,69,81,84,115,],[9,9,9,9,9,9,9,9,9,]),'type_specifier_list':([0,7,18,58,59,65,69,81,84,115,],[10,10,46,10,10,10,10,10,10,10,]),'struct_specifier':([0,7,58,59,65,69,81,84,115,],[11,11,11,11,11,11,11,11,11,]),'union_specifier':([0,7,58,59,65,69,81,84,115,],[12,12,12,12,12,12,12,12,12,]),'enum_specifier':([0,7,58,59,65,69,81,84,115,],[13,13,13,13,13,13,13,13,13,]),'typedef':([0,7,58,59,65,69,81,84,115,],[14,14,14,14,14,14,14,14,14,]),'complete_struct_specifier':([0,7,58,59,65,69,81,84,115,],[19,19,19,19,19,19,19,19,19,]),'short_struct_specifier':([0,7,58,59,65,69,81,84,115,],[20,20,20,20,20,20,20,20,20,]),'union_partial_complex_specifier':([0,7,58,59,65,69,81,84,115,],[21,21,21,21,21,21,21,21,21,]),'union_partial_simple_specifier':([0,7,58,59,65,69,81,84,115,],[22,22,22,22,22,22,22,22,22,]),'declarator':([3,4,5,35,],[29,37,39,72,]),'abstract_declarator':([3,4,5,35,],[30,38,40,73,]),'pointer':([3,4,5,34,35,70,],[31,31,31,71,31,100,]),'direct_declarator':([3,4,5,31,35,],[32,32,32,62,32,]),'direct_abstract_declarator':([3,4,5,31,35,],[33,33,33,63,33,]),'suffix_specifiers_list':([8,34,41,43,67,],[42,70,74,75,95,]),'suffix_specifiers_option':([8,34,41,43,67,],[43,43,43,43,43,]),'attribute_dict':([18,19,20,21,24,48,],[47,50,51,52,56,76,]),'attribute':([18,19,20,21,24,48,],[48,48,48,48,48,48,]),'array_list':([32,33,62,63,66,],[64,68,64,68,92,]),'array_expression':([32,33,62,63,66,],[66,66,66,66,66,]),'enumerator_list':([54,105,],[78,124,]),'enumerator':([54,105,],[79,79,]),'struct_declaration_list':([58,59,81,84,],[82,86,107,110,]),'struct_declaration':([58,59,81,84,],[84,84,84,84,]),'function_parameters_list':([65,69,115,],[90,99,128,]),'array_size':([67,],[93,]),'inside_attr_list':([103,131,],[120,135,]),'inside_attr':([103,131,],[122,122,]),'attr_param_list':([132,143,],[137,145,]),'attr_param':([132,143,],[139,139,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> full_declaration","S'",1,None,None,None),
+  ('full_declaration -> parameter_declaration BIT_SIZE_DELIMITER NUMBER END','full_declaration',4,'p_full_declaration','typeParser.py',153),
+  ('full_declaration -> parameter_declaration BIT_SIZE_DELIMITER NUMBER','full_declaration',3,'p_full_declaration','typeParser.py',154),
+  ('full_declaration -> parameter_declaration END','full_declaration',2,'p_full_declaration','typeParser.py',155),
+  ('full_declaration -> parameter_declaration','full_declaration',1,'p_full_declaration','typeParser.py',156),
+  ('declaration_specifiers_list -> prefix_specifiers_list type_specifier suffix_specifiers_list','declaration_specifiers_list',3,'p_declaration_specifiers_list','typeParser.py',174),
+  ('declaration_specifiers_list -> prefix_specifiers_list type_specifier','declaration_specifiers_list',2,'p_declaration_specifiers_list','typeParser.py',175),
+  ('declaration_specifiers_list -> type_specifier suffix_specifiers_list','declaration_specifiers_list',2,'p_declaration_specifiers_list','typeParser.py',176),
+  ('declaration_specifiers_list -> type_specifier','declaration_specifiers_list',1,'p_declaration_specifiers_list','typeParser.py',177),
+  ('prefix_specifiers_list -> prefix_specifiers_option prefix_specifiers_list','prefix_specifiers_list',2,'p_prefix_specifiers_list','typeParser.py',211),
+  ('prefix_specifiers_list -> prefix_specifiers_option','prefix_specifiers_list',1,'p_prefix_specifiers_list','typeParser.py',212),
+  ('prefix_specifiers_option -> STORAGE_CLASS_SPECIFIER','prefix_specifiers_option',1,'p_prefix_specifiers_option','typeParser.py',219),
+  ('prefix_specifiers_option -> TYPE_QUALIFIER','prefix_specifiers_option',1,'p_prefix_specifiers_option','typeParser.py',220),
+  ('prefix_specifiers_option -> FUNCTION_SPECIFIER','prefix_specifiers_option',1,'p_prefix_specifiers_option','typeParser.py',221),
+  ('suffix_specifiers_list -> suffix_specifiers_option suffix_specifiers_list','suffix_specifiers_list',2,'p_suffix_specifiers_list','typeParser.py',229),
+  ('suffix_specifiers_list -> suffix_specifiers_option','suffix_specifiers_list',1,'p_suffix_specifiers_list','typeParser.py',230),
+  ('suffix_specifiers_option -> TYPE_QUALIFIER','suffix_specifiers_option',1,'p_suffix_specifiers_option','typeParser.py',237),
+  ('type_specifier -> type_specifier_list','type_specifier',1,'p_type_specifier','typeParser.py',245),
+  ('type_specifier -> struct_specifier','type_specifier',1,'p_type_specifier','typeParser.py',246),
+  ('type_specifier -> union_specifier','type_specifier',1,'p_type_specifier','typeParser.py',247),
+  ('type_specifier -> enum_specifier','type_specifier',1,'p_type_specifier','typeParser.py',248),
+  ('type_specifier -> typedef','type_specifier',1,'p_type_specifier','typeParser.py',249),
+  ('type_specifier_list -> TYPE_SPECIFIER type_specifier_list','type_specifier_list',2,'p_type_specifier_list','typeParser.py',263),
+  ('type_specifier_list -> TYPE_SPECIFIER attribute_dict','type_specifier_list',2,'p_type_specifier_list','typeParser.py',264),
+  ('type_specifier_list -> TYPE_SPECIFIER','type_specifier_list',1,'p_type_specifier_list','typeParser.py',265),
+  ('struct_specifier -> complete_struct_specifier attribute_dict','struct_specifier',2,'p_struct_specifier','typeParser.py',283),
+  ('struct_specifier -> short_struct_specifier attribute_dict','struct_specifier',2,'p_struct_specifier','typeParser.py',284),
+  ('struct_specifier -> complete_struct_specifier','struct_specifier',1,'p_struct_specifier','typeParser.py',285),
+  ('struct_specifier -> short_struct_specifier','struct_specifier',1,'p_struct_specifier','typeParser.py',286),
+  ('short_struct_specifier -> STRUCT BLOCK_OPEN struct_declaration_list BLOCK_CLOSE','short_struct_specifier',4,'p_short_struct_specifier','typeParser.py',297),
+  ('short_struct_specifier -> STRUCT BLOCK_OPEN BLOCK_CLOSE','short_struct_specifier',3,'p_short_struct_specifier','typeParser.py',298),
+  ('complete_struct_specifier -> STRUCT IDENTIFIER BLOCK_OPEN struct_declaration_list BLOCK_CLOSE','complete_struct_specifier',5,'p_complete_struct_specifier','typeParser.py',310),
+  ('complete_struct_specifier -> STRUCT IDENTIFIER BLOCK_OPEN BLOCK_CLOSE','complete_struct_specifier',4,'p_complete_struct_specifier','typeParser.py',311),
+  ('complete_struct_specifier -> STRUCT IDENTIFIER','complete_struct_specifier',2,'p_complete_struct_specifier','typeParser.py',312),
+  ('attribute_dict -> attribute attribute_dict','attribute_dict',2,'p_attribute_dict','typeParser.py',327),
+  ('attribute_dict -> attribute','attribute_dict',1,'p_attribute_dict','typeParser.py',328),
+  ('attribute -> ATTRIBUTE PARENTH_OPEN PARENTH_OPEN inside_attr_list PARENTH_CLOSE PARENTH_CLOSE','attribute',6,'p_attribute','typeParser.py',341),
+  ('attribute -> ATTRIBUTE PARENTH_OPEN PARENTH_OPEN PARENTH_CLOSE PARENTH_CLOSE','attribute',5,'p_attribute','typeParser.py',342),
+  ('inside_attr_list -> inside_attr COMMA inside_attr_list','inside_attr_list',3,'p_inside_attr_list','typeParser.py',356),
+  ('inside_attr_list -> inside_attr','inside_attr_list',1,'p_inside_attr_list','typeParser.py',357),
+  ('inside_attr -> IDENTIFIER PARENTH_OPEN attr_param_list PARENTH_CLOSE','inside_attr',4,'p_inside_attr','typeParser.py',370),
+  ('inside_attr -> IDENTIFIER PARENTH_OPEN PARENTH_CLOSE','inside_attr',3,'p_inside_attr','typeParser.py',371),
+  ('inside_attr -> IDENTIFIER','inside_attr',1,'p_inside_attr','typeParser.py',372),
+  ('attr_param_list -> attr_param COMMA attr_param_list','attr_param_list',3,'p_attr_param_list','typeParser.py',387),
+  ('attr_param_list -> attr_param','attr_param_list',1,'p_attr_param_list','typeParser.py',388),
+  ('attr_param -> STRING IDENTIFIER STRING','attr_param',3,'p_attr_param','typeParser.py',401),
+  ('attr_param -> IDENTIFIER','attr_param',1,'p_attr_param','typeParser.py',402),
+  ('attr_param -> NUMBER','attr_param',1,'p_attr_param','typeParser.py',403),
+  ('struct_declaration_list -> struct_declaration struct_declaration_list','struct_declaration_list',2,'p_struct_declaration_list','typeParser.py',415),
+  ('struct_declaration_list -> struct_declaration','struct_declaration_list',1,'p_struct_declaration_list','typeParser.py',416),
+  ('struct_declaration -> parameter_declaration BIT_SIZE_DELIMITER NUMBER END','struct_declaration',4,'p_struct_declaration','typeParser.py',423),
+  ('struct_declaration -> parameter_declaration BIT_SIZE_DELIMITER NUMBER','struct_declaration',3,'p_struct_declaration','typeParser.py',424),
+  ('struct_declaration -> parameter_declaration END','struct_declaration',2,'p_struct_declaration','typeParser.py',425),
+  ('union_specifier -> union_partial_complex_specifier attribute_dict','union_specifier',2,'p_union_specifier','typeParser.py',433),
+  ('union_specifier -> union_partial_complex_specifier','union_specifier',1,'p_union_specifier','typeParser.py',434),
+  ('union_specifier -> union_partial_simple_specifier','union_specifier',1,'p_union_specifier','typeParser.py',435),
+  ('union_partial_simple_specifier -> UNION IDENTIFIER','union_partial_simple_specifier',2,'p_union_partial_simple_specifier','typeParser.py',447),
+  ('union_partial_complex_specifier -> UNION BLOCK_OPEN struct_declaration_list BLOCK_CLOSE','union_partial_complex_specifier',4,'p_union_partial_complex_specifier','typeParser.py',454),
+  ('union_partial_complex_specifier -> UNION BLOCK_OPEN BLOCK_CLOSE','union_partial_complex_specifier',3,'p_union_partial_complex_specifier','typeParser.py',455),
+  ('enum_specifier -> ENUM IDENTIFIER','enum_specifier',2,'p_enum_specifier','typeParser.py',467),
+  ('enum_specifier -> ENUM BLOCK_OPEN enumerator_list BLOCK_CLOSE','enum_specifier',4,'p_enum_specifier','typeParser.py',468),
+  ('enumerator_list -> enumerator COMMA enumerator_list','enumerator_list',3,'p_enumerator_list','typeParser.py',484),
+  ('enumerator_list -> enumerator','enumerator_list',1,'p_enumerator_list','typeParser.py',485),
+  ('enumerator -> IDENTIFIER','enumerator',1,'p_enumerator','typeParser.py',492),
+  ('enumerator -> IDENTIFIER EQUAL_SIGN NUMBER','enumerator',3,'p_enumerator','typeParser.py',493),
+  ('typedef -> IDENTIFIER TYPE_SPECIFIER','typedef',2,'p_typedef','typeParser.py',501),
+  ('typedef -> IDENTIFIER attribute_dict','typedef',2,'p_typedef','typeParser.py',502),
+  ('typedef -> IDENTIFIER','typedef',1,'p_typedef','typeParser.py',503),
+  ('declarator -> pointer direct_declarator','declarator',2,'p_declarator','typeParser.py',514),
+  ('declarator -> direct_declarator','declarator',1,'p_declarator','typeParser.py',515),
+  ('pointer -> STAR_SIGN suffix_specifiers_list pointer','pointer',3,'p_pointer','typeParser.py',522),
+  ('pointer -> STAR_SIGN suffix_specifiers_list','pointer',2,'p_pointer','typeParser.py',523),
+  ('pointer -> STAR_SIGN pointer','pointer',2,'p_pointer','typeParser.py',524),
+  ('pointer -> STAR_SIGN','pointer',1,'p_pointer','typeParser.py',525),
+  ('direct_declarator -> direct_declarator array_list','direct_declarator',2,'p_direct_declarator','typeParser.py',543),
+  ('direct_declarator -> direct_declarator PARENTH_OPEN PARENTH_CLOSE','direct_declarator',3,'p_direct_declarator','typeParser.py',544),
+  ('direct_declarator -> direct_declarator PARENTH_OPEN function_parameters_list PARENTH_CLOSE','direct_declarator',4,'p_direct_declarator','typeParser.py',545),
+  ('direct_declarator -> PARENTH_OPEN declarator PARENTH_CLOSE','direct_declarator',3,'p_direct_declarator','typeParser.py',546),
+  ('direct_declarator -> IDENTIFIER','direct_declarator',1,'p_direct_declarator','typeParser.py',547),
+  ('array_list -> array_expression array_list','array_list',2,'p_array_list','typeParser.py',554),
+  ('array_list -> array_expression','array_list',1,'p_array_list','typeParser.py',555),
+  ('array_expression -> SQUARE_BOPEN_SIGN array_size SQUARE_BCLOSE_SIGN','array_expression',3,'p_array_expression','typeParser.py',562),
+  ('array_expression -> SQUARE_BOPEN_SIGN SQUARE_BCLOSE_SIGN','array_expression',2,'p_array_expression','typeParser.py',563),
+  ('array_size -> suffix_specifiers_list STAR_SIGN','array_size',2,'p_array_size','typeParser.py',576),
+  ('array_size -> suffix_specifiers_list NUMBER','array_size',2,'p_array_size','typeParser.py',577),
+  ('array_size -> STAR_SIGN','array_size',1,'p_array_size','typeParser.py',578),
+  ('array_size -> NUMBER','array_size',1,'p_array_size','typeParser.py',579),
+  ('function_parameters_list -> parameter_declaration COMMA function_parameters_list','function_parameters_list',3,'p_function_parameters_list','typeParser.py',596),
+  ('function_parameters_list -> parameter_declaration','function_parameters_list',1,'p_function_parameters_list','typeParser.py',597),
+  ('parameter_declaration -> declaration_specifiers_list declarator','parameter_declaration',2,'p_parameter_declaration','typeParser.py',604),
+  ('parameter_declaration -> declaration_specifiers_list abstract_declarator','parameter_declaration',2,'p_parameter_declaration','typeParser.py',605),
+  ('parameter_declaration -> UNKNOWN declarator','parameter_declaration',2,'p_parameter_declaration','typeParser.py',606),
+  ('parameter_declaration -> INTERFACE declarator','parameter_declaration',2,'p_parameter_declaration','typeParser.py',607),
+  ('parameter_declaration -> UNKNOWN abstract_declarator','parameter_declaration',2,'p_parameter_declaration','typeParser.py',608),
+  ('parameter_declaration -> INTERFACE abstract_declarator','parameter_declaration',2,'p_parameter_declaration','typeParser.py',609),
+  ('parameter_declaration -> declaration_specifiers_list','parameter_declaration',1,'p_parameter_declaration','typeParser.py',610),
+  ('parameter_declaration -> UNKNOWN','parameter_declaration',1,'p_parameter_declaration','typeParser.py',611),
+  ('parameter_declaration -> INTERFACE','parameter_declaration',1,'p_parameter_declaration','typeParser.py',612),
+  ('parameter_declaration -> DOTS','parameter_declaration',1,'p_parameter_declaration','typeParser.py',613),
+  ('abstract_declarator -> pointer direct_abstract_declarator','abstract_declarator',2,'p_abstract_declarator','typeParser.py',620),
+  ('abstract_declarator -> direct_abstract_declarator','abstract_declarator',1,'p_abstract_declarator','typeParser.py',621),
+  ('abstract_declarator -> pointer','abstract_declarator',1,'p_abstract_declarator','typeParser.py',622),
+  ('direct_abstract_declarator -> direct_abstract_declarator array_list','direct_abstract_declarator',2,'p_direct_abstract_declarator','typeParser.py',629),
+  ('direct_abstract_declarator -> direct_abstract_declarator PARENTH_OPEN PARENTH_CLOSE','direct_abstract_declarator',3,'p_direct_abstract_declarator','typeParser.py',630),
+  ('direct_abstract_declarator -> direct_abstract_declarator PARENTH_OPEN function_parameters_list PARENTH_CLOSE','direct_abstract_declarator',4,'p_direct_abstract_declarator','typeParser.py',631),
+  ('direct_abstract_declarator -> PARENTH_OPEN abstract_declarator PARENTH_CLOSE','direct_abstract_declarator',3,'p_direct_abstract_declarator','typeParser.py',632),
+]
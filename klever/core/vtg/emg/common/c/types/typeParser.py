@@ -15,7 +15,11 @@
 # limitations under the License.
 #
 
+import collections
+import os
+import pickle
 import re
+import tempfile
 import sortedcontainers
 from ply import lex
 from ply import yacc
@@ -23,6 +27,13 @@ from ply import yacc
 __parser = None
 __lexer = None
 
+# Maximum number of parsed declarations remembered by the process
+PARSE_CACHE_SIZE = 100000
+
+# Parsed declarations are stored pickled since unpickling is much faster than deep copying of abstract syntax trees
+__parse_cache = collections.OrderedDict()
+__parse_cache_updated = False
+
 tokens = (
     'STRING',
     'ATTRIBUTE',
@@ -787,17 +798,22 @@ def direct_declarator_processing(p):
     p[0] = declarator
 
 
-def setup_parser():
+def setup_parser(write_tables=False):
     """
     Setup the parser.
 
+    Parsing tables are prebuilt and shipped within the parsetab module. If the grammar is changed, tables are built
+    at runtime, so regenerate the module by calling this function with write_tables=True.
+
+    :param write_tables: Whether to write parsing tables to the parsetab module.
     :return: None
     """
     global __parser
     global __lexer
 
     __lexer = lex.lex()
-    __parser = yacc.yacc(debug=0, write_tables=0)
+    __parser = yacc.yacc(debug=0, write_tables=int(write_tables), tabmodule='parsetab',
+                         outputdir=os.path.dirname(__file__))
 
 
 def parse_declaration(string):
@@ -807,7 +823,68 @@ def parse_declaration(string):
     :param string: C declaration string.
     :return: Obtained abstract syntax tree.
     """
-    if not __parser:
-        setup_parser()
+    global __parse_cache_updated
+
+    try:
+        ast = __parse_cache[string]
+        __parse_cache.move_to_end(string)
+    except KeyError:
+        if not __parser:
+            setup_parser()
+
+        ast = pickle.dumps(__parser.parse(string, lexer=__lexer), pickle.HIGHEST_PROTOCOL)
+        __parse_cache[string] = ast
+        __parse_cache_updated = True
+        if len(__parse_cache) > PARSE_CACHE_SIZE:
+            __parse_cache.popitem(last=False)
+
+    # Callers modify obtained abstract syntax trees, so always return new ones
+    return pickle.loads(ast)
+
+
+def load_parse_cache(file):
+    """
+    Load parsed declarations saved by previous runs.
+
+    :param file: File with parsed declarations.
+    :return: None
+    """
+    global __parse_cache_updated
+
+    if not os.path.isfile(file):
+        return
+
+    with open(file, 'rb') as fp:
+        cache = pickle.load(fp)
+
+    for string, ast in cache.items():
+        __parse_cache.setdefault(string, ast)
+    while len(__parse_cache) > PARSE_CACHE_SIZE:
+        __parse_cache.popitem(last=False)
+    __parse_cache_updated = False
+
+
+def save_parse_cache(file):
+    """
+    Save parsed declarations for next runs if there are new ones.
+
+    :param file: File with parsed declarations.
+    :return: None
+    """
+    global __parse_cache_updated
+
+    if not __parse_cache_updated:
+        return
 
-    return __parser.parse(string, lexer=__lexer)
+    # Several processes can share the file, so never expose partially written ones
+    os.makedirs(os.path.dirname(os.path.abspath(file)), exist_ok=True)
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file)))
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            pickle.dump(dict(__parse_cache), fp, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, file)
+    except Exception:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    __parse_cache_updated = False
@@ -149,6 +149,12 @@ class BasicGenerationStrategy:
         # Keep reference to additional sources. It will be used for verification reports.
         task_desc['additional sources'] = self.abstract_task_desc['additional sources']
 
+        # Schedulers sharing the file system with Klever Core can pass solution files through the storage rather than
+        # via Bridge.
+        if self.conf.get('solutions storage'):
+            task_desc['solutions storage'] = os.path.join(self.conf['main working directory'],
+                                                          self.conf['solutions storage'])
+
         return task_desc
 
     def _prepare_task_files(self, benchmark_definition):
@@ -33,6 +33,24 @@ class Plugin(klever.core.components.Component):
             os.makedirs(work_dir.encode('utf-8'))
         self.abstract_task_desc = abstract_task_desc
 
+    def reuse(self, conf, logger, parent_id, abstract_task_desc):
+        """
+        Prepare the plugin to process one more abstract verification task within the same process.
+
+        :param conf: Configuration.
+        :param logger: Parent logger.
+        :param parent_id: Parent identifier.
+        :param abstract_task_desc: Abstract verification task description.
+        :return: None
+        """
+        self.reset(conf, logger, parent_id)
+
+        if not os.path.isdir(self.work_dir):
+            self.logger.info(
+                'Create working directory "%s" for component "%s"', self.work_dir, self.name)
+            os.makedirs(self.work_dir.encode('utf-8'))
+        self.abstract_task_desc = abstract_task_desc
+
     def run(self):
         super().run()
         self.logger.info('Plugin has finished')
@@ -16,7 +16,6 @@
 #
 
 import os
-from clade import Clade
 
 import klever.core.utils
 import klever.core.vtg.plugins
@@ -196,10 +195,7 @@ class RSG(klever.core.vtg.plugins.Plugin):
 
         # Generate CC full description file per each model and add it to abstract task description.
         # First of all obtain CC options to be used to compile models.
-        clade_conf = {"log_level": "ERROR"}
-        clade = Clade(self.conf['build base'], conf=clade_conf)
-        if not clade.work_dir_ok():
-            raise RuntimeError('Build base is not OK')
+        clade = klever.core.utils.get_clade(self.conf['build base'])
         meta = clade.get_meta()
 
         if not meta['conf'].get('Compiler.preprocess_cmds', False):
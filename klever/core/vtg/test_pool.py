@@ -0,0 +1,120 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import logging
+import multiprocessing
+import os
+import signal
+import time
+
+import pytest
+
+from klever.core.components import wait_for_events
+from klever.core.vtg import Abstract, Task, VTGWPool, report_task_failure
+
+
+class Worker(multiprocessing.Process):
+
+    def __init__(self, index, tasks, ready, results):
+        super().__init__()
+        self.index = index
+        self.tasks = tasks
+        self.ready = ready
+        self.results = results
+
+    def run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                break
+            if task == 'die':
+                # Like OOM killer does
+                os.kill(os.getpid(), signal.SIGKILL)
+            self.results.put((self.index, task))
+            self.ready.put(self.index)
+
+
+@pytest.fixture()
+def results():
+    return multiprocessing.Queue()
+
+
+@pytest.fixture()
+def pool(results):
+    pool = VTGWPool(logging.getLogger('test'), 2, lambda index, tasks, ready: Worker(index, tasks, ready, results))
+    pool.start()
+    yield pool
+    pool.stop()
+    assert all(worker.exitcode == 0 for worker in pool.workers)
+
+
+def wait_idle(pool, number, timeout=10):
+    lost = []
+    deadline = time.time() + timeout
+    while len(pool.idle) < number and time.time() < deadline:
+        wait_for_events(pool.workers, [pool.ready], 0.1)
+        lost.extend(pool.check())
+    return lost
+
+
+def test_completion(pool, results):
+    assert pool.idle == [0, 1]
+    pool.submit(0, 'a')
+    pool.submit(1, 'b')
+    assert not pool.idle
+
+    assert sorted(results.get(timeout=10) for _ in range(2)) == [(0, 'a'), (1, 'b')]
+    assert not wait_idle(pool, 2)
+    assert pool.idle == [0, 1]
+
+    pool.submit(1, 'c')
+    assert results.get(timeout=10) == (1, 'c')
+    assert not wait_idle(pool, 2)
+
+
+def test_worker_death(pool, results):
+    worker = pool.workers[0]
+    pool.submit(0, 'die')
+    pool.submit(1, 'a')
+    assert results.get(timeout=10) == (1, 'a')
+
+    worker.join(10)
+    assert worker.exitcode == -signal.SIGKILL
+    # The task of the killed worker is returned just once and the worker is replaced with a new one
+    assert wait_idle(pool, 2) == ['die']
+    assert not pool.check()
+    assert pool.workers[0] is not worker
+    assert pool.workers[0].is_alive()
+
+    pool.submit(0, 'b')
+    assert results.get(timeout=10) == (0, 'b')
+    assert not wait_idle(pool, 2)
+
+
+def test_report_task_failure():
+    conf = {'sub-job identifier': 'sub-job', 'ideal verdicts': []}
+    mqs = {'processed': multiprocessing.Queue(), 'verification statuses': multiprocessing.Queue()}
+
+    report_task_failure(conf, mqs, Abstract('drv.ko', 0))
+    assert mqs['processed'].get(timeout=10) == (Abstract.__name__, ('drv.ko', 0))
+    assert mqs['verification statuses'].get(timeout=10)['environment model'] == 'base'
+
+    report_task_failure(conf, mqs, Task('drv.ko', 0, 'model', 'rule', 'workdir', ()))
+    assert mqs['processed'].get(timeout=10) == (Task.__name__, ('drv.ko', 0, 'model', 'rule', 'workdir', ()))
+    status = mqs['verification statuses'].get(timeout=10)
+    assert (status['req spec id'], status['environment model']) == ('rule', 'model')
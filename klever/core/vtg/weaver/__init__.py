@@ -28,6 +28,7 @@ import klever.core.utils
 import klever.core.vtg.utils
 import klever.core.vtg.plugins
 from klever.core.cross_refs import CrossRefs
+from klever.core.vtg.weaver.cache import WeavingCache, DEFAULT_MAX_SIZE
 
 
 class Weaver(klever.core.vtg.plugins.Plugin):
@@ -37,10 +38,7 @@ class Weaver(klever.core.vtg.plugins.Plugin):
 
         search_dirs = klever.core.utils.get_search_dirs(self.conf['main working directory'], abs_paths=True)
 
-        clade_conf = {"log_level": "ERROR"}
-        clade = Clade(self.conf['build base'], conf=clade_conf)
-        if not clade.work_dir_ok():
-            raise RuntimeError('Build base is not OK')
+        clade = klever.core.utils.get_clade(self.conf['build base'])
         clade_meta = clade.get_meta()
 
         env = dict(os.environ)
@@ -98,6 +96,11 @@ class Weaver(klever.core.vtg.plugins.Plugin):
         self.abstract_task_desc['extra C files'] = list(vals['extra C files'])
         extra_cc_indexes_queue.close()
 
+        statistics = WeavingCache(self.logger, self.conf.get('weaving cache directory', self.conf['cache directory']),
+                                  self.conf.get('weaving cache size', DEFAULT_MAX_SIZE)).get_statistics()
+        self.logger.info('Weaving cache has %s hits, %s misses and %s evictions in total, its size is %s bytes',
+                         statistics['hits'], statistics['misses'], statistics['evictions'], statistics['size'])
+
         # For auxiliary files there is no cross references since it is rather hard to get them from Aspectator. But
         # there still highlighting.
         if self.conf['code coverage details'] == 'All source files':
@@ -264,9 +267,24 @@ class WeaverWorker(klever.core.components.Component):
         is_model = self.grp_id == 'models'
 
         # Original sources should be woven in and we do not need to get cross references for them since this
-        # was already done before.
+        # was already done before. Many verification tasks weave in the same original sources with the same aspects,
+        # so use the weaving cache for them.
         if not is_model:
-            self.__weave(infile, opts, aspect, outfile_unique, cwd, is_model)
+            weaving_cache = WeavingCache(self.logger,
+                                         self.conf.get('weaving cache directory', self.conf['cache directory']),
+                                         self.conf.get('weaving cache size', DEFAULT_MAX_SIZE))
+            cif, general_opts, compiler_opts, env_opts = self.__get_cif_cmd_opts(opts)
+            cif_path = shutil.which(cif)
+            # Results can change after updating CIF.
+            cache_key = WeavingCache.get_key(infile, aspect, cwd, [
+                cif, os.stat(cif_path).st_mtime_ns if cif_path else None, general_opts, compiler_opts, env_opts
+            ])
+            if weaving_cache.get(cache_key, outfile_unique):
+                self.vals['extra C files'].append(
+                    {'C file': os.path.relpath(outfile_unique, self.conf['main working directory'])})
+            else:
+                self.__weave(infile, opts, aspect, outfile_unique, cwd, is_model)
+                weaving_cache.put(cache_key, outfile_unique)
         # For generated models we need to weave them in (actually, just pass through C Back-end) and to get
         # cross references always since most likely they all are different.
         elif 'generated' in self.extra_cc:
@@ -312,30 +330,41 @@ class WeaverWorker(klever.core.components.Component):
 
     main = process_extra_cc
 
-    def __weave(self, infile, opts, aspect, outfile, cwd, is_model):
+    def __get_cif_cmd_opts(self, opts, is_model=False):
+        # Return CIF and everything besides input and output files that affects its results.
+        cif = klever.core.vtg.utils.get_cif_or_aspectator_exec(self.conf, 'cif')
         common_headers = []
         for common_header in self.conf['common headers']:
             common_headers.extend(['-include', common_header])
+
+        general_opts = [
+            # Besides header files specific for requirements specifications will be searched for.
+            '--general-opts',
+            '-I' + os.path.join(os.path.dirname(self.conf['specifications base']), 'include'),
+            '--aspect-preprocessing-opts', ' '.join(self.conf['aspect preprocessing options'])
+            if 'aspect preprocessing options' in self.conf else '',
+            '--back-end', 'src',
+            '--debug', 'QUIET'
+        ]
+        compiler_opts = (
+            ['--'] + common_headers +
+            klever.core.vtg.utils.prepare_cif_opts(opts, self.clade, is_model) +
+            ['-I' + self.clade.get_storage_path(p) for p in self.conf['working source trees']]
+        )
+        env_opts = [(name, value) for name, value in sorted(self.env.items()) if name.startswith('LDV_')]
+
+        return cif, general_opts, compiler_opts, env_opts
+
+    def __weave(self, infile, opts, aspect, outfile, cwd, is_model):
+        cif, general_opts, compiler_opts, _ = self.__get_cif_cmd_opts(opts, is_model)
         klever.core.utils.execute(
             self.logger,
             tuple(
-                [
-                    klever.core.vtg.utils.get_cif_or_aspectator_exec(self.conf, 'cif'),
-                    '--in', infile,
-                    # Besides header files specific for requirements specifications will be searched for.
-                    '--general-opts',
-                    '-I' + os.path.join(os.path.dirname(self.conf['specifications base']), 'include'),
-                    '--aspect-preprocessing-opts', ' '.join(self.conf['aspect preprocessing options'])
-                if 'aspect preprocessing options' in self.conf else '',
-                    '--out', os.path.realpath(outfile),
-                    '--back-end', 'src',
-                    '--debug', 'QUIET'
-                ] +
+                [cif, '--in', infile] + general_opts +
+                ['--out', os.path.realpath(outfile)] +
                 (['--keep'] if self.conf['keep intermediate files'] else []) +
                 (['--aspect', os.path.realpath(aspect)] if aspect else ['--stage', 'C-backend']) +
-                ['--'] + common_headers +
-                klever.core.vtg.utils.prepare_cif_opts(opts, self.clade, is_model) +
-                ['-I' + self.clade.get_storage_path(p) for p in self.conf['working source trees']]
+                compiler_opts
             ),
             env=self.env,
             cwd=cwd,
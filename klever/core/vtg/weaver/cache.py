@@ -0,0 +1,190 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import klever.core.utils
+
+# Default upper bound for a total size of woven in C files in bytes.
+DEFAULT_MAX_SIZE = 5 * 1024 ** 3
+# Evict least recently used entries until the total size becomes less than this part of the upper bound. This
+# decreases the number of quite expensive scans of the cache directory.
+EVICTION_LOW_WATERMARK = 0.8
+
+
+class WeavingCache:
+    """
+    Content addressed storage of C files woven in with aspects. It can be shared by different jobs, so the same original
+    source files woven in with the same aspects and options are passed through CIF just once. The cache is bounded by
+    size, least recently used entries are evicted.
+    """
+
+    STATISTICS_FILE = 'statistics.json'
+
+    def __init__(self, logger, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        self.logger = logger
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def get_key(infile, aspect, cwd, opts):
+        """
+        Calculate the key of the woven in C file on the basis of contents of the input file and the aspect and options.
+        Quoted includes are searched for relatively to the directory of the input file and the working directory, so
+        they take part in the key as well.
+
+        :param infile: Path to the input C file.
+        :param aspect: Path to the concatenated aspect or None.
+        :param cwd: Working directory.
+        :param opts: Anything JSON serializable that affects weaving in besides files, e.g. CIF options.
+        :return: Hex digest.
+        """
+        key = hashlib.sha256()
+        key.update(json.dumps([os.path.dirname(os.path.abspath(infile)), cwd]).encode('utf-8'))
+        key.update(b'\0')
+        key.update(klever.core.utils.get_file_checksum(infile).encode('utf-8'))
+        key.update(b'\0')
+        key.update(klever.core.utils.get_file_checksum(aspect).encode('utf-8') if aspect else b'')
+        key.update(b'\0')
+        key.update(json.dumps(opts, sort_keys=True).encode('utf-8'))
+        return key.hexdigest()
+
+    def __get_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + '.i')
+
+    def get(self, key, outfile):
+        """
+        Get the woven in C file.
+
+        :param key: Key of the woven in C file.
+        :param outfile: Path where the woven in C file should be placed.
+        :return: True if the file was found in the cache and False otherwise.
+        """
+        path = self.__get_path(key)
+        try:
+            # Remember when the entry was used last time for eviction. Access times can be not updated by file systems.
+            os.utime(path)
+            # Do not refer files within the cache directly since they can be evicted at any moment.
+            if os.path.exists(outfile):
+                os.remove(outfile)
+            try:
+                os.link(path, outfile)
+            except OSError as e:
+                if isinstance(e, FileNotFoundError):
+                    raise
+                shutil.copy(path, outfile)
+        except FileNotFoundError:
+            self.__update_statistics(misses=1)
+            return False
+
+        self.logger.info('Found cached woven in C file "%s"', path)
+        self.__update_statistics(hits=1)
+        return True
+
+    def put(self, key, outfile):
+        """
+        Save the woven in C file and evict least recently used entries if the cache became too large.
+
+        :param key: Key of the woven in C file.
+        :param outfile: Path to the woven in C file.
+        :return: None
+        """
+        path = self.__get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Several workers and jobs can share the cache, so never expose partially written files.
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as fp, open(outfile, 'rb') as outfile_fp:
+                shutil.copyfileobj(outfile_fp, fp)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.logger.info('Cache woven in C file as "%s"', path)
+        if self.__update_statistics(size=size)['size'] > self.max_size:
+            self.__evict()
+
+    def get_statistics(self):
+        """
+        Get statistics of the cache.
+
+        :return: Dictionary with the total size of entries in bytes and numbers of hits, misses and evicted entries.
+        """
+        return self.__update_statistics()
+
+    def __update_statistics(self, size_base=None, **deltas):
+        with klever.core.utils.LockedOpen(os.path.join(self.cache_dir, self.STATISTICS_FILE), 'a+',
+                                          encoding='utf-8') as fp:
+            fp.seek(0)
+            content = fp.read()
+            statistics = {'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+            if content:
+                statistics.update(json.loads(content))
+
+            if size_base is not None:
+                statistics['size'] = size_base
+            if deltas or size_base is not None:
+                for name, delta in deltas.items():
+                    statistics[name] += delta
+                fp.truncate(0)
+                json.dump(statistics, fp, sort_keys=True)
+
+        return statistics
+
+    def __evict(self):
+        with klever.core.utils.LockedOpen(os.path.join(self.cache_dir, 'eviction'), 'w'):
+            entries = []
+            for root, _, files in os.walk(self.cache_dir):
+                for file in files:
+                    if not file.endswith('.i'):
+                        continue
+
+                    path = os.path.join(root, file)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            # Recalculate the total size from scratch since it can drift because of entries that were overwritten by
+            # concurrent workers.
+            size = sum(entry[1] for entry in entries)
+            evicted_size = 0
+            evictions = 0
+            for _, entry_size, path in sorted(entries):
+                if size - evicted_size < self.max_size * EVICTION_LOW_WATERMARK:
+                    break
+
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                evicted_size += entry_size
+                evictions += 1
+
+            self.__update_statistics(size_base=size - evicted_size, evictions=evictions)
+            self.logger.info('Evict %s least recently used woven in C files of total size %s bytes', evictions,
+                             evicted_size)
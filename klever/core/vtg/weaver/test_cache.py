@@ -0,0 +1,127 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import logging
+import os
+
+import pytest
+
+from klever.core.vtg.weaver.cache import WeavingCache
+
+
+def make_file(path, content):
+    with open(path, 'w', encoding='utf-8') as fp:
+        fp.write(content)
+    return str(path)
+
+
+def read_file(path):
+    with open(path, encoding='utf-8') as fp:
+        return fp.read()
+
+
+def entry_path(cache, key):
+    return os.path.join(cache.cache_dir, key[:2], key + '.i')
+
+
+def touch(path, timestamp):
+    os.utime(path, (timestamp, timestamp))
+
+
+@pytest.fixture()
+def cache(tmp_path):
+    return WeavingCache(logging.getLogger('test'), str(tmp_path / 'cache'), max_size=100)
+
+
+def test_key(tmp_path):
+    cwd = str(tmp_path)
+    infile = make_file(tmp_path / 'a.c', 'int a;')
+    same_infile = make_file(tmp_path / 'b.c', 'int a;')
+    other_infile = make_file(tmp_path / 'c.c', 'int c;')
+    aspect = make_file(tmp_path / 'a.aspect', 'before: file ("$this") {}')
+
+    key = WeavingCache.get_key(infile, aspect, cwd, ['cif', ['--debug', 'QUIET']])
+    assert key == WeavingCache.get_key(same_infile, aspect, cwd, ['cif', ['--debug', 'QUIET']])
+    assert key != WeavingCache.get_key(other_infile, aspect, cwd, ['cif', ['--debug', 'QUIET']])
+    assert key != WeavingCache.get_key(infile, None, cwd, ['cif', ['--debug', 'QUIET']])
+    assert key != WeavingCache.get_key(infile, aspect, cwd, ['cif', ['--debug', 'ALL']])
+    assert key != WeavingCache.get_key(infile, aspect, cwd + '/build', ['cif', ['--debug', 'QUIET']])
+
+
+def test_key_directories(tmp_path):
+    # Quoted includes of the same sources can refer different headers in different directories
+    cwd = str(tmp_path)
+    for directory in ('drv1', 'drv2'):
+        os.makedirs(tmp_path / directory)
+        make_file(tmp_path / directory / 'drv.h', '#define NAME "{}"'.format(directory))
+    infile1 = make_file(tmp_path / 'drv1' / 'drv.c', '#include "drv.h"')
+    infile2 = make_file(tmp_path / 'drv2' / 'drv.c', '#include "drv.h"')
+
+    assert WeavingCache.get_key(infile1, None, cwd, []) != WeavingCache.get_key(infile2, None, cwd, [])
+    assert WeavingCache.get_key(infile1, None, cwd, []) == WeavingCache.get_key(infile1, None, cwd, [])
+
+
+def test_get_put(cache, tmp_path):
+    outfile = str(tmp_path / 'out.i')
+    assert not cache.get('ab' * 32, outfile)
+    assert not os.path.exists(outfile)
+
+    cache.put('ab' * 32, make_file(tmp_path / 'woven.i', 'int a;'))
+    assert cache.get('ab' * 32, outfile)
+    assert read_file(outfile) == 'int a;'
+
+    # Existing output files are replaced rather than overwritten since they can be hard links to cached files
+    os.remove(outfile)
+    make_file(outfile, 'int b;')
+    assert cache.get('ab' * 32, outfile)
+    assert read_file(outfile) == 'int a;'
+    assert not cache.get('cd' * 32, outfile)
+
+
+def test_statistics(cache, tmp_path):
+    assert cache.get_statistics() == {'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+
+    cache.put('ab' * 32, make_file(tmp_path / 'woven.i', 'x' * 10))
+    cache.get('ab' * 32, str(tmp_path / 'out1.i'))
+    cache.get('ab' * 32, str(tmp_path / 'out2.i'))
+    cache.get('cd' * 32, str(tmp_path / 'out3.i'))
+    assert cache.get_statistics() == {'size': 10, 'hits': 2, 'misses': 1, 'evictions': 0}
+
+    # Statistics are shared by all instances referring the same directory
+    other_cache = WeavingCache(logging.getLogger('test'), cache.cache_dir, max_size=100)
+    assert other_cache.get_statistics() == cache.get_statistics()
+
+
+def test_eviction(cache, tmp_path):
+    keys = ['{:02x}'.format(i) * 32 for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.put(key, make_file(tmp_path / 'woven.i', 'x' * 35))
+        touch(entry_path(cache, key), 1000 + i)
+
+    # The first entry becomes the most recently used one
+    assert cache.get(keys[0], str(tmp_path / 'out.i'))
+    touch(entry_path(cache, keys[0]), 2000)
+
+    # Total size exceeds the limit, so entries are evicted until it becomes less than the low watermark
+    cache.put(keys[2], make_file(tmp_path / 'woven.i', 'x' * 35))
+    assert not os.path.exists(entry_path(cache, keys[1]))
+    assert os.path.exists(entry_path(cache, keys[0]))
+    assert os.path.exists(entry_path(cache, keys[2]))
+    assert cache.get_statistics() == {'size': 70, 'hits': 1, 'misses': 0, 'evictions': 1}
+
+    assert not cache.get(keys[1], str(tmp_path / 'out.i'))
+    assert cache.get(keys[2], str(tmp_path / 'out.i'))
@@ -209,7 +209,7 @@ def solve_task(logger, conf, srv):
         decision_results['uploaded'] = True
 
     submit_task_results(logger, srv, conf["identifier"], decision_results, os.path.curdir, speculative=speculative,
-                        local_run=local_run)
+                        local_run=local_run, solutions_storage=conf.get('solutions storage'))
 
     return exit_code
 
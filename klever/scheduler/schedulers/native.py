@@ -169,6 +169,8 @@ class BaseNativeRunner(Runner):
             self._manager.check_resources(configuration, job=False)
             if 'task files' in configuration:
                 client_conf["task files"] = configuration['task files']
+            if 'solutions storage' in configuration:
+                client_conf["solutions storage"] = configuration['solutions storage']
         else:
             subdir = 'jobs'
             client_conf = self._job_conf_prototype.copy()
@@ -27,13 +27,14 @@ import signal
 import zipfile
 import re
 import glob
-import multiprocessing
 import sys
 from xml.etree import ElementTree
 import yaml
 
 from klever.scheduler.utils import consul
+from klever.scheduler.utils.disk_usage import DiskUsageMonitor, scan_dir
 from klever.core.utils import memory_units_converter, StreamQueue
+from klever.core.solutions_store import SolutionsStore, is_solution_file
 
 # This should prevent rumbling of urllib3
 logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -262,21 +263,7 @@ def dir_size(dir_path):
     """
     if not os.path.isdir(dir_path):
         raise ValueError('Expect existing directory but it is not: {}'.format(dir_path))
-    # TODO: this measurement requires too much overheads
-    # Currently we suggest to turn on options "runexec measure disk" and "benchexec measure disk" to prevent
-    # measurements with du commands.
-    output = get_output('du -bs {} | cut -f1'.format(dir_path))
-    try:
-        res = int(output)
-    except ValueError as e:
-        # One of the files inside the dir has been removed. We should delete the warning message.
-        splts = output.split('\n')
-        if len(splts) < 2:
-            # Can not delete the warning message
-            raise e
-
-        res = int(splts[-1])
-    return res
+    return sum(scan_dir(dir_path).values())
 
 
 def execute(args, env=None, cwd=None, timeout=0.5, logger=None, stderr=sys.stderr, stdout=sys.stdout,
@@ -292,7 +279,8 @@ def execute(args, env=None, cwd=None, timeout=0.5, logger=None, stderr=sys.stder
     :param stderr: Pipe or file descriptor to redirect output. Use it if logger is not provided.
     :param stderr: Pipe or file descriptor to redirect output. Use it if logger is not provided.
     :param disk_limitation: Allowed integer size of disk memory in Bytes of current working directory.
-    :param disk_checking_period: Integer number of seconds for the disk space measuring interval.
+    :param disk_checking_period: Integer number of seconds for repeating termination of the process exceeding the disk
+                                 space limitation and for measuring disk space if it can not be tracked incrementally.
     :return: subprocess.Popen.returncode.
     """
     original_sigint_handler = signal.getsignal(signal.SIGINT)
@@ -340,35 +328,32 @@ def execute(args, env=None, cwd=None, timeout=0.5, logger=None, stderr=sys.stder
         signal.signal(signal.SIGTERM, handler)
         signal.signal(signal.SIGINT, handler)
 
-    def disk_controller(pid, limitation, period):
-        while process_alive(pid):
-            s = dir_size("./")
-            if s > limitation:
-                # Kill the process
-                print("Reached disk memory limit of {}GB, killing process {}"
-                      .format(memory_units_converter(limitation, 'GB')[0], pid))
-
-                with open('termination-reason.txt', 'w', encoding='utf-8') as fp:
-                    fp.write(
-                        "Process was terminated since it consumed {}GB of disk space while only {}GB is allowed {}"
-                        .format(memory_units_converter(s, 'GB')[0], memory_units_converter(limitation, 'GB')[0],
-                                "(you may need to adjust job solution settings)")
-                    )
-                    fp.flush()
+    def activate_disk_limitation(pid, limitation):
+        if not limitation:
+            return None
 
-                os.kill(pid, signal.SIGINT)
+        termination_reason_file = os.path.abspath('termination-reason.txt')
 
-            time.sleep(period)
+        def disk_controller(s):
+            if not process_alive(pid):
+                return
 
-        os._exit(0)
+            # Kill the process
+            print("Reached disk memory limit of {}GB, killing process {}"
+                  .format(memory_units_converter(limitation, 'GB')[0], pid))
 
-    def activate_disk_limitation(pid, limitation):
-        if limitation:
-            checker = multiprocessing.Process(target=disk_controller, args=(pid, limitation, disk_checking_period))
-            checker.start()
-            return checker
+            with open(termination_reason_file, 'w', encoding='utf-8') as fp:
+                fp.write(
+                    "Process was terminated since it consumed {}GB of disk space while only {}GB is allowed {}"
+                    .format(memory_units_converter(s, 'GB')[0], memory_units_converter(limitation, 'GB')[0],
+                            "(you may need to adjust job solution settings)")
+                )
+                fp.flush()
+
+            os.kill(pid, signal.SIGINT)
 
-        return None
+        # Disk usage is tracked incrementally by the single thread rather than measured periodically from scratch
+        return DiskUsageMonitor.get().watch(os.path.curdir, limitation, disk_controller, disk_checking_period)
 
     set_handlers()
     cmd = args[0]
@@ -409,8 +394,7 @@ def execute(args, env=None, cwd=None, timeout=0.5, logger=None, stderr=sys.stder
 
     p.wait()
     if disk_checker:
-        disk_checker.terminate()
-        disk_checker.join()
+        DiskUsageMonitor.get().unwatch(disk_checker)
     restore_handlers()
 
     return p.returncode
@@ -459,10 +443,11 @@ def process_task_results(logger):
     return decision_results
 
 
-def submit_task_results(logger, server, identifier, decision_results, solution_path, speculative=False, local_run=False):
+def submit_task_results(logger, server, identifier, decision_results, solution_path, speculative=False, local_run=False,
+                        solutions_storage=None):
     """
-    Pack output directory prepared by BenchExec and prepare report archive with decision results and
-    upload it to the server.
+    Pack files of output directory prepared by BenchExec that are necessary for Klever Core and prepare report archive
+    with decision results and upload it to the server.
 
     :param logger: Logger object.
     :param server: server.AbstractServer object.
@@ -471,8 +456,14 @@ def submit_task_results(logger, server, identifier, decision_results, solution_p
     :param solution_path: Path to the directory with solution files.
     :param speculative: Do not upload solution to Bridge.
     :param local_run: if the run is local, no need to transfer decision results via Bridge.
+    :param solutions_storage: Path to the storage of solution files shared with Klever Core. If it is specified, then
+                              solution files are put there rather than transferred via Bridge.
     :return: None
     """
+    if solutions_storage and not speculative:
+        logger.debug("Put solution files to the storage: {}".format(solutions_storage))
+        decision_results['solution files'] = SolutionsStore(logger, solutions_storage).put(solution_path)
+        decision_results['solution files']['storage'] = solutions_storage
 
     results_file = os.path.join(solution_path, "decision results.json")
     logger.debug("Save decision results to the disk: {}".format(os.path.abspath(results_file)))
@@ -483,19 +474,21 @@ def submit_task_results(logger, server, identifier, decision_results, solution_p
 
     results_archive = os.path.join(solution_path, 'decision result files.zip')
     logger.debug("Save decision results and files to the archive: {}".format(os.path.abspath(results_archive)))
-    with open(results_archive, mode='w+b', buffering=0) as fp:
-        with zipfile.ZipFile(fp, mode='w', compression=zipfile.ZIP_DEFLATED) as zfp:
-            zfp.write(os.path.join(solution_path, "decision results.json"), "decision results.json")
-            if local_run:
-                # Prepare a small archive, as Bridge requires it
-                # the other files will be accessed directly via file system
-                pass
-            else:
-                for dirpath, _, filenames in os.walk(os.path.join(solution_path, "output")):
-                    for filename in filenames:
-                        zfp.write(os.path.join(dirpath, filename),
-                                  os.path.join(os.path.relpath(dirpath, solution_path), filename))
-            os.fsync(zfp.fp)
+    # The archive is uploaded just after its creation, so there is no need to sync it to the disk. Prefer speed of
+    # compression to its ratio since large solution files are transferred within the local network at most.
+    with zipfile.ZipFile(results_archive, mode='w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zfp:
+        zfp.write(os.path.join(solution_path, "decision results.json"), "decision results.json")
+        if local_run or 'solution files' in decision_results:
+            # Prepare a small archive, as Bridge requires it
+            # the other files will be accessed directly via file system
+            pass
+        else:
+            for dirpath, _, filenames in os.walk(os.path.join(solution_path, "output")):
+                for filename in filenames:
+                    arcname = os.path.join(os.path.relpath(dirpath, solution_path), filename)
+                    # Klever Core does not need other files
+                    if is_solution_file(arcname):
+                        zfp.write(os.path.join(dirpath, filename), arcname)
 
     if not speculative:
         server.submit_solution(identifier, decision_results, results_archive)
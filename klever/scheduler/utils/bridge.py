@@ -19,6 +19,8 @@ import time
 import zipfile
 import requests
 
+from klever.core.solutions_store import BUFFER_SIZE
+
 
 class UnexpectedStatusCode(IOError):
     pass
@@ -120,7 +122,7 @@ class Session:
 
                 self.logger.debug('Write archive to {}'.format(archive))
                 with open(archive, 'wb') as fp:
-                    for chunk in resp.iter_content(1024):
+                    for chunk in resp.iter_content(BUFFER_SIZE):
                         fp.write(chunk)
 
                 if not zipfile.is_zipfile(archive) or zipfile.ZipFile(archive).testzip(): # pylint: disable=consider-using-with
@@ -0,0 +1,363 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import ctypes
+import ctypes.util
+import errno
+import itertools
+import os
+import select
+import stat
+import struct
+import threading
+import time
+
+# Events of inotify that can change disk usage (see inotify(7)).
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+
+EVENT_HEADER = struct.Struct('iIII')
+# Events are read by large chunks to decrease the number of system calls when verifiers write a lot.
+EVENTS_BUFFER_SIZE = 64 * 1024
+# Maximum time in seconds to wait for events before checking whether watches were added or removed.
+POLL_TIMEOUT = 1
+
+
+def _walk_dir(dir_path):
+    # Yield paths and stats of all files and directories within the given directory including itself
+    dirs = [dir_path]
+    while dirs:
+        cur_dir = dirs.pop()
+        try:
+            yield cur_dir, os.lstat(cur_dir)
+            entries = list(os.scandir(cur_dir))
+        except FileNotFoundError:
+            continue
+
+        for entry in entries:
+            try:
+                entry_stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+
+            if stat.S_ISDIR(entry_stat.st_mode):
+                dirs.append(entry.path)
+            else:
+                yield entry.path, entry_stat
+
+
+def scan_dir(dir_path):
+    """
+    Get sizes of all files and directories within the given directory including itself. Like "du -b" it measures
+    apparent sizes and takes into account hard links just once.
+
+    :param dir_path: Path string.
+    :return: Dictionary {path: size in Bytes}.
+    """
+    sizes = {}
+    inodes = set()
+    for path, path_stat in _walk_dir(dir_path):
+        if not stat.S_ISDIR(path_stat.st_mode):
+            if (path_stat.st_dev, path_stat.st_ino) in inodes:
+                continue
+            if path_stat.st_nlink > 1:
+                inodes.add((path_stat.st_dev, path_stat.st_ino))
+        sizes[path] = path_stat.st_size
+
+    return sizes
+
+
+class _Inotify:
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+
+    def add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()), path)
+        return wd
+
+    def rm_watch(self, wd):
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self, timeout):
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return
+
+        try:
+            data = os.read(self.fd, EVENTS_BUFFER_SIZE)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            yield wd, mask, os.fsdecode(name)
+
+
+class DirectoryWatch:
+    """Disk usage of the directory tracked by DiskUsageMonitor."""
+
+    def __init__(self, path, limitation, callback, period):
+        self.path = path
+        self.limitation = limitation
+        self.callback = callback
+        self.period = period
+        # Sizes of files and directories. Like in scan_dir() files having several hard links are counted just once, i.e.
+        # they are kept by one of their paths.
+        self.sizes = {}
+        self.size = 0
+        # Inodes of files by their paths and paths of files by their inodes. Link counts of files that were created
+        # before their hard links can be not updated on time, so all files are tracked.
+        self.inodes = {}
+        self.paths = {}
+        self.wds = {}
+        self.polling = False
+        self.last_update = 0
+        self.last_callback = None
+
+    def rescan(self):
+        self.sizes = {}
+        self.size = 0
+        self.inodes = {}
+        self.paths = {}
+        for path, path_stat in _walk_dir(self.path):
+            self.__add(path, path_stat)
+        self.last_update = time.time()
+
+    def add_dir(self, path):
+        for nested, nested_stat in _walk_dir(path):
+            self.__forget(nested)
+            self.__add(nested, nested_stat)
+
+    def update(self, path):
+        try:
+            path_stat = os.lstat(path)
+        except FileNotFoundError:
+            self.remove(path)
+            return
+
+        # The path can refer another file now, e.g. after renaming, so forget about the previous one
+        self.__forget(path)
+        self.__add(path, path_stat)
+
+    def remove(self, path, is_dir=False):
+        self.__forget(path)
+        if is_dir:
+            prefix = os.path.join(path, '')
+            for nested in {p for p in itertools.chain(self.sizes, self.inodes) if p.startswith(prefix)}:
+                self.__forget(nested)
+
+    def __add(self, path, path_stat):
+        if not stat.S_ISDIR(path_stat.st_mode):
+            inode = (path_stat.st_dev, path_stat.st_ino)
+            paths = self.paths.setdefault(inode, set())
+            paths.add(path)
+            self.inodes[path] = inode
+            # Update the size of the file by the path it is already counted by if so
+            path = next((p for p in paths if p in self.sizes), path)
+
+        self.size += path_stat.st_size - self.sizes.get(path, 0)
+        self.sizes[path] = path_stat.st_size
+
+    def __forget(self, path):
+        size = self.sizes.pop(path, None)
+        if size is not None:
+            self.size -= size
+
+        inode = self.inodes.pop(path, None)
+        if inode is None:
+            return
+
+        paths = self.paths[inode]
+        paths.discard(path)
+        if not paths:
+            del self.paths[inode]
+        elif size is not None:
+            # The file is still available by other links, so count it by one of them
+            other_path = next(iter(paths))
+            self.sizes[other_path] = size
+            self.size += size
+
+    def check(self):
+        if self.size > self.limitation:
+            now = time.time()
+            # Repeat notifications since they can be ignored until the process goes on consuming disk space
+            if self.last_callback is None or now - self.last_callback >= self.period:
+                self.last_callback = now
+                self.callback(self.size)
+
+
+class DiskUsageMonitor:
+    """
+    Track disk usage of directories incrementally on the base of inotify events rather than measuring it periodically
+    from scratch. All directories are watched by a single thread per process. If inotify is not available or the limit
+    of watches is reached, then directories are rescanned periodically without launching any external commands.
+    """
+
+    _instance = None
+    _instance_pid = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__watches = []
+        self.__wds = {}
+        try:
+            self.__inotify = _Inotify()
+        except (OSError, AttributeError):
+            self.__inotify = None
+        self.__thread = threading.Thread(target=self.__run, name='disk usage monitor', daemon=True)
+        self.__thread.start()
+
+    @classmethod
+    def get(cls):
+        """
+        Get the monitor of the current process. Threads are not inherited by forked processes, so the monitor is
+        created again in them.
+
+        :return: DiskUsageMonitor object.
+        """
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance_pid != os.getpid():
+                cls._instance = cls()
+                cls._instance_pid = os.getpid()
+            return cls._instance
+
+    def watch(self, path, limitation, callback, period=30):
+        """
+        Start tracking disk usage of the directory.
+
+        :param path: Path to the directory.
+        :param limitation: Allowed integer size of disk memory in Bytes.
+        :param callback: Function to call with the current disk usage when it exceeds the limitation. It is called
+                         again each period seconds until disk usage becomes less than the limitation.
+        :param period: Integer number of seconds for repeating callback calls and for rescanning the directory if
+                       inotify is not available.
+        :return: DirectoryWatch object.
+        """
+        watch = DirectoryWatch(os.path.abspath(path), limitation, callback, period)
+        with self.__lock:
+            # Add watches before scanning to not miss files created in between
+            self.__add_watches(watch, watch.path)
+            watch.rescan()
+            self.__watches.append(watch)
+        return watch
+
+    def unwatch(self, watch):
+        """
+        Stop tracking disk usage of the directory.
+
+        :param watch: DirectoryWatch object returned by watch().
+        :return: None
+        """
+        with self.__lock:
+            self.__watches.remove(watch)
+            for wd in watch.wds:
+                self.__wds.pop(wd, None)
+                self.__inotify.rm_watch(wd)
+
+    def __add_watches(self, watch, path):
+        if not self.__inotify or watch.polling:
+            watch.polling = True
+            return
+
+        dirs = [path]
+        while dirs:
+            cur_dir = dirs.pop()
+            try:
+                wd = self.__inotify.add_watch(cur_dir)
+            except OSError as e:
+                if e.errno in (errno.ENOENT, errno.ENOTDIR):
+                    continue
+                # There is a system-wide limit of inotify watches, so fall back to rescanning the directory
+                watch.polling = True
+                return
+
+            watch.wds[wd] = cur_dir
+            self.__wds[wd] = watch
+            try:
+                dirs.extend(entry.path for entry in os.scandir(cur_dir)
+                            if entry.is_dir(follow_symlinks=False))
+            except FileNotFoundError:
+                pass
+
+    def __run(self):
+        while True:
+            changed = {}
+            if self.__inotify:
+                for wd, mask, name in self.__inotify.read_events(POLL_TIMEOUT):
+                    with self.__lock:
+                        self.__process_event(changed, wd, mask, name)
+            else:
+                time.sleep(POLL_TIMEOUT)
+
+            with self.__lock:
+                for watch, paths in changed.items():
+                    if watch in self.__watches:
+                        for path in paths:
+                            watch.update(path)
+
+                now = time.time()
+                for watch in self.__watches:
+                    if watch.polling and now - watch.last_update >= watch.period:
+                        watch.rescan()
+                    watch.check()
+
+    def __process_event(self, changed, wd, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            # Some events were lost, so there is no way except for rescanning all directories
+            for watch in self.__watches:
+                watch.rescan()
+            return
+
+        watch = self.__wds.get(wd)
+        if not watch:
+            return
+
+        if mask & IN_IGNORED:
+            del self.__wds[wd]
+            watch.wds.pop(wd, None)
+            return
+
+        path = os.path.join(watch.wds[wd], name) if name else watch.wds[wd]
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            changed.get(watch, set()).discard(path)
+            watch.remove(path, is_dir=bool(mask & IN_ISDIR))
+        elif mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+            self.__add_watches(watch, path)
+            watch.add_dir(path)
+        else:
+            changed.setdefault(watch, set()).add(path)
@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2025 ISP RAS (http://www.ispras.ru)
+# Ivannikov Institute for System Programming of the Russian Academy of Sciences
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os
+import shutil
+import time
+
+import pytest
+
+from klever.scheduler.utils import disk_usage
+from klever.scheduler.utils.disk_usage import DiskUsageMonitor, scan_dir
+
+
+def make_file(path, size):
+    with open(path, 'a', encoding='utf-8') as fp:
+        fp.write('x' * size)
+
+
+def wait_for(predicate, timeout=10):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.1)
+    return predicate()
+
+
+def check_changes(watch, path):
+    def check():
+        return wait_for(lambda: watch.size == sum(scan_dir(str(path)).values()))
+
+    make_file(path / 'a', 100)
+    os.makedirs(path / 'd' / 'e')
+    make_file(path / 'd' / 'b', 10)
+    assert check()
+
+    # Hard links are counted just once whatever files are created, changed or removed first
+    os.link(path / 'a', path / 'd' / 'e' / 'c')
+    assert check()
+    make_file(path / 'd' / 'e' / 'c', 50)
+    assert check()
+    os.remove(path / 'a')
+    assert check()
+    os.link(path / 'd' / 'e' / 'c', path / 'f')
+    shutil.rmtree(path / 'd')
+    assert check()
+    assert watch.size > 150
+
+    os.remove(path / 'f')
+    assert check()
+
+
+@pytest.fixture()
+def monitor():
+    return DiskUsageMonitor()
+
+
+def test_scan_dir(tmp_path):
+    make_file(tmp_path / 'a', 100)
+    os.makedirs(tmp_path / 'd')
+    os.link(tmp_path / 'a', tmp_path / 'd' / 'b')
+    sizes = scan_dir(str(tmp_path))
+    assert sorted(sizes) == sorted([str(tmp_path), str(tmp_path / 'd'), str(tmp_path / 'a')]) or \
+        sorted(sizes) == sorted([str(tmp_path), str(tmp_path / 'd'), str(tmp_path / 'd' / 'b')])
+    assert sum(sizes.values()) == os.lstat(tmp_path).st_size + os.lstat(tmp_path / 'd').st_size + 100
+
+
+def test_inotify(monitor, tmp_path):
+    watch = monitor.watch(str(tmp_path), 10 ** 9, None)
+    if watch.polling:
+        pytest.skip('inotify is not available')
+
+    check_changes(watch, tmp_path)
+    monitor.unwatch(watch)
+
+
+def test_rescan(monkeypatch, tmp_path):
+    def no_inotify():
+        raise OSError('inotify is not available')
+
+    monkeypatch.setattr(disk_usage, '_Inotify', no_inotify)
+    monitor = DiskUsageMonitor()
+    watch = monitor.watch(str(tmp_path), 10 ** 9, None, period=1)
+    assert watch.polling
+
+    check_changes(watch, tmp_path)
+    monitor.unwatch(watch)
+
+
+def test_callback(monitor, tmp_path):
+    sizes = []
+    limitation = sum(scan_dir(str(tmp_path)).values()) + 1000
+    watch = monitor.watch(str(tmp_path), limitation, sizes.append, period=1)
+    make_file(tmp_path / 'a', 100)
+    assert not wait_for(lambda: sizes, timeout=1.5)
+
+    make_file(tmp_path / 'b', 1000)
+    assert wait_for(lambda: sizes)
+    assert sizes[0] > limitation
+    # Callbacks are repeated until disk usage becomes less than the limitation
+    assert wait_for(lambda: len(sizes) > 1)
+
+    os.remove(tmp_path / 'b')
+    assert wait_for(lambda: watch.size < limitation)
+    number = len(sizes)
+    time.sleep(1.5)
+    assert len(sizes) == number
+    monitor.unwatch(watch)